@@ -0,0 +1,76 @@
+"""
+    project_2: training the feed-forward neural network
+"""
+import numpy as np
+
+from common import add_project_path, SEED
+
+add_project_path('project_2')
+from NeuralNetwork.Model import Model
+from NeuralNetwork.Layer import HiddenLayer, OutputLayer
+from NeuralNetwork.ActivationFunctions import Sigmoid, Linear
+from NeuralNetwork.LayerOptimizers import SGD, Momentum, Nesterov, RMSprop, AdaGrad, Adam
+from NeuralNetwork.cost_function.LinearRegression import LinearRegression
+
+
+def franke_data(n: int) -> tuple:
+    """
+        Noisy Franke function samples, as (inputs, targets)
+    """
+    rng = np.random.default_rng(SEED)
+    X = rng.uniform(0, 1, (n, 2))
+    x, y = X[:, :1], X[:, 1:]
+    z = 0.75*np.exp(-(0.25*(9*x-2)**2) - 0.25*((9*y-2)**2)) + 0.75*np.exp(-((9*x+1)**2)/49.0 - 0.1*(9*y+1)) \
+        + 0.5*np.exp(-(9*x-7)**2/4.0 - 0.25*((9*y-3)**2)) - 0.2*np.exp(-(9*x-4)**2 - (9*y-7)**2)
+    return X, z + 0.1 * rng.normal(0, 1, z.shape)
+
+
+def make_model(hidden: list, inputs: np.ndarray, targets: np.ndarray) -> Model:
+    model = Model(inputs.shape[1], cost_function=LinearRegression(inputs, targets, inputs, targets), random_state=SEED)
+    for size in hidden:
+        model.add_layer(HiddenLayer(size, Sigmoid()))
+    model.add_layer(OutputLayer(targets.shape[1], Linear()))
+    return model
+
+
+class Train:
+    """
+        Model.train with mini-batch SGD for several architectures, in samples per second
+    """
+    params = [['16', '64-64', '128-64-32'], [8, 64]]
+    param_names = ['hidden', 'minibatch_size']
+    unit = 'samples'
+    n = 2000
+    epochs = 3
+
+    def setup(self, hidden, minibatch_size):
+        self.inputs, self.targets = franke_data(self.n)
+        self.model = make_model([int(size) for size in hidden.split('-')], self.inputs, self.targets)
+
+    def items(self, hidden, minibatch_size):
+        return self.n * self.epochs
+
+    def time_train(self, hidden, minibatch_size):
+        self.model.train(self.inputs, self.targets, 1e-2, epochs=self.epochs, minibatch_size=minibatch_size, verbose=False)
+
+
+class Optimizers:
+    """
+        Model.train with every layer optimizer, in epochs per second
+    """
+    params = [['SGD', 'Momentum', 'Nesterov', 'RMSprop', 'AdaGrad', 'Adam']]
+    param_names = ['optimizer']
+    unit = 'epochs'
+    n = 2000
+    epochs = 3
+
+    def setup(self, optimizer):
+        self.inputs, self.targets = franke_data(self.n)
+        self.model = make_model([64, 64], self.inputs, self.targets)
+        self.optimizer = {'SGD': SGD, 'Momentum': Momentum, 'Nesterov': Nesterov, 'RMSprop': RMSprop, 'AdaGrad': AdaGrad, 'Adam': Adam}[optimizer]()
+
+    def items(self, optimizer):
+        return self.epochs
+
+    def time_train(self, optimizer):
+        self.model.train(self.inputs, self.targets, 1e-3, epochs=self.epochs, minibatch_size=32, verbose=False, optimizer=self.optimizer)
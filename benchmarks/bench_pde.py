@@ -0,0 +1,187 @@
+"""
+    project_3: the heat equation with finite differences and with a neural network
+"""
+import numpy as np
+
+from common import load_module, add_project_path, SEED
+
+heat_fd = load_module('project_3', 'heat_fd')
+method_of_lines = load_module('project_3', 'method_of_lines')
+
+
+class FiniteDifference:
+    """
+        Explicit finite difference scheme for u_t = u_xx, in grid point updates per second
+    """
+    params = [[20, 50]]
+    param_names = ['nx']
+    unit = 'updates'
+
+    def setup(self, nx):
+        self.nt = int(2.5 * (nx - 1)**2) + 1 # dt / dx^2 = 0.4
+
+    def items(self, nx):
+        return (nx - 2) * (self.nt - 1)
+
+    def time_finite_difference(self, nx):
+        heat_fd.finite_difference(nx, self.nt)
+
+
+class ExplicitHeat2D:
+    """
+        Explicit finite difference scheme for u_t = u_xx + u_yy on a square grid, in grid point updates per second
+    """
+    params = [[50, 200]]
+    param_names = ['n']
+    unit = 'updates'
+    steps = 200
+
+    def setup(self, n):
+        x = np.linspace(0, 1, n)
+        self.u0 = np.sin(np.pi * x)[:, np.newaxis] * np.sin(np.pi * x)[np.newaxis, :]
+        self.dx = x[1] - x[0]
+
+    def items(self, n):
+        return (n - 2)**2 * self.steps
+
+    def time_explicit_heat(self, n):
+        heat_fd.explicit_heat(self.u0, self.dx, 0.2 * self.dx**2, self.steps, snapshot_every=self.steps)
+
+
+class ImplicitHeat:
+    """
+        Backward Euler and Crank-Nicolson schemes for u_t = u_xx (one tridiagonal factorization, one solve per step), in grid point updates per second
+    """
+    params = [['backward_euler', 'crank_nicolson'], [100, 10000]]
+    param_names = ['method', 'nx']
+    unit = 'updates'
+    steps = 1000
+
+    def setup(self, method, nx):
+        x = np.linspace(0, 1, nx)
+        self.u0 = np.sin(np.pi * x)
+        self.u0[-1] = 0
+        self.dx = x[1] - x[0]
+
+    def items(self, method, nx):
+        return (nx - 2) * self.steps
+
+    def time_implicit_heat(self, method, nx):
+        getattr(heat_fd, method)(self.u0, self.dx, 1 / self.steps, self.steps, snapshot_every=self.steps)
+
+
+class AdiHeat2D:
+    """
+        Peaceman-Rachford ADI scheme for u_t = u_xx + u_yy on a square grid, in grid point updates per second
+    """
+    params = [[50, 200]]
+    param_names = ['n']
+    unit = 'updates'
+    steps = 200
+
+    def setup(self, n):
+        x = np.linspace(0, 1, n)
+        self.u0 = np.sin(np.pi * x)[:, np.newaxis] * np.sin(np.pi * x)[np.newaxis, :]
+        self.dx = x[1] - x[0]
+
+    def items(self, n):
+        return (n - 2)**2 * self.steps
+
+    def time_adi_heat(self, n):
+        heat_fd.adi_heat(self.u0, self.dx, 1 / self.steps, self.steps, snapshot_every=self.steps)
+
+
+class AdaptiveHeat:
+    """
+        Error controlled Crank-Nicolson time stepping for u_t = u_xx up to t = 10, in output times per second
+    """
+    params = [[1e-4, 1e-8]]
+    param_names = ['tol']
+    unit = 'outputs'
+
+    def setup(self, tol):
+        x = np.linspace(0, 1, 101)
+        self.u0 = np.sin(np.pi * x)
+        self.u0[-1] = 0
+        self.dx = x[1] - x[0]
+        self.t_out = np.linspace(0, 10, 11)
+
+    def items(self, tol):
+        return self.t_out.shape[0]
+
+    def time_adaptive_heat(self, tol):
+        heat_fd.adaptive_heat(self.u0, self.dx, self.t_out, tol)
+
+
+class MethodOfLines2D:
+    """
+        Method of lines with a sparse Laplacian and the BDF integrator for u_t = u_xx + u_yy on a square grid up to t = 0.1, in grid points per second
+    """
+    params = [[50, 100]]
+    param_names = ['n']
+    unit = 'points'
+
+    def setup(self, n):
+        x = np.linspace(0, 1, n)
+        self.u0 = np.sin(np.pi * x)[:, np.newaxis] * np.sin(np.pi * x)[np.newaxis, :]
+        self.dx = x[1] - x[0]
+
+    def items(self, n):
+        return (n - 2)**2
+
+    def time_method_of_lines(self, n):
+        method_of_lines.method_of_lines(self.u0, self.dx, [0, 0.1])
+
+
+class DiffEqNetTrain:
+    """
+        DiffEqNet training steps on the heat equation (as in heat_nn.py), one call per step or all in one compiled call, in steps per second
+    """
+    params = [[10, 30]]
+    param_names = ['n']
+    unit = 'steps'
+    steps = 10
+
+    def setup(self, n):
+        try:
+            import tensorflow as tf
+        except ImportError:
+            raise NotImplementedError('tensorflow is not installed')
+        add_project_path('project_3')
+        NNSolver = load_module('project_3', 'NNSolver')
+
+        class HeatEq(NNSolver.DiffEqNet):
+            def __init__(self, layers, x, t):
+                super().__init__(layers, learning_rate=1e-3)
+                self.var = (x, t)
+
+            @tf.function
+            def trial_func(self, x, t):
+                return tf.sin(np.pi*x)*(1-t) + x*(1-x)*t*tf.squeeze(self(tf.stack([x, t], axis=1), training=False))
+
+            @tf.function
+            def cost_function(self, x, t):
+                with tf.GradientTape(persistent=True) as g:
+                    g.watch([x, t])
+                    with tf.GradientTape(persistent=True) as gg:
+                        gg.watch([x, t])
+                        trial = self.trial_func(x, t)
+                    dx_trial = gg.gradient(trial, x)
+                    dt_trial = gg.gradient(trial, t)
+                dx2_trial = g.gradient(dx_trial, x)
+                return (dx2_trial - dt_trial)**2
+
+        tf.random.set_seed(SEED)
+        X, T = np.meshgrid(np.linspace(0, 1, n), np.linspace(0, 1, n))
+        self.model = HeatEq([2, 50, 50, 1], tf.constant(X.reshape(-1), tf.float32), tf.constant(T.reshape(-1), tf.float32))
+        self.model.train(self.steps + 1, steps_per_call=self.steps) # trace the tf.functions outside of the timings
+
+    def items(self, n):
+        return self.steps
+
+    def time_update(self, n):
+        for _ in range(self.steps):
+            self.model.update()
+
+    def time_train(self, n):
+        self.model.train(self.steps, steps_per_call=self.steps)
@@ -0,0 +1,91 @@
+"""
+    project_1: design matrices, OLS/Ridge/Lasso fits, bootstrap and cross-validation
+"""
+import numpy as np
+
+from common import load_module, SEED
+
+functions = load_module('project_1', 'functions')
+
+
+class CreateX2D:
+    """
+        Design matrix construction, in rows per second
+    """
+    params = [[5, 15, 30], [1000, 20000]]
+    param_names = ['degree', 'n']
+    unit = 'rows'
+
+    def setup(self, degree, n):
+        rng = np.random.default_rng(SEED)
+        self.x = rng.uniform(0, 1, (n, 1))
+        self.y = rng.uniform(0, 1, (n, 1))
+
+    def items(self, degree, n):
+        return n
+
+    def time_create_X_2D(self, degree, n):
+        functions.create_X_2D(degree, self.x, self.y)
+
+
+class Ols:
+    """
+        One OLS fit with the pseudo-inverse, in rows per second
+    """
+    params = [[5, 15], [1000, 10000]]
+    param_names = ['degree', 'n']
+    unit = 'rows'
+
+    def setup(self, degree, n):
+        rng = np.random.default_rng(SEED)
+        x, y = rng.uniform(0, 1, (n, 1)), rng.uniform(0, 1, (n, 1))
+        self.X = functions.create_X_2D(degree, x, y)
+        self.z = functions.franke_function(x, y) + 0.1 * rng.normal(0, 1, (n, 1))
+
+    def items(self, degree, n):
+        return n
+
+    def time_ols(self, degree, n):
+        functions.ols(self.X, self.z)
+
+
+class Bootstrap:
+    """
+        Bootstrap over a path of lmd/alpha values, in fits (cycles x lmd values) per second
+    """
+    params = [[5, 10], [False, True]]
+    param_names = ['degree', 'lasso']
+    unit = 'fits'
+    n = 1000
+    cycles = 50
+    lambdas = np.logspace(-5, -1, 10)
+
+    def setup(self, degree, lasso):
+        self.reg = functions.Regression(10, self.n, 0.1, seed=SEED)
+
+    def items(self, degree, lasso):
+        return self.cycles * self.lambdas.shape[0]
+
+    def time_bootstrap_path(self, degree, lasso):
+        self.reg.bootstrap_path(degree, self.cycles, self.lambdas, lasso=lasso)
+
+
+class CrossValidation:
+    """
+        K-folds cross-validation over every degree and lmd/alpha value, in fits (folds x degrees x lmd values) per second
+    """
+    params = [[10], [False, True]]
+    param_names = ['max_degree', 'lasso']
+    unit = 'fits'
+    n = 1000
+    n_folds = 5
+    lambdas = np.logspace(-5, -1, 10)
+
+    def setup(self, max_degree, lasso):
+        self.reg = functions.Regression(max_degree, self.n, 0.1, seed=SEED)
+
+    def items(self, max_degree, lasso):
+        return self.n_folds * max_degree * self.lambdas.shape[0]
+
+    def time_k_folds_cross_validation_path(self, max_degree, lasso):
+        self.reg.k_folds_cross_validation_path(np.arange(1, max_degree + 1), self.n_folds, self.lambdas, lasso=lasso)
@@ -0,0 +1,39 @@
+import importlib.util
+import os
+import sys
+
+# Root of the repository, holding the project directories
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Seed of all the data generated by the benchmarks, so that every run times the same work
+SEED = 1337
+
+
+def load_module(project: str, name: str):
+    """
+        Imports a module of one of the projects by path, under a name prefixed by the project's, since the projects are
+        script directories whose modules share names (e.g. project_1/functions.py and project_2/functions.py)
+        Parameters:
+            project (str): Directory of the project, e.g. 'project_1'
+            name (str): Name of the module in the project's directory, e.g. 'functions'
+        Returns:
+            (module): The imported module
+    """
+    key = f"{project}.{name}"
+    if key not in sys.modules:
+        spec = importlib.util.spec_from_file_location(key, os.path.join(ROOT, project, name + '.py'))
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[key] = module
+        spec.loader.exec_module(module)
+    return sys.modules[key]
+
+
+def add_project_path(project: str):
+    """
+        Makes the packages of a project importable (e.g. project_2's NeuralNetwork)
+        Parameters:
+            project (str): Directory of the project
+    """
+    path = os.path.join(ROOT, project)
+    if path not in sys.path:
+        sys.path.insert(0, path)
@@ -0,0 +1,238 @@
+"""
+    Benchmark runner, in the style of asv (airspeed velocity)
+
+    Benchmarks are classes in the bench_*.py files of this directory. Every method whose name starts with time_ is timed for every
+    combination of the class' params (a list of lists of values, named by param_names); setup(*params) runs before and is not timed,
+    and raises NotImplementedError to skip a combination (e.g. a missing optional dependency). items(*params), if defined, is the
+    amount of work done by one call in the class' unit, giving the throughput (e.g. rows/s) recorded along with the times.
+
+    Usage:
+        python benchmarks/run.py [run] [-b REGEX] [--repeat N] [--output FILE]
+        python benchmarks/run.py compare OLD.json NEW.json [--threshold RATIO]
+
+    Results are written as JSON to benchmarks/results/<commit>.json by default, so that runs on different commits can be compared.
+"""
+import argparse
+import contextlib
+import datetime
+import glob
+import importlib
+import itertools
+import json
+import math
+import os
+import platform
+import re
+import subprocess
+import sys
+from time import perf_counter
+
+import numpy as np
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+RESULTS_DIR = os.path.join(BENCHMARK_DIR, 'results')
+
+
+def git_commit() -> tuple:
+    """
+        Commit the working tree is at
+        Returns:
+            (str|None): Hash of HEAD, or None outside of a git repository
+            (bool): Whether the working tree has uncommitted changes
+    """
+    try:
+        commit = subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=BENCHMARK_DIR, capture_output=True, text=True, check=True).stdout.strip()
+        status = subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'], cwd=BENCHMARK_DIR, capture_output=True, text=True, check=True).stdout
+        return commit, len(status.strip()) > 0
+    except (OSError, subprocess.CalledProcessError):
+        return None, False
+
+
+def metadata() -> dict:
+    """
+        Information about the run, to tell apart results from different commits and machines
+    """
+    commit, dirty = git_commit()
+    return {
+        'commit': commit,
+        'dirty': dirty,
+        'date': datetime.datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'cpu_count': os.cpu_count(),
+    }
+
+
+def discover(pattern: str = None) -> list:
+    """
+        Finds the benchmarks
+        Parameters:
+            pattern (str|None): Regular expression the benchmarks' full names (module.Class.time_method) must contain
+        Returns:
+            (list<tuple>): (full name, class, method name) of every benchmark, in file and definition order
+    """
+    if BENCHMARK_DIR not in sys.path:
+        sys.path.insert(0, BENCHMARK_DIR)
+
+    benchmarks = list()
+    for filename in sorted(glob.glob(os.path.join(BENCHMARK_DIR, 'bench_*.py'))):
+        module_name = os.path.splitext(os.path.basename(filename))[0]
+        try:
+            module = importlib.import_module(module_name)
+        except ImportError as e:
+            print(f"\033[91mSkipping {module_name}: {e}\033[0m")
+            continue
+        for class_name, cls in vars(module).items():
+            if not isinstance(cls, type) or cls.__module__ != module_name or class_name.startswith('_'):
+                continue
+            for method in vars(cls):
+                name = f"{module_name}.{class_name}.{method}"
+                if method.startswith('time_') and (pattern is None or re.search(pattern, name)):
+                    benchmarks.append((name, cls, method))
+    return benchmarks
+
+
+def run_case(cls: type, method: str, params: tuple, repeat: int, min_time: float) -> dict:
+    """
+        Times one benchmark for one combination of parameters
+        Parameters:
+            cls (type): Benchmark class
+            method (str): Name of the time_ method
+            params (tuple): Parameter values
+            repeat (int): Number of timing samples
+            min_time (float): Minimum duration of a sample in seconds; fast calls are repeated within a sample to reach it
+        Returns:
+            (dict): Per call seconds of every sample, their median & minimum and the throughput; or why the case was skipped or failed
+    """
+    bench = cls()
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        try:
+            if hasattr(bench, 'setup'):
+                bench.setup(*params)
+        except NotImplementedError as e:
+            return {'skipped': str(e)}
+
+        try:
+            function = getattr(bench, method)
+
+            # First call: warm-up, and how many calls make a sample long enough
+            start = perf_counter()
+            function(*params)
+            number = max(1, math.ceil(min_time / max(perf_counter() - start, 1e-9)))
+
+            seconds = list()
+            for _ in range(repeat):
+                start = perf_counter()
+                for _ in range(number):
+                    function(*params)
+                seconds.append((perf_counter() - start) / number)
+        except Exception as e:
+            return {'error': repr(e)}
+        finally:
+            if hasattr(bench, 'teardown'):
+                bench.teardown(*params)
+
+    result = {'seconds': seconds, 'number': number, 'median': float(np.median(seconds)), 'min': float(np.min(seconds))}
+    if hasattr(bench, 'items'):
+        result['rate'] = bench.items(*params) / result['median']
+        result['unit'] = getattr(bench, 'unit', 'items') + '/s'
+    return result
+
+
+def run(pattern: str = None, repeat: int = 5, min_time: float = 0.05, output: str = None) -> str:
+    """
+        Runs the benchmarks and writes the results out
+        Parameters:
+            pattern (str|None): Regular expression selecting the benchmarks to run (see discover)
+            repeat (int): Number of timing samples per case
+            min_time (float): Minimum duration of a sample in seconds
+            output (str|None): JSON file to write; if None, benchmarks/results/<commit>.json
+        Returns:
+            (str): Path of the results file
+    """
+    meta = metadata()
+    results = list()
+    for name, cls, method in discover(pattern):
+        param_names = getattr(cls, 'param_names', list())
+        for params in itertools.product(*getattr(cls, 'params', list())):
+            case = {'name': name, 'params': dict(zip(param_names, params))}
+            case.update(run_case(cls, method, params, repeat, min_time))
+            results.append(case)
+
+            label = f"{name}({', '.join(f'{k}={v}' for k, v in case['params'].items())})"
+            if 'skipped' in case:
+                print(f"{label:<80} skipped: {case['skipped']}")
+            elif 'error' in case:
+                print(f"\033[91m{label:<80} failed: {case['error']}\033[0m")
+            else:
+                rate = f"{case['rate']:.4g} {case['unit']}" if 'rate' in case else ''
+                print(f"{label:<80} {case['median'] * 1e3:10.3f} ms  {rate}")
+
+    if output is None:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        commit = meta['commit'][:10] if meta['commit'] is not None else 'nogit'
+        output = os.path.join(RESULTS_DIR, commit + ('-dirty' if meta['dirty'] else '') + '.json')
+    with open(output, 'w') as file:
+        json.dump({'metadata': meta, 'results': results}, file, indent=1)
+    print(f"Results written to {output}")
+    return output
+
+
+def compare(old_file: str, new_file: str, threshold: float = 1.1) -> bool:
+    """
+        Compares the median times of two results files
+        Parameters:
+            old_file (str): Results of the reference run
+            new_file (str): Results of the run to check
+            threshold (float): Ratio of the times above which a case counts as slower (or below its inverse, faster)
+        Returns:
+            (bool): Whether any case got slower
+    """
+    def load(filename):
+        with open(filename, 'r') as file:
+            data = json.load(file)
+        cases = {(case['name'], json.dumps(case['params'], sort_keys=True)): case for case in data['results'] if 'median' in case}
+        return data['metadata'], cases
+
+    old_meta, old = load(old_file)
+    new_meta, new = load(new_file)
+    print(f"old: {old_meta.get('commit')} ({old_meta.get('date')})")
+    print(f"new: {new_meta.get('commit')} ({new_meta.get('date')})")
+
+    slower = False
+    for key in sorted(set(old) & set(new)):
+        ratio = new[key]['median'] / old[key]['median']
+        flag = ''
+        if ratio > threshold:
+            flag = '\033[91mslower\033[0m'
+            slower = True
+        elif ratio < 1 / threshold:
+            flag = '\033[92mfaster\033[0m'
+        params = ', '.join(f'{k}={v}' for k, v in json.loads(key[1]).items())
+        print(f"{key[0] + '(' + params + ')':<80} {old[key]['median'] * 1e3:10.3f} ms -> {new[key]['median'] * 1e3:10.3f} ms  x{ratio:.2f} {flag}")
+    for key in sorted(set(old) ^ set(new)):
+        print(f"{key[0]}({key[1]}) only in {'old' if key in old else 'new'} results")
+    return slower
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Runs the benchmarks, or compares two results files')
+    commands = parser.add_subparsers(dest='command')
+
+    run_parser = commands.add_parser('run', help='run the benchmarks (default)')
+    compare_parser = commands.add_parser('compare', help='compare two results files')
+    for p in (parser, run_parser):
+        p.add_argument('-b', '--bench', default=None, help='regular expression selecting the benchmarks to run')
+        p.add_argument('--repeat', type=int, default=5, help='number of timing samples per case')
+        p.add_argument('--min-time', type=float, default=0.05, help='minimum duration of a sample, in seconds')
+        p.add_argument('-o', '--output', default=None, help='results file (default: benchmarks/results/<commit>.json)')
+    compare_parser.add_argument('old')
+    compare_parser.add_argument('new')
+    compare_parser.add_argument('--threshold', type=float, default=1.1, help='time ratio above which a case counts as a regression')
+
+    args = parser.parse_args()
+    if args.command == 'compare':
+        sys.exit(1 if compare(args.old, args.new, args.threshold) else 0)
+    run(args.bench, args.repeat, args.min_time, args.output)
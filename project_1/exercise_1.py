@@ -27,23 +27,20 @@ features_5 = int((6) * (7) / 2)
 betas_5 = np.zeros((2, features_5))
 std_betas_5 = np.zeros((2, features_5))
 
-for i, deg in enumerate(range(1, max_degree + 1)):
-    print(f"degree: {deg}/{max_degree}", end="\r")
-    
-    ( mse_train[0, i], r2_train[0, i],
-    mse_test[0, i], r2_test[0, i],
-    betas_scaled, var_betas_scaled ) = reg.ordinary_least_squares(degree=deg, scale=True)
-    
-    ( mse_train[1, i], r2_train[1, i], 
-    mse_test[1, i], r2_test[1, i],
-    betas_unscaled, var_betas_unscaled ) = reg.ordinary_least_squares(degree=deg, scale=False)
-    
-    # save betas and var_betas
-    if deg == 5:
-        betas_5[0, :] = betas_scaled.reshape((betas_scaled.shape[0], ))
-        betas_5[1, :] = betas_unscaled.reshape((betas_unscaled.shape[0], ))
-        std_betas_5[0, :] = np.sqrt(var_betas_scaled.reshape((betas_scaled.shape[0], )))
-        std_betas_5[1, :] = np.sqrt(var_betas_unscaled.reshape((betas_unscaled.shape[0], )))
+# Compute MSEs for OLS on all degrees from 1 to max_degree, reusing one factorization for the whole degree path
+( mse_train[0, :], r2_train[0, :],
+mse_test[0, :], r2_test[0, :],
+betas_scaled, var_betas_scaled ) = reg.ordinary_least_squares_path(scale=True)
+
+( mse_train[1, :], r2_train[1, :],
+mse_test[1, :], r2_test[1, :],
+betas_unscaled, var_betas_unscaled ) = reg.ordinary_least_squares_path(scale=False)
+
+# save betas and var_betas for degree 5
+betas_5[0, :] = betas_scaled[4].reshape((betas_scaled[4].shape[0], ))
+betas_5[1, :] = betas_unscaled[4].reshape((betas_unscaled[4].shape[0], ))
+std_betas_5[0, :] = np.sqrt(var_betas_scaled[4])
+std_betas_5[1, :] = np.sqrt(var_betas_unscaled[4])
 
 
 # confidence interval beta values plots
@@ -24,9 +24,7 @@ for j, n_folds in enumerate(n_folds_vals):
     # regression object
     reg = Regression(max_degree, n, noise, seed)
 
-    mse_cv = np.zeros(max_degree)
-    for i, deg in enumerate(degrees):
-        mse_cv[i] = reg.k_folds_cross_validation(degree=deg, n_folds=n_folds)
+    mse_cv = reg.k_folds_cross_validation_path(degrees, n_folds=n_folds, lambdas=[0])[0, :]
     
     plt.subplot(2, 2, j+1)
     
@@ -33,8 +33,7 @@ plt.figure(f"bootstrap vs cv", figsize=(11, 5))
 mse = np.zeros((n_lambdas, max_degree))
 
 for j, deg in enumerate(degrees):
-    for i, lmd in enumerate(lambdas):
-        mse[i, j], _, _ = reg.bootstrap(degree=deg, max_bootstrap_cycle=max_bootstrap, lmd=lmd)
+    mse[:, j], _, _ = reg.bootstrap_path(degree=deg, max_bootstrap_cycle=max_bootstrap, lambdas=lambdas)
 
 min_mse_where = np.where(mse == np.min(mse))
 lmd_min[0] = lambdas[min_mse_where[0][0]]
@@ -55,11 +54,7 @@ reg = Regression(max_degree, n, noise, seed)
 
 # mse vs (lambdas, degs) for cross validation
 # cross validation for MSE
-mse = np.zeros((n_lambdas, max_degree))
-
-for j, deg in enumerate(degrees):
-    for i, lmd in enumerate(lambdas):
-        mse[i, j] = reg.k_folds_cross_validation(degree=deg, n_folds=n_folds, lmd=lmd)
+mse = reg.k_folds_cross_validation_path(degrees, n_folds=n_folds, lambdas=lambdas)
 
 min_mse_where = np.where(mse == np.min(mse))
 lmd_min[1] = lambdas[min_mse_where[0][0]]
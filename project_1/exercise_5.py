@@ -33,8 +33,7 @@ plt.figure(f"bootstrap", figsize=(11, 5))
 mse = np.zeros((n_alphas, max_degree))
 
 for j, deg in enumerate(degrees):
-    for i, alpha in enumerate(alphas):
-        mse[i, j], _, _ = reg.bootstrap(degree=deg, max_bootstrap_cycle=max_bootstrap, alpha=alpha)
+    mse[:, j], _, _ = reg.bootstrap_path(degree=deg, max_bootstrap_cycle=max_bootstrap, lambdas=alphas, lasso=True)
 
 min_mse_where = np.where(mse == np.min(mse))
 lmd_min[0] = alphas[min_mse_where[0][0]]
@@ -55,11 +54,7 @@ reg = Regression(max_degree, n, noise, seed)
 
 # mse vs (lambdas, degs) for cross validation
 # cross validation for MSE
-mse = np.zeros((n_alphas, max_degree))
-
-for j, deg in enumerate(degrees):
-    for i, alpha in enumerate(alphas):
-        mse[i, j] = reg.k_folds_cross_validation(degree=deg, n_folds=n_folds, alpha=alpha)
+mse = reg.k_folds_cross_validation_path(degrees, n_folds=n_folds, lambdas=alphas, lasso=True)
 
 min_mse_where = np.where(mse == np.min(mse))
 lmd_min[1] = alphas[min_mse_where[0][0]]
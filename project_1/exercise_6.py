@@ -4,8 +4,8 @@ import matplotlib.pyplot as plt
 from sklearn.linear_model import Ridge, LinearRegression
 from sklearn.model_selection import cross_val_score, KFold
 
-from terrain import load_terrain, TERRAIN_1, TERRAIN_2
-from functions import Regression, create_X_2D, scale_mean
+from terrain import load_terrain, terrain_chunks, TERRAIN_1, TERRAIN_2
+from functions import Regression, StreamingRegression, create_X_2D, scale_mean
 from plots import plot_prediction_3D
 
 
@@ -22,6 +22,7 @@ n_folds = 7 # number of folds for CV
 lambdas = np.logspace(-5, 1, 50) # lambda values to use for ridge/lasso regression
 terrain_set = TERRAIN_1 # pick terrain file to open
 noise = 1.0 # assumed constant used to compute the std
+streaming_downsample = 1 # full resolution for the out-of-core OLS/Ridge fit
 
 # Selectively turn on/off certain parts of the exercise
 do_ols = False  #  essentially exercise 1 again
@@ -29,6 +30,7 @@ do_bootstrap_bv = False #               2
 do_cv_bv = True #                      3
 do_ridge_cv = False #                   4
 do_lasso_cv = False #                   5
+do_streaming = False # OLS/Ridge on the (cropped) full resolution terrain, read in tile by tile
 
 
 # Load data set
@@ -65,24 +67,20 @@ if do_ols:
     betas_d5 = np.zeros((2, features_d5))
     std_betas_d5 = np.zeros((2, features_d5))
 
-    # Compute MSEs for OLS on all degrees from 1 to max_degree
-    for i, deg in enumerate(range(1, max_degree_ols + 1)):
-        print(f"degree: {deg}/{max_degree_ols}", end="\r")
-        
-        ( mse_train[0, i], r2_train[0, i],
-        mse_test[0, i], r2_test[0, i],
-        betas_scaled, var_betas_scaled ) = reg.ordinary_least_squares(degree=deg, scale=True)
-        
-        ( mse_train[1, i], r2_train[1, i], 
-        mse_test[1, i], r2_test[1, i],
-        betas_unscaled, var_betas_unscaled ) = reg.ordinary_least_squares(degree=deg, scale=False)
-        
-        # save betas and var_betas
-        if deg == 5:
-            betas_d5[0, :] = betas_scaled.reshape((betas_scaled.shape[0], ))
-            betas_d5[1, :] = betas_unscaled.reshape((betas_unscaled.shape[0], ))
-            std_betas_d5[0, :] = np.sqrt(var_betas_scaled.reshape((betas_scaled.shape[0], )))
-            std_betas_d5[1, :] = np.sqrt(var_betas_unscaled.reshape((betas_unscaled.shape[0], )))
+    # Compute MSEs for OLS on all degrees from 1 to max_degree_ols, reusing one factorization for the whole degree path
+    ( mse_train[0, :], r2_train[0, :],
+    mse_test[0, :], r2_test[0, :],
+    betas_scaled, var_betas_scaled ) = reg.ordinary_least_squares_path(scale=True)
+
+    ( mse_train[1, :], r2_train[1, :],
+    mse_test[1, :], r2_test[1, :],
+    betas_unscaled, var_betas_unscaled ) = reg.ordinary_least_squares_path(scale=False)
+
+    # save betas and var_betas for degree 5
+    betas_d5[0, :] = betas_scaled[4].reshape((betas_scaled[4].shape[0], ))
+    betas_d5[1, :] = betas_unscaled[4].reshape((betas_unscaled[4].shape[0], ))
+    std_betas_d5[0, :] = np.sqrt(var_betas_scaled[4])
+    std_betas_d5[1, :] = np.sqrt(var_betas_unscaled[4])
 
 
     # confidence interval beta values plots
@@ -294,8 +292,7 @@ if do_ridge_cv:
     mse = np.zeros((n_lambdas, max_degree_cv))
 
     for j, deg in enumerate(degrees_cv):
-        for i, lmd in enumerate(lambdas):
-            mse[i, j], _, _ = reg.bootstrap(degree=deg, max_bootstrap_cycle=max_bootstrap, lmd=lmd)
+        mse[:, j], _, _ = reg.bootstrap_path(degree=deg, max_bootstrap_cycle=max_bootstrap, lambdas=lambdas)
 
     min_mse_where = np.where(mse == np.min(mse))
     lmd_min[0] = lambdas[min_mse_where[0][0]]
@@ -311,11 +308,7 @@ if do_ridge_cv:
     plt.colorbar()
 
     # cross validation for MSE
-    mse = np.zeros((n_lambdas, max_degree_cv))
-
-    for j, deg in enumerate(degrees_cv):
-        for i, lmd in enumerate(lambdas):
-            mse[i, j] = reg.k_folds_cross_validation(degree=deg, n_folds=n_folds, lmd=lmd)
+    mse = reg.k_folds_cross_validation_path(degrees_cv, n_folds=n_folds, lambdas=lambdas)
 
     min_mse_where = np.where(mse == np.min(mse))
     lmd_min[1] = lambdas[min_mse_where[0][0]]
@@ -371,8 +364,7 @@ if do_lasso_cv:
     mse = np.zeros((n_lambdas, max_degree_cv))
 
     for j, deg in enumerate(degrees_cv):
-        for i, alpha in enumerate(lambdas):
-            mse[i, j], _, _ = reg.bootstrap(degree=deg, max_bootstrap_cycle=max_bootstrap, alpha=alpha)
+        mse[:, j], _, _ = reg.bootstrap_path(degree=deg, max_bootstrap_cycle=max_bootstrap, lambdas=lambdas, lasso=True)
 
     min_mse_where = np.where(mse == np.min(mse))
     lmd_min[0] = lambdas[min_mse_where[0][0]]
@@ -389,11 +381,7 @@ if do_lasso_cv:
     plt.colorbar()
 
     # cross validation for MSE
-    mse = np.zeros((n_lambdas, max_degree_cv))
-
-    for j, deg in enumerate(degrees_cv):
-        for i, alpha in enumerate(lambdas):
-            mse[i, j] = reg.k_folds_cross_validation(degree=deg, n_folds=n_folds, alpha=alpha)
+    mse = reg.k_folds_cross_validation_path(degrees_cv, n_folds=n_folds, lambdas=lambdas, lasso=True)
 
     min_mse_where = np.where(mse == np.min(mse))
     lmd_min[1] = lambdas[min_mse_where[0][0]]
@@ -427,4 +415,40 @@ if do_lasso_cv:
         file.write(f"mse: {min_mse[1]}; lmd: {lmd_min[1]}; deg: {deg_min[1]} \n")
 
 
+
+# -------------------------------
+# OLS/Ridge on the full resolution terrain
+# Out-of-core: the design matrix is never held in memory
+# -------------------------------
+
+if do_streaming:
+
+    print("Computing MSE for OLS/Ridge on the full resolution terrain...")
+
+    reg = StreamingRegression(max_degree_ols, terrain_chunks(terrain_set, downsample=streaming_downsample, scissor=scissor), seed=seed)
+    print(reg.train.n + reg.test.n, 'datapoints')
+
+    mse_train, r2_train, mse_test, r2_test, _ = reg.regression_path(degrees_ols, lambdas=np.concatenate(([0], lambdas)))
+
+    # OLS (lmd == 0) over complexity
+    plt.figure("Full resolution OLS")
+    plt.plot(degrees_ols, mse_train[0, :], '-k', label="train")
+    plt.plot(degrees_ols, mse_test[0, :], '--k', label="test")
+    plt.xlabel(r"complexity")
+    plt.ylabel(r"MSE")
+    plt.legend()
+    plt.savefig(f"./images/ex6_streaming_ols_ds_{streaming_downsample}.pdf", dpi=400)
+
+    # Ridge test MSE vs (lambdas, degs)
+    min_mse_where = np.where(mse_test[1:] == np.min(mse_test[1:]))
+    plt.figure("Full resolution Ridge")
+    plt.contourf(np.log10(lambdas), degrees_ols, mse_test[1:].T)
+    plt.plot(np.log10(lambdas[min_mse_where[0][0]]), degrees_ols[min_mse_where[1][0]], 'or')
+    plt.title(f"Test MSE for Ridge at downsample={streaming_downsample}")
+    plt.ylabel(r"complexity")
+    plt.xlabel(r"$\log_{10}(\lambda)$")
+    plt.colorbar()
+    plt.savefig(f"./images/ex6_streaming_ridge_ds_{streaming_downsample}.pdf", dpi=400)
+
+
 plt.show()
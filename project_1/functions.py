@@ -1,10 +1,11 @@
 import numpy as np
 
-from sklearn.linear_model import Lasso
 from sklearn.model_selection import train_test_split, KFold
 from sklearn.utils import resample
+from scipy.linalg import solve_triangular
+from concurrent.futures import ProcessPoolExecutor
 
-def create_X_2D(degree: int, X: np.matrix, Y: np.matrix):
+def create_X_2D(degree: int, X: np.matrix, Y: np.matrix, dtype: type = np.float64, filename: str = None) -> np.ndarray:
     """
         Create the design matrix in the form of a Vandermonde matrix for one or two
         dimensional data set. The matrix is of the form
@@ -19,6 +20,8 @@ def create_X_2D(degree: int, X: np.matrix, Y: np.matrix):
             degree (int): degree of the polynomial to fit (p)
             X (numpy array): The input data points on the X axis (n)
             Y (numpy array): The input data points on the Y axis (n)
+            dtype (type): data type of the matrix; np.float32 halves the memory needed
+            filename (str|None): if given, the matrix is memory-mapped to this .npy file (reload it with np.load(filename, mmap_mode='r'))
         
         Returns: 
             (numpy array): (n x p) dimensional matrix, 
@@ -26,17 +29,125 @@ def create_X_2D(degree: int, X: np.matrix, Y: np.matrix):
             plus p = degree*(degree + 1)/2 (2-variable input)
     """
     
-    design_matrix = np.ones((len(X), int((degree + 1) * (degree + 2) / 2))) # First column of design matrix is 1
-    
     # The number of features are 1 + 2 + ... + (degree+1) = (degree+1)*(degree+2)/2
-    for i in range(1, degree + 1): # First column is 1, so we skip it
-        q = int(i * (i + 1) / 2) # 1 + 2 + ... + i
-        
-        for k in range(i + 1):
-            design_matrix[:, q + k] = (X[:, 0] ** (i - k)) * (Y[:, 0] ** k)
+    design_matrix = _empty_X_2D(len(X), int((degree + 1) * (degree + 2) / 2), dtype, filename)
+    _fill_X_2D(design_matrix, X, Y, 0, degree)
     
     return design_matrix
 
+def extend_X_2D(design_matrix: np.ndarray, degree: int, X: np.matrix, Y: np.matrix, filename: str = None) -> np.ndarray:
+    """
+        Extends a design matrix made by create_X_2D to a higher degree, only computing the columns of the new degrees
+
+        Parameters:
+            design_matrix (numpy array): design matrix of any degree lower than `degree`, for the same X and Y
+            degree (int): degree of the polynomial to fit
+            X (numpy array): The input data points on the X axis (n)
+            Y (numpy array): The input data points on the Y axis (n)
+            filename (str|None): if given, the new matrix is memory-mapped to this .npy file
+
+        Returns:
+            (numpy array): (n x p) dimensional matrix, with the same data type as design_matrix
+    """
+
+    # Degree of the given matrix, from its (d+1)*(d+2)/2 columns
+    old_degree = int(round((np.sqrt(8 * design_matrix.shape[1] + 1) - 3) / 2))
+
+    extended = _empty_X_2D(design_matrix.shape[0], int((degree + 1) * (degree + 2) / 2), design_matrix.dtype, filename)
+    extended[:, :design_matrix.shape[1]] = design_matrix
+    _fill_X_2D(extended, X, Y, old_degree + 1, degree)
+
+    return extended
+
+def _empty_X_2D(n: int, n_features: int, dtype: type, filename: str = None) -> np.ndarray:
+    """
+        Allocates an uninitialised design matrix, in memory or memory-mapped to a .npy file
+    """
+
+    if filename is not None:
+        return np.lib.format.open_memmap(filename, mode='w+', dtype=dtype, shape=(n, n_features))
+    return np.empty((n, n_features), dtype=dtype)
+
+def _fill_X_2D(design_matrix: np.ndarray, X: np.matrix, Y: np.matrix, first_degree: int, degree: int, chunk_size: int = 8192):
+    """
+        Computes the columns of degrees first_degree to degree of a design matrix in place, the lower degrees being already filled in.
+        Each degree is one product of the previous degree's columns with x (x^(i-k) y^k = x^(i-1-k) y^k * x), plus one last column times y,
+        going over the rows in chunks so that the columns being worked on stay in cache.
+    """
+
+    x = np.asarray(X, dtype=np.float64).reshape(-1)
+    y = np.asarray(Y, dtype=np.float64).reshape(-1)
+
+    for start in range(0, design_matrix.shape[0], chunk_size):
+        rows = design_matrix[start : start + chunk_size]
+        x_rows = x[start : start + chunk_size, np.newaxis]
+        y_rows = y[start : start + chunk_size]
+
+        if first_degree == 0:
+            rows[:, 0] = 1 # First column of design matrix is 1
+        for i in range(max(first_degree, 1), degree + 1):
+            p = int((i - 1) * i / 2) # first column of degree i-1
+            q = int(i * (i + 1) / 2) # first column of degree i, 1 + 2 + ... + i
+            np.multiply(rows[:, p:q], x_rows, out=rows[:, q:q + i])
+            np.multiply(rows[:, q - 1], y_rows, out=rows[:, q + i])
+
+def polynomial_2D(beta: np.ndarray, degree: int, X: np.ndarray, Y: np.ndarray, chunk_size: int = 16384) -> np.ndarray:
+    """
+        Evaluates the polynomial with the coefficients of a create_X_2D design matrix, without building the design matrix.
+        The coefficient triangle is nested as sum_k y^k P_k(x), with P_k(x) = sum_j beta[x^j y^k] x^j: each P_k is evaluated
+        with Horner's scheme over x, and the sum with Horner's scheme over y.
+        X and Y are broadcast against each other, so a row of x values and a column of y values evaluate the whole grid
+        np.meshgrid(x, y) with the P_k only computed once per column; scattered points are gone over in chunks that stay in cache.
+
+        Parameters:
+            beta (numpy array): (p) coefficients, in the order of the design matrix's columns
+            degree (int): degree of the polynomial
+            X (numpy array): x coordinates
+            Y (numpy array): y coordinates
+            chunk_size (int): number of scattered points evaluated at once
+
+        Returns:
+            (numpy array): polynomial at every (x, y), with the broadcast shape of X and Y
+    """
+
+    beta = np.asarray(beta, dtype=np.float64).reshape(-1)
+    X = np.asarray(X, dtype=np.float64)
+    Y = np.asarray(Y, dtype=np.float64)
+    shape = np.broadcast_shapes(X.shape, Y.shape)
+
+    if X.shape != shape or Y.shape != shape:
+        return _horner_2D(beta, degree, X, Y, shape)
+
+    x = X.reshape(-1)
+    y = Y.reshape(-1)
+    z = np.empty(x.shape)
+    for start in range(0, x.shape[0], chunk_size):
+        rows = slice(start, start + chunk_size)
+        z[rows] = _horner_2D(beta, degree, x[rows], y[rows], x[rows].shape)
+    return z.reshape(shape)
+
+def _horner_2D(beta: np.ndarray, degree: int, X: np.ndarray, Y: np.ndarray, shape: tuple) -> np.ndarray:
+    """
+        Nested Horner evaluation of polynomial_2D, for X and Y broadcasting to shape
+    """
+
+    # x^(i-k) y^k is column i(i+1)/2 + k
+    index = lambda i, k: i * (i + 1) // 2 + k
+
+    z = None
+    for k in range(degree, -1, -1):
+        p_k = np.full(X.shape, beta[index(degree, k)])
+        for j in range(degree - k - 1, -1, -1):
+            p_k *= X
+            p_k += beta[index(j + k, k)]
+
+        if z is None:
+            z = np.array(np.broadcast_to(p_k, shape))
+        else:
+            z *= Y
+            z += p_k
+    return z
+
 def franke_function(X, Y):
     """
         Franke Function
@@ -55,9 +166,175 @@ def franke_function(X, Y):
     term4 = -0.2*np.exp(-(9*X-4)**2 - (9*Y-7)**2)
     return term1 + term2 + term3 + term4
 
+class Scaler():
+    """
+        Scaling by the training set's column means (and standard deviations), fitted once on the max degree design matrix and target,
+        then applied to any set of rows (training or test) and any prefix of the columns, i.e. to the design matrix of any lower degree,
+        since a degree's features are the first columns of the next degree's. The statistics of every prefix used are cached.
+        partial_fit adds rows to the fit, for data read in chunks; the statistics are merged with the pairwise formulas of Chan et al.
+        Constant columns (the intercept) are not divided by their (zero) standard deviation.
+    """
+
+    def __init__(self, with_std: bool = False):
+        """
+            Parameters:
+                with_std (bool): if true, will divide by the standard deviation as well as subtract the mean
+        """
+
+        self.with_std = with_std
+        self.n_x = 0
+        self.n_z = 0
+        self.mean_x = None
+        self.m2_x = None
+        self.mean_z = 0.
+        self.m2_z = 0.
+        self._columns = dict()
+
+    def fit(self, X: np.matrix, z: np.matrix = None):
+        """
+            Fits the scaler, forgetting any previous fit
+
+            Parameters:
+                X (numpy matrix): training design matrix
+                z (numpy array|None): training target
+
+            Returns:
+                (Scaler) self
+        """
+
+        self.__init__(self.with_std)
+        return self.partial_fit(X, z)
+
+    def partial_fit(self, X: np.matrix, z: np.matrix = None):
+        """
+            Adds rows of the training set to the fit
+
+            Parameters:
+                X (numpy matrix): rows of the training design matrix
+                z (numpy array|None): the rows' training target
+
+            Returns:
+                (Scaler) self
+        """
+
+        X = np.asarray(X, dtype=np.float64)
+        if X.shape[0] > 0:
+            if self.mean_x is None:
+                self.mean_x = np.zeros(X.shape[1])
+                self.m2_x = np.zeros(X.shape[1])
+            self.n_x, self.mean_x, self.m2_x = self._merge(self.n_x, self.mean_x, self.m2_x, X)
+
+        if z is not None:
+            z = np.asarray(z, dtype=np.float64).reshape(-1, 1)
+            if z.shape[0] > 0:
+                self.n_z, mean_z, m2_z = self._merge(self.n_z, self.mean_z, self.m2_z, z)
+                self.mean_z, self.m2_z = mean_z[0], m2_z[0]
+
+        self._columns = dict()
+        return self
+
+    def transform(self, X: np.matrix) -> np.matrix:
+        """
+            Scales a design matrix, leaving it untouched
+
+            Parameters:
+                X (numpy matrix): design matrix of any degree up to the fitted one (its first columns)
+
+            Returns:
+                (numpy matrix) scaled design matrix
+        """
+
+        if self.mean_x is None:
+            print('\033[91mThe scaler has to be fitted before transforming data!\033[0m')
+            return
+        mean, std = self._column_stats(X.shape[1])
+        if self.with_std:
+            return (X - mean) / std
+        return X - mean
+
+    def transform_target(self, z: np.matrix) -> np.matrix:
+        """
+            Scales a target, leaving it untouched
+
+            Parameters:
+                z (numpy array): target
+
+            Returns:
+                (numpy array) scaled target
+        """
+
+        if self.n_z == 0:
+            print('\033[91mThe scaler has to be fitted with a target before transforming one!\033[0m')
+            return
+        if self.with_std:
+            return (z - self.mean_z) / self._target_std()
+        return z - self.mean_z
+
+    def unscale_coefficients(self, beta: np.ndarray) -> np.ndarray:
+        """
+            Turns beta coefficients fitted on scaled data into the coefficients of the same polynomial on the original data,
+            to make predictions in the original units with polynomial_2D
+
+            Parameters:
+                beta (numpy array): (p) or (p x n_lambdas) coefficients fitted on the scaled design matrix of any degree and target
+
+            Returns:
+                (numpy array) coefficients of the polynomial on the original x, y and z, with the same shape as beta
+        """
+
+        mean, std = self._column_stats(np.shape(beta)[0])
+        if not self.with_std:
+            return _unscale_coefficients(beta, mean, np.ones(mean.shape), self.mean_z, 1)
+        return _unscale_coefficients(beta, mean, std, self.mean_z, self._target_std())
+
+    def _target_std(self) -> float:
+        """
+            Standard deviation of the target, or 1 for a constant target
+        """
+
+        std = np.sqrt(self.m2_z / self.n_z)
+        return std if std > 0 else 1
+
+    def _column_stats(self, p: int) -> tuple:
+        """
+            Cached means and standard deviations of the first p columns
+        """
+
+        if p not in self._columns:
+            std = np.sqrt(self.m2_x[:p] / self.n_x)
+            std[std == 0] = 1
+            self._columns[p] = (self.mean_x[:p].copy(), std)
+        return self._columns[p]
+
+    @staticmethod
+    def _merge(n: int, mean: np.ndarray, m2: np.ndarray, X: np.ndarray) -> tuple:
+        """
+            Merges the count, column means and sums of squared deviations of new rows into running ones
+        """
+
+        m = X.shape[0]
+        block_mean = np.mean(X, axis=0)
+        block_m2 = np.sum((X - block_mean)**2, axis=0)
+        delta = block_mean - mean
+        total = n + m
+        return total, mean + delta * m / total, m2 + block_m2 + delta**2 * n * m / total
+
+def _unscale_coefficients(beta: np.ndarray, mean_x: np.ndarray, std_x: np.ndarray, mean_z: float, std_z: float) -> np.ndarray:
+    """
+        Coefficients of the polynomial z = std_z * sum_j beta_j (x_j - mean_x_j) / std_x_j + mean_z on the original features,
+        the first feature being the intercept column of ones
+    """
+
+    beta = np.asarray(beta, dtype=np.float64)
+    coefficients = beta / std_x.reshape((-1,) + (1,) * (beta.ndim - 1))
+    coefficients[0] -= mean_x @ coefficients
+    coefficients *= std_z
+    coefficients[0] += mean_z
+    return coefficients
+
 def scale_mean(X_train: np.matrix, X_test: np.matrix, y_train: np.matrix, y_test: np.matrix):
     """
-        Subtracts the mean value from input data
+        Subtracts the mean value from input data (see Scaler)
         
         Parameters:
             X_train (numpy matrix) training design matrix
@@ -71,20 +348,13 @@ def scale_mean(X_train: np.matrix, X_test: np.matrix, y_train: np.matrix, y_test
             (numpy array) training target scaled
             (numpy array) testing target scaled
     """
-        
-    mean_X = np.mean(X_train, axis=0)
-    X_train_scaled = X_train - mean_X
-    X_test_scaled = X_test - mean_X
 
-    mean_y = np.mean(y_train)
-    y_train_scaled = y_train - mean_y
-    y_test_scaled = y_test - mean_y
-    
-    return X_train_scaled, X_test_scaled, y_train_scaled, y_test_scaled
+    scaler = Scaler().fit(X_train, y_train)
+    return scaler.transform(X_train), scaler.transform(X_test), scaler.transform_target(y_train), scaler.transform_target(y_test)
 
 def scale_mean_std(X_train: np.matrix, X_test: np.matrix, y_train: np.matrix, y_test: np.matrix) -> tuple:
     """
-        Subtracts the mean value and divides by the standard deviation
+        Subtracts the mean value and divides by the standard deviation (see Scaler); constant columns are only centered
 
         Parameters:
             X_train (numpy matrix) training design matrix
@@ -98,20 +368,9 @@ def scale_mean_std(X_train: np.matrix, X_test: np.matrix, y_train: np.matrix, y_
             (numpy array) training target scaled
             (numpy array) testing target scaled
     """
-    
-    X_train[0, :] = 0
 
-    mean_X = np.mean(X_train, axis=0)
-    std_X = np.std(X_train, axis=0)
-    X_train_scaled = (X_train - mean_X) / std_X
-    X_test_scaled = (X_test - mean_X) / std_X
-
-    mean_y = np.mean(y_train)
-    std_y = np.std(y_train)
-    y_train_scaled = (y_train - mean_y) / std_y
-    y_test_scaled = (y_test - mean_y) / std_y
-    
-    return X_train_scaled, X_test_scaled, y_train_scaled, y_test_scaled
+    scaler = Scaler(with_std=True).fit(X_train, y_train)
+    return scaler.transform(X_train), scaler.transform(X_test), scaler.transform_target(y_train), scaler.transform_target(y_test)
 
 def mean_squared_error(y_data: np.matrix, y_model: np.matrix):
     """
@@ -157,6 +416,239 @@ def ols(X: np.matrix, y: np.matrix, lmd: float = 0) -> np.matrix:
 
     return np.linalg.pinv(X.T @ X + lmd * np.eye(X.shape[1])) @ X.T @ y
 
+def ridge_path(X: np.matrix, y: np.matrix, lambdas: np.ndarray, rcond: float = 1e-15) -> tuple:
+    """
+        Given a design matrix and a data set, returns the beta predictor arrays of Ridge regression for a whole set of lmd values
+        from a single SVD X = U S V^T: beta(lmd) = V diag(s / (s^2 + lmd)) U^T y, so every extra lmd only costs a (p x k) product.
+        Gives the same results as ols(X, y, lmd) for each lmd, including the pseudo-inverse's cut-off of small eigenvalues when lmd == 0
+
+        Parameters:
+            X (numpy matrix): Design matrix
+            y (numpy array): Target data
+            lambdas (numpy array): lmd values for Ridge (lmd == 0 gives OLS)
+            rcond (float): relative cut-off for small eigenvalues of X^T X + lmd I, as in np.linalg.pinv
+
+        Returns:
+            (numpy array): (p x n_lambdas) beta coefficients, one column per lmd
+            (numpy array): (n x n_lambdas) predictions on X, one column per lmd
+    """
+
+    lambdas = np.asarray(lambdas, dtype=float).reshape(1, -1)
+    U, s, Vt = np.linalg.svd(np.asarray(X), full_matrices=False)
+    Uty = U.T @ np.asarray(y).reshape(-1, 1)
+
+    # Filter factors s / (s^2 + lmd), with the eigenvalues pinv would treat as zero cut off
+    s = s.reshape(-1, 1)
+    eig = s**2 + lambdas
+    keep = eig > rcond * np.max(eig, axis=0)
+    filters = np.divide(s, eig, out=np.zeros(eig.shape), where=keep)
+
+    betas = Vt.T @ (filters * Uty)
+    y_pred = U @ (filters * s * Uty)
+
+    return betas, y_pred
+
+
+def _cd_pass(features: np.ndarray, gram: np.ndarray, diag: np.ndarray, inv_diag: np.ndarray, threshold: np.ndarray, beta: np.ndarray, grad: np.ndarray):
+    """
+        One pass of Lasso coordinate descent over the given features, for all problems of lasso_path's batch; beta and grad are updated in place
+    """
+
+    for j in features:
+        old = beta[:, j]
+        rho = grad[:, j] + diag[:, j] * old
+        new = (np.maximum(rho - threshold, 0) + np.minimum(rho + threshold, 0)) * inv_diag[:, j] # soft thresholding
+        delta = new - old
+        if delta.any():
+            beta[:, j] = new
+            grad -= gram[:, j, :] * delta[:, np.newaxis] # gram is symmetric, rows are contiguous
+
+def _duality_gap(beta: np.ndarray, rhs: np.ndarray, grad: np.ndarray, zz: np.ndarray, threshold: np.ndarray) -> np.ndarray:
+    """
+        Duality gap of every Lasso problem of lasso_path's batch (times n), as used by sklearn's stopping criterion
+    """
+
+    r_norm2 = zz - np.sum(beta * (rhs + grad), axis=1) # ||z - X beta||^2
+    r_z = zz - np.sum(beta * rhs, axis=1) # (z - X beta)^T z
+    dual_norm = np.max(np.abs(grad), axis=1)
+    const = np.where(dual_norm > threshold, threshold / np.maximum(dual_norm, 1e-300), 1)
+    return 0.5 * r_norm2 * (1 + const**2) + threshold * np.sum(np.abs(beta), axis=1) - const * r_z
+
+def _active_set_solve(gram: np.ndarray, rhs: np.ndarray, threshold: float, beta: np.ndarray, max_steps: int) -> bool:
+    """
+        Tries to finish one Lasso problem exactly with an active set method: given the non-zero features and their signs, the optimality conditions are
+        the linear system X_A^T X_A beta_A = X_A^T z - n alpha sign(beta_A). Starting from the non-zero features of beta, beta moves towards the system's
+        solution, stopping to drop a feature where its coefficient crosses 0; once there, the feature most violating |X_j^T (z - X beta)| <= n alpha is added,
+        until all optimality conditions hold. beta is only replaced by the solution (in place) if it is found
+        Returns whether the solution was found within max_steps systems
+    """
+
+    x = beta.copy()
+    features = np.flatnonzero(x)
+    signs = np.sign(x[features])
+    tol = 1e-9 * (threshold + np.max(np.abs(rhs))) # round-off of the gradient
+    for _ in range(max_steps):
+        solution = np.zeros(0)
+        if features.shape[0] > 0:
+            try:
+                solution = np.linalg.solve(gram[np.ix_(features, features)], rhs[features] - threshold * signs)
+            except np.linalg.LinAlgError:
+                return False
+
+        # Go as far as the first coefficient crossing 0, and drop it
+        current = x[features]
+        wrong = np.sign(solution) != signs
+        if np.any(wrong):
+            steps = np.where(wrong, current / np.where(wrong, current - solution, 1), np.inf)
+            i = np.argmin(steps)
+            x[features] = current + steps[i] * (solution - current)
+            x[features[i]] = 0
+            features, signs = np.delete(features, i), np.delete(signs, i)
+            continue
+
+        # Otherwise go all the way, and add the feature violating its optimality condition the most
+        x[:] = 0
+        x[features] = solution
+        grad = rhs - gram @ x
+        grad[features] = 0
+        j = np.argmax(np.abs(grad))
+        if np.abs(grad[j]) <= threshold + tol:
+            beta[:] = x
+            return True
+        features, signs = np.append(features, j), np.append(signs, np.sign(grad[j]))
+    return False
+
+def lasso_path(gram: np.ndarray, rhs: np.ndarray, zz: np.ndarray, n: np.ndarray, alphas: np.ndarray, tol: float = 1e-4, max_iter: int = 10000, check_every: int = 10) -> np.ndarray:
+    """
+        Solves a batch of Lasso problems min_beta 1/(2n) ||z - X beta||^2 + alpha ||beta||_1 for a whole set of alpha values, by coordinate descent
+        on the precomputed Gram matrices (the data must be centered, the intercept being the mean of z). Same objective and stopping criterion as sklearn's Lasso.
+        Alphas are solved from largest to smallest, each warm-started from the previous solution, and only over the coordinates that the
+        (sequential) strong rule doesn't discard; the discarded ones are checked against the KKT conditions as the fit goes, and brought back if needed.
+        Every coordinate update is done for all problems of the batch at once.
+
+        Parameters:
+            gram (numpy array): (b x p x p) X^T X of every problem, or (p x p) for a single one
+            rhs (numpy array): (b x p) X^T z of every problem, or (p) for a single one
+            zz (numpy array|float): z^T z of every problem
+            n (numpy array|float): number of samples of every problem (or sum of their weights)
+            alphas (numpy array): alpha values (in any order)
+            tol (float): stops a fit once its duality gap is below tol * z^T z, or once it is solved exactly (see _active_set_solve)
+            max_iter (int): maximum number of passes over the coordinates per fit
+            check_every (int): number of passes over the coordinates between convergence checks
+
+        Returns:
+            (numpy array) (b x p x n_alphas) beta coefficients, or (p x n_alphas) for a single problem
+    """
+
+    single = gram.ndim == 2
+    gram = gram[np.newaxis] if single else gram
+    n_problems, p, _ = gram.shape
+    rhs = np.asarray(rhs, dtype=float).reshape(n_problems, p)
+    zz = np.broadcast_to(np.asarray(zz, dtype=float), (n_problems, ))
+    n = np.broadcast_to(np.asarray(n, dtype=float), (n_problems, ))
+    alphas = np.asarray(alphas, dtype=float).reshape(-1)
+
+    diag = np.diagonal(gram, axis1=1, axis2=2).copy()
+    has_variance = diag > 0
+    inv_diag = np.divide(1, diag, out=np.zeros(diag.shape), where=has_variance) # constant features stay at 0
+
+    beta = np.zeros((n_problems, p))
+    grad = rhs.copy() # X^T (z - X beta), kept up to date with every update
+    betas = np.zeros((n_problems, p, alphas.shape[0]))
+
+    prev_alpha = np.max(np.abs(rhs) / n[:, np.newaxis]) # smallest alpha giving beta = 0
+    for k in np.argsort(-alphas):
+        alpha = alphas[k]
+        threshold = n * alpha
+
+        # Sequential strong rule: features whose correlation is well under the threshold are very likely to stay at 0
+        strong = np.any((np.abs(grad) >= threshold[:, np.newaxis] - n[:, np.newaxis] * (prev_alpha - alpha)) | (beta != 0), axis=0) & np.any(has_variance, axis=0)
+        todo = np.arange(n_problems)
+        batch = (gram, diag, inv_diag, threshold) # of the problems not converged yet
+        for _ in range(0, max_iter, check_every):
+            # One pass over all the strong features, then passes over the non-zero ones only
+            features = np.flatnonzero(strong)
+            beta_todo, grad_todo = beta[todo], grad[todo]
+            _cd_pass(features, *batch, beta_todo, grad_todo)
+            active = features[np.any(beta_todo[:, features] != 0, axis=0)]
+            for _ in range(check_every - 1):
+                _cd_pass(active, *batch, beta_todo, grad_todo)
+            beta[todo] = beta_todo
+            grad[todo] = rhs[todo] - np.einsum('bij,bj->bi', batch[0], beta_todo) # without the round-off of the updates
+
+            # KKT check on the features the strong rule left out: bring back those that should be non-zero
+            violations = ~strong & np.any(np.abs(grad[todo]) > threshold[todo, np.newaxis], axis=0) & np.any(has_variance, axis=0)
+            if np.any(violations):
+                strong |= violations
+                continue
+
+            # Coordinate descent finds which features are non-zero, and their signs, long before it converges: finish the problems exactly from there if possible
+            converged = _duality_gap(beta[todo], rhs[todo], grad[todo], zz[todo], threshold[todo]) <= tol * zz[todo]
+            for i in np.flatnonzero(~converged):
+                if _active_set_solve(gram[todo[i]], rhs[todo[i]], threshold[todo[i]], beta[todo[i]], max_steps=p):
+                    grad[todo[i]] = rhs[todo[i]] - gram[todo[i]] @ beta[todo[i]]
+                    converged[i] = True
+            todo = todo[~converged]
+            batch = tuple(array[~converged] for array in batch)
+            if todo.shape[0] == 0:
+                break
+
+        betas[:, :, k] = beta
+        prev_alpha = alpha
+
+    return betas[0] if single else betas
+
+def _normal_equations_path(gram: np.ndarray, rhs: np.ndarray, lambdas: np.ndarray, rcond: float = 1e-15) -> np.ndarray:
+    """
+        pinv(X^T X + lmd I) X^T z for every lmd from one eigendecomposition of X^T X, with the same cut-off of small eigenvalues as np.linalg.pinv
+
+        Parameters:
+            gram (numpy array): X^T X
+            rhs (numpy array): X^T z
+            lambdas (numpy array): lmd values for Ridge (lmd == 0 gives OLS)
+            rcond (float): relative cut-off for small eigenvalues, as in np.linalg.pinv
+
+        Returns:
+            (numpy array) (p x n_lambdas) beta coefficients, one column per lmd
+    """
+
+    eig_vals, eig_vecs = np.linalg.eigh(gram)
+    shifted = eig_vals[:, np.newaxis] + lambdas
+    keep = np.abs(shifted) > rcond * np.max(np.abs(shifted), axis=0)
+    inv = np.divide(1, shifted, out=np.zeros(shifted.shape), where=keep)
+    return eig_vecs @ (inv * (eig_vecs.T @ rhs)[:, np.newaxis])
+
+def _cv_fold_mse(gram: np.ndarray, rhs: np.ndarray, n_features: list, X_test: np.ndarray, z_test: np.ndarray, lambdas: np.ndarray, rcond: float = 1e-15, lasso: bool = False, n: int = 1, zz: float = 1) -> np.ndarray:
+    """
+        Test MSE of one cross-validation fold for OLS/Ridge (or Lasso), for every degree and lmd, from the fold's (centered/scaled) training normal equations
+
+        Parameters:
+            gram (numpy array): X^T X of the training set at the highest degree
+            rhs (numpy array): X^T z of the training set at the highest degree
+            n_features (list<int>): number of features of every degree to fit
+            X_test (numpy array): test design matrix at the highest degree
+            z_test (numpy array): test target
+            lambdas (numpy array): lmd values for Ridge (lmd == 0 gives OLS), or alpha values for Lasso
+            rcond (float): relative cut-off for small eigenvalues, as in np.linalg.pinv
+            lasso (bool): whether to use Lasso instead of OLS/Ridge
+            n (int): number of training points (Lasso only)
+            zz (float): z^T z of the training set (Lasso only)
+
+        Returns:
+            (numpy array) (n_lambdas x n_degrees) test MSE
+    """
+
+    mse = np.zeros((lambdas.shape[0], len(n_features)))
+    for j, p in enumerate(n_features):
+        if lasso:
+            betas = lasso_path(gram[:p, :p], rhs[:p], zz, n, lambdas)
+        else:
+            betas = _normal_equations_path(gram[:p, :p], rhs[:p], lambdas, rcond)
+
+        z_tilde = X_test[:, :p] @ betas
+        mse[:, j] = np.mean((z_test[:, np.newaxis] - z_tilde)**2, axis=0)
+    return mse
+
 
 class Regression():
 
@@ -198,10 +690,13 @@ class Regression():
         self.X_max_deg = create_X_2D(max_degree, self.x, self.y)
         self.X_train_, self.X_test_, self.z_train, self.z_test = train_test_split(self.X_max_deg, self.z, test_size=0.25, random_state=self.seed)
         
+        # Fitted once on the max degree training set, and applied to the columns of any degree (see Scaler)
+        self.scaler = Scaler(with_std=self.with_std).fit(self.X_train_, self.z_train)
+
         self._scaled = False
         if scale:
-            do_scale = scale_mean if not self.with_std else scale_mean_std
-            self.X_train_, self.X_test_, self.z_train, self.z_test = do_scale(self.X_train_, self.X_test_, self.z_train, self.z_test)
+            self.X_train_, self.X_test_ = self.scaler.transform(self.X_train_), self.scaler.transform(self.X_test_)
+            self.z_train, self.z_test = self.scaler.transform_target(self.z_train), self.scaler.transform_target(self.z_test)
             self._scaled = True
 
     def ordinary_least_squares(self, degree: int, scale: bool = True):
@@ -209,16 +704,7 @@ class Regression():
             Ordrinary Least Squares function
         """
         
-        if not self._scaled and scale:
-            do_scale = scale_mean if not self.with_std else scale_mean_std
-            X_train_, X_test_, z_train, z_test = do_scale(self.X_train_, self.X_test_, self.z_train, self.z_test)
-            X_train = X_train_[:, :self._n_features(degree)]
-            X_test = X_test_[:, :self._n_features(degree)]
-        else:
-            X_train = self.X_train_[:, :self._n_features(degree)]
-            X_test = self.X_test_[:, :self._n_features(degree)]
-            z_train = self.z_train
-            z_test = self.z_test
+        X_train, X_test, z_train, z_test = self._ols_data(scale, degree)
         
         betas = ols(X_train, z_train)
         var_betas = self.noise**2 * np.diag(np.linalg.pinv(X_train.T @ X_train))
@@ -233,6 +719,119 @@ class Regression():
         
         return mse_train, r2_train, mse_test, r2_test, betas, var_betas
 
+    def ordinary_least_squares_path(self, max_degree: int = None, scale: bool = True, rcond: float = None):
+        """
+            Ordinary Least Squares for every degree from 1 to max_degree, from a single QR factorization of the max_degree design matrix.
+            The features of a degree are the first columns of the next degree's, so the leading p x p block of R (X = QR) is the R factor
+            of the degree's design matrix, and the leading p x p block of R^-1 its inverse: betas are R_p^-1 (Q^T z)_p and their variances
+            noise^2 * diag((X_p^T X_p)^-1) the squared row norms of R_p^-1, all read off the same factors.
+            The QR doubles as a rank-revealing one that keeps this nesting: a column whose distance to the span of the previous ones
+            (|R_jj|) is below rcond times its norm is numerically dependent on them, as is any column past the number of training rows.
+            Those columns are dropped, with zero beta and variance, and the others refactorized once (QR of the kept columns of R),
+            so that rank deficient degrees get the least squares fit on their independent columns, whose fitted values are those of the
+            pseudo-inverse up to the cut-off. Nothing is refactorized per degree.
+
+            Parameters:
+                max_degree (int|None): highest degree to fit; if None, uses the max_degree given to the constructor
+                scale (bool): whether to scale or not the data (see ordinary_least_squares)
+                rcond (float|None): relative cut-off for |R_jj| / ||X_j||; if None, machine epsilon times the largest dimension of the
+                    design matrix, as in np.linalg.matrix_rank
+
+            Returns:
+                (numpy array) train MSE for every degree
+                (numpy array) train R2 score for every degree
+                (numpy array) test MSE for every degree
+                (numpy array) test R2 score for every degree
+                (list<numpy array>) beta coefficients for every degree
+                (list<numpy array>) variance of the beta coefficients for every degree
+        """
+
+        if max_degree is None:
+            max_degree = self.max_degree
+
+        X_train, X_test, z_train, z_test = self._ols_data(scale, max_degree)
+
+        # Columns that are all zeros (e.g. the intercept once centered) get a zero beta & variance, like with the pseudo-inverse
+        active = np.flatnonzero(np.any(X_train != 0, axis=0))
+
+        # One factorization for all degrees; with fewer training rows than columns, R is wide and its last columns are all dependent
+        Q, R = np.linalg.qr(X_train[:, active])
+        c = Q.T @ z_train
+        if rcond is None:
+            rcond = np.finfo(R.dtype).eps * max(X_train.shape)
+        kept = np.flatnonzero(np.abs(np.diag(R)) > rcond * np.linalg.norm(R[:, :min(R.shape)], axis=0))
+        if kept.shape[0] < active.shape[0]:
+            # X[:, kept] = Q R[:, kept] = (Q Q_kept) R_kept
+            Q_kept, R = np.linalg.qr(R[:, kept])
+            c = Q_kept.T @ c
+        else:
+            R = R[:, kept]
+        R_inv = solve_triangular(R, np.eye(R.shape[0]))
+        var_all = np.cumsum(R_inv**2, axis=1)
+
+        mse_train = np.zeros(max_degree)
+        r2_train = np.zeros(max_degree)
+        mse_test = np.zeros(max_degree)
+        r2_test = np.zeros(max_degree)
+        betas_path = list()
+        var_betas_path = list()
+
+        for i, deg in enumerate(range(1, max_degree + 1)):
+            p = self._n_features(deg)
+            # Kept columns of this degree, always the first ones
+            m = np.searchsorted(kept, np.searchsorted(active, p))
+            columns = active[kept[:m]]
+
+            betas = np.zeros((p, 1))
+            var_betas = np.zeros(p)
+            if m > 0:
+                betas[columns] = R_inv[:m, :m] @ c[:m]
+                var_betas[columns] = self.noise**2 * var_all[:m, m - 1]
+
+            z_pred = X_train[:, :p] @ betas
+            z_tilde = X_test[:, :p] @ betas
+
+            mse_train[i] = mean_squared_error(z_train, z_pred)
+            mse_test[i] = mean_squared_error(z_test, z_tilde)
+            r2_train[i] = r2_score(z_train, z_pred)
+            r2_test[i] = r2_score(z_test, z_tilde)
+            betas_path.append(betas)
+            var_betas_path.append(var_betas)
+
+        return mse_train, r2_train, mse_test, r2_test, betas_path, var_betas_path
+
+    def ridge_regression_path(self, degree: int, lambdas: np.ndarray, scale: bool = True):
+        """
+            Ridge regression for a whole set of lmd values at once, from a single SVD of the degree's design matrix (see ridge_path)
+
+            Parameters:
+                degree (int): polynomial degree to fit
+                lambdas (numpy array): lmd values for Ridge (lmd == 0 gives OLS)
+                scale (bool): whether to scale or not the data (see ordinary_least_squares)
+
+            Returns:
+                (numpy array) train MSE for every lmd
+                (numpy array) train R2 score for every lmd
+                (numpy array) test MSE for every lmd
+                (numpy array) test R2 score for every lmd
+                (numpy array) (p x n_lambdas) beta coefficients, one column per lmd
+        """
+
+        X_train, X_test, z_train, z_test = self._ols_data(scale, degree)
+
+        betas, z_pred = ridge_path(X_train, z_train, lambdas)
+        z_tilde = X_test @ betas
+
+        # Metrics for every lmd (column) at once
+        z_train = np.asarray(z_train).reshape(-1, 1)
+        z_test = np.asarray(z_test).reshape(-1, 1)
+        mse_train = np.mean((z_train - z_pred)**2, axis=0)
+        mse_test = np.mean((z_test - z_tilde)**2, axis=0)
+        r2_train = 1 - np.sum((z_train - z_pred)**2, axis=0) / np.sum((z_train - np.mean(z_train))**2)
+        r2_test = 1 - np.sum((z_test - z_tilde)**2, axis=0) / np.sum((z_test - np.mean(z_test))**2)
+
+        return mse_train, r2_train, mse_test, r2_test, betas
+
     def bootstrap(self, degree: int, max_bootstrap_cycle: int, lmd: float = 0, alpha: float = 0):
         """
             Bootstrap function
@@ -240,88 +839,239 @@ class Regression():
             Parameters: 
                 degree (int): polynomial degree to fit
                 max_bootstrap_cycle (int): max bootstrap iterations
-                lmd
+                lmd (float): lmd value for Ridge (if lmd == 0, then OLS)
+                alpha (float): alpha value for Lasso (if alpha != 0, lmd is ignored)
+
+            Returns:
+                (float) test MSE
+                (float) bias
+                (float) variance
+        """
+
+        if alpha == 0:  # ridge and ols
+            mse_test, bias, var = self.bootstrap_path(degree, max_bootstrap_cycle, np.array([lmd]))
+        else:
+            mse_test, bias, var = self.bootstrap_path(degree, max_bootstrap_cycle, np.array([alpha]), lasso=True)
+        return mse_test[0], bias[0], var[0]
+
+    def bootstrap_path(self, degree: int, max_bootstrap_cycle: int, lambdas: np.ndarray, rcond: float = 1e-15, chunk_elements: int = 2**24, lasso: bool = False):
         """
+            Bootstrap for OLS/Ridge (or Lasso) with a whole set of lmd values at once, with the same resamples as bootstrap.
+            A resample only changes how many times each training point is counted, so instead of copying the resampled data,
+            every cycle's normal equations are built from the count-weighted Gram matrix X^T diag(counts) X, for batches of cycles at once.
+            One eigendecomposition per cycle then gives the solution of pinv(X^T C X + lmd I) X^T C z for every lmd, and the test
+            predictions are folded into running means/variances instead of being stored for every cycle.
+            For Lasso, the Gram matrices are centered with each resample's means (as sklearn's Lasso does with fit_intercept) and the whole path
+            of every cycle of the batch is solved at once with lasso_path.
+
+            Parameters:
+                degree (int): polynomial degree to fit
+                max_bootstrap_cycle (int): max bootstrap iterations
+                lambdas (numpy array): lmd values for Ridge (lmd == 0 gives OLS), or alpha values for Lasso
+                rcond (float): relative cut-off for small eigenvalues, as in np.linalg.pinv
+                chunk_elements (int): rough number of elements of the largest temporary array, setting how many cycles are batched together
+                lasso (bool): whether to use Lasso instead of OLS/Ridge
+
+            Returns:
+                (numpy array) test MSE for every lmd
+                (numpy array) bias for every lmd
+                (numpy array) variance for every lmd
+        """
+
+        lambdas = np.asarray(lambdas, dtype=float).reshape(-1)
+        name = 'alpha' if lasso else 'lmd'
+        print(f"n={self.data_points} | {max_bootstrap_cycle} bootstrap cycles with degree {degree}/{self.max_degree} and {lambdas.shape[0]} {name} values" if lambdas.shape[0] > 1 else
+              f"n={self.data_points} | {max_bootstrap_cycle} bootstrap cycles with degree {degree}/{self.max_degree} and {name}={lambdas[0]}")
 
         # select wanted features
-        X_train = self.X_train_[:, :self._n_features(degree)]
-        X_test = self.X_test_[:, :self._n_features(degree)]
-        
-        z_tilde_all = np.zeros((self.z_test.shape[0], max_bootstrap_cycle))
-        
-        for bootstrap_cycle in range(max_bootstrap_cycle):
-            print(f"n={self.data_points} | bootstrap cycle {bootstrap_cycle+1}/{max_bootstrap_cycle} with degree {degree}/{self.max_degree} and lmd={lmd if alpha == 0 else alpha}", end="\r")
-            
-            # split and scale the data
-            X_train_resampled, z_train_resampled = resample(X_train, self.z_train, random_state=self.seed * bootstrap_cycle)    
-            
-            if alpha == 0:  # ridge and ols
-                # fit OLS model to franke function
-                betas = ols(X_train_resampled, z_train_resampled, lmd=lmd)
-                # predictions
-                z_tilde_all[:, bootstrap_cycle] = (X_test @ betas).reshape((self.z_test.shape[0], ))
-            else:           # lasso with sklearn
-                lasso = Lasso(alpha=alpha, tol=1e-1, max_iter=1e7)
-                lasso.fit(X_train_resampled, z_train_resampled)
-                z_tilde_all[:, bootstrap_cycle] = lasso.predict(X_test).reshape((self.z_test.shape[0], ))
+        X_train = np.asarray(self.X_train_[:, :self._n_features(degree)])
+        X_test = np.asarray(self.X_test_[:, :self._n_features(degree)])
+        z_train = np.asarray(self.z_train).reshape(-1)
+        z_test = np.asarray(self.z_test).reshape(-1, 1)
+        n, p = X_train.shape
+        if lasso:
+            # Centered sums don't depend on a shift of the data; shifting by the overall mean keeps the centering below well-conditioned
+            shift_x, shift_z = np.mean(X_train, axis=0), np.mean(z_train)
+            X_train, X_test, z_train = X_train - shift_x, X_test - shift_x, z_train - shift_z
+
+        # running mean & sum of squared deviations of the predictions (test point x lmd), and summed squared errors (lmd)
+        z_tilde_mean = np.zeros((X_test.shape[0], lambdas.shape[0]))
+        z_tilde_m2 = np.zeros((X_test.shape[0], lambdas.shape[0]))
+        squared_errors = np.zeros(lambdas.shape[0])
+
+        cycles_per_chunk = max(1, chunk_elements // max(n * p, X_test.shape[0] * lambdas.shape[0]))
+        for start in range(0, max_bootstrap_cycle, cycles_per_chunk):
+            cycles = range(start, min(start + cycles_per_chunk, max_bootstrap_cycle))
+
+            # How many times each training point is drawn, with the same draws as sklearn's resample
+            counts = np.array([np.bincount(resample(np.arange(n), random_state=self.seed * bootstrap_cycle), minlength=n) for bootstrap_cycle in cycles], dtype=float)
+
+            # Count-weighted normal equations of every cycle
+            gram = np.matmul(X_train.T[np.newaxis] * counts[:, np.newaxis, :], X_train)
+            rhs = (counts * z_train) @ X_train
+
+            if lasso:
+                # centered with every resample's means; the intercept is the resample's mean of z
+                mean_x = counts @ X_train / n
+                mean_z = counts @ z_train / n
+                gram -= n * mean_x[:, :, np.newaxis] * mean_x[:, np.newaxis, :]
+                rhs -= n * mean_x * mean_z[:, np.newaxis]
+                zz = counts @ z_train**2 - n * mean_z**2
+                betas = lasso_path(gram, rhs, zz, n, lambdas)
+                z_tilde = np.matmul(X_test[np.newaxis] - mean_x[:, np.newaxis, :], betas) + mean_z[:, np.newaxis, np.newaxis] + shift_z
+            else:
+                # pinv(gram + lmd I) for every lmd from the eigendecomposition: inverse of the eigenvalues, with the ones pinv would treat as zero cut off
+                eig_vals, eig_vecs = np.linalg.eigh(gram)
+                shifted = eig_vals[:, :, np.newaxis] + lambdas
+                keep = np.abs(shifted) > rcond * np.max(np.abs(shifted), axis=1, keepdims=True)
+                inv = np.divide(1, shifted, out=np.zeros(shifted.shape), where=keep)
+                coefs = inv * np.einsum('bji,bj->bi', eig_vecs, rhs)[:, :, np.newaxis]
+                z_tilde = np.matmul(X_test @ eig_vecs, coefs) # (cycles x test points x lmd)
+
+            # Fold the chunk into the running statistics (pairwise update of mean & variance)
+            done = start
+            n_new = len(cycles)
+            chunk_mean = np.mean(z_tilde, axis=0)
+            delta = chunk_mean - z_tilde_mean
+            z_tilde_mean += delta * n_new / (done + n_new)
+            z_tilde_m2 += np.sum((z_tilde - chunk_mean)**2, axis=0) + delta**2 * done * n_new / (done + n_new)
+            squared_errors += np.sum((z_test - z_tilde)**2, axis=(0, 1))
 
         # compute MSE, BIAS and VAR
-        mse_test = mean_squared_error(self.z_test, z_tilde_all)
-        bias = np.mean((self.z_test.reshape(self.z_test.shape[0], ) - np.mean(z_tilde_all, axis=1))**2)
-        var = np.mean(np.var(z_tilde_all, axis=1))
-        
-        # to update print line
-        print()
+        mse_test = squared_errors / (max_bootstrap_cycle * X_test.shape[0])
+        bias = np.mean((z_test - z_tilde_mean)**2, axis=0)
+        var = np.mean(z_tilde_m2 / max_bootstrap_cycle, axis=0)
+
         return mse_test, bias, var
     
     def k_folds_cross_validation(self, degree: int, n_folds: int, lmd: float = 0, alpha: float = 0):
         """
             K Folds cross validation
         """
-        
-        print(f"n={self.data_points} | n_folds={n_folds} with degree {degree}/{self.max_degree} and lmd={lmd if alpha == 0 else alpha}")
-        
-        # select wanted features
-        X = self.X_max_deg[:, :self._n_features(degree)]
 
-        # initialize KFold object
-        kfolds = KFold(n_splits=n_folds)
-        
-        # perform the cross-validation to estimate MSE
-        scores_KFold = np.zeros(n_folds)
+        if alpha == 0:  # ridge and ols
+            return self.k_folds_cross_validation_path([degree], n_folds, np.array([lmd]))[0, 0]
+        return self.k_folds_cross_validation_path([degree], n_folds, np.array([alpha]), lasso=True)[0, 0]
+
+    def k_folds_cross_validation_path(self, degrees: np.ndarray, n_folds: int, lambdas: np.ndarray, n_jobs: int = 1, rcond: float = 1e-15, lasso: bool = False) -> np.ndarray:
+        """
+            K Folds cross validation for OLS/Ridge (or Lasso), for a whole set of degrees and lmd values at once, with the same folds as k_folds_cross_validation.
+            The sums X^T X, X^T z, ... of every fold are computed once at the highest degree; each training set's normal equations are the total minus
+            its fold's, centered (and scaled if with_std) from those sums alone. Every degree's system is the leading block of the highest degree's,
+            and one eigendecomposition per degree and fold gives the solution for every lmd (for Lasso, lasso_path solves the whole path from the same system).
+
+            Parameters:
+                degrees (numpy array): polynomial degrees to fit
+                n_folds (int): number of folds
+                lambdas (numpy array): lmd values for Ridge (lmd == 0 gives OLS), or alpha values for Lasso
+                n_jobs (int): number of processes to evaluate the folds in
+                rcond (float): relative cut-off for small eigenvalues, as in np.linalg.pinv
+                lasso (bool): whether to use Lasso instead of OLS/Ridge
+
+            Returns:
+                (numpy array) (n_lambdas x n_degrees) mean test MSE over the folds
+        """
+
+        degrees = np.atleast_1d(degrees)
+        lambdas = np.asarray(lambdas, dtype=float).reshape(-1)
+        print(f"n={self.data_points} | n_folds={n_folds} with {degrees.shape[0]} degrees up to {np.max(degrees)}/{self.max_degree} and {lambdas.shape[0]} {'alpha' if lasso else 'lmd'} values")
+
+        X = np.asarray(self.X_max_deg[:, :self._n_features(np.max(degrees))])
+        z = np.asarray(self.z).reshape(-1)
 
+        # same permutation and folds as k_folds_cross_validation
         rng = np.random.default_rng(np.random.MT19937(seed=self.seed * n_folds))
-        
         perm = rng.permuted(np.arange(0, X.shape[0]))
         X = X[perm, :]
-        z = self.z[perm]
+        z = z[perm]
+        folds = [test_inds for _, test_inds in KFold(n_splits=n_folds).split(X)]
 
-        i = 0
-        for train_inds, test_inds in kfolds.split(X):
-            # select k_folds data
-            X_train = X[train_inds, :]
-            z_train = z[train_inds]
+        # Centered sums don't depend on a shift of the data; shifting by the overall mean keeps the subtractions below well-conditioned
+        X = X - np.mean(X, axis=0)
+        z = z - np.mean(z)
+
+        # n, sum x, sum z, sum z^2, X^T X, X^T z of every fold, and in total
+        fold_sums = [(len(f), np.sum(X[f], axis=0), np.sum(z[f]), z[f] @ z[f], X[f].T @ X[f], X[f].T @ z[f]) for f in folds]
+        total_sums = [sum(sums[k] for sums in fold_sums) for k in range(6)]
+
+        tasks = list()
+        for f, sums in zip(folds, fold_sums):
+            # training set = everything but the fold
+            n, sum_x, sum_z, sum_zz, gram, rhs = (total - fold for total, fold in zip(total_sums, sums))
+
+            # center with the training set's means
+            mean_x = sum_x / n
+            mean_z = sum_z / n
+            gram = gram - np.outer(sum_x, mean_x)
+            rhs = rhs - sum_x * mean_z
+            zz = sum_zz - sum_z * mean_z
+            X_test = X[f] - mean_x
+            z_test = z[f] - mean_z
+
+            if self.with_std:
+                # scale by the training set's standard deviations, leaving constant columns (the intercept) as they are
+                std_x = np.sqrt(np.maximum(np.diag(gram), 0) / n)
+                std_x[std_x == 0] = 1
+                std_z = np.sqrt(zz / n)
+                gram = gram / np.outer(std_x, std_x)
+                rhs = rhs / (std_x * std_z)
+                zz = zz / std_z**2
+                X_test = X_test / std_x
+                z_test = z_test / std_z
+
+            tasks.append((gram, rhs, [self._n_features(deg) for deg in degrees], X_test, z_test, lambdas, rcond, lasso, n, zz))
+
+        if n_jobs == 1:
+            fold_mse = [_cv_fold_mse(*task) for task in tasks]
+        else:
+            with ProcessPoolExecutor(max_workers=n_jobs) as pool:
+                fold_mse = list(pool.map(_cv_fold_mse, *zip(*tasks)))
+
+        return np.mean(fold_mse, axis=0)
+
+    def predict(self, beta: np.ndarray, degree: int, x: np.ndarray, y: np.ndarray, scale: bool = True) -> np.ndarray:
+        """
+            Predictions of a fitted polynomial in the original units of z, at any points, without building their design matrix (see polynomial_2D)
+
+            Parameters:
+                beta (numpy array): (p) beta coefficients, as returned by ordinary_least_squares & co
+                degree (int): polynomial degree of beta
+                x (numpy array): x coordinates
+                y (numpy array): y coordinates (x and y are broadcast against each other, e.g. a row and a column for a whole grid)
+                scale (bool): whether beta was fitted on scaled data (the scale argument of the method it comes from)
+
+            Returns:
+                (numpy array) predicted z, with the broadcast shape of x and y
+        """
+
+        if self._scaled or scale:
+            beta = self.scaler.unscale_coefficients(np.asarray(beta).reshape(-1))
+        return polynomial_2D(beta, degree, x, y)
+
+    def _ols_data(self, scale: bool = True, degree: int = None) -> tuple:
+        """
+            Returns the train/test design matrices of a degree and the targets, scaled if asked for and not already done by the constructor
+
+            Parameters:
+                scale (bool): whether to scale or not the data
+                degree (int|None): degree of the design matrices; if None, uses max_degree
+
+            Returns:
+                (numpy matrix) training design matrix
+                (numpy matrix) testing design matrix
+                (numpy array) training target
+                (numpy array) testing target
+        """
+
+        if degree is None:
+            degree = self.max_degree
+        X_train = self.X_train_[:, :self._n_features(degree)]
+        X_test = self.X_test_[:, :self._n_features(degree)]
+
+        if not self._scaled and scale:
+            return self.scaler.transform(X_train), self.scaler.transform(X_test), self.scaler.transform_target(self.z_train), self.scaler.transform_target(self.z_test)
+        return X_train, X_test, self.z_train, self.z_test
 
-            X_test = X[test_inds, :]
-            z_test = z[test_inds]
-            
-            do_scale = scale_mean if not self.with_std else scale_mean_std
-            X_train, X_test, z_train, z_test = do_scale(X_train, X_test, z_train, z_test)
-
-            if alpha == 0:  # ridge and ols
-                # model and prediction
-                betas = ols(X_train, z_train, lmd=lmd)
-                z_tilde = X_test @ betas
-            else:           # lasso
-                lasso = Lasso(alpha=alpha, tol=1e-1, max_iter=1e7)
-                lasso.fit(X_train, z_train)
-                z_tilde = lasso.predict(X_test)
-
-            scores_KFold[i] = mean_squared_error(z_test.ravel(), z_tilde.ravel())
-            i += 1
-        
-        return np.mean(scores_KFold)
-    
     def _n_features(self, deg: int):
         """
             Returns the number of features for the design matrix when we fit a deg polynomial
@@ -334,3 +1084,222 @@ class Regression():
         """
         return int((deg + 1) * (deg + 2) / 2)
 
+
+
+class _Moments():
+    """
+        Running number of points, means and centered sums of squares/products X^T X, X^T z, z^T z of a design matrix and target,
+        updated block by block with the pairwise formulas of Chan et al., which stay accurate without knowing the means in advance
+    """
+
+    def __init__(self, n_features: int):
+        self.n = 0
+        self.mean_x = np.zeros(n_features)
+        self.mean_z = 0.
+        self.gram = np.zeros((n_features, n_features))
+        self.rhs = np.zeros(n_features)
+        self.zz = 0.
+
+    def update(self, X: np.ndarray, z: np.ndarray):
+        """
+            Adds a block of rows
+
+            Parameters:
+                X (numpy array): (m x p) block of the design matrix
+                z (numpy array): (m) block of the target
+        """
+
+        m = X.shape[0]
+        if m == 0:
+            return
+
+        # the block's own centered sums, merged with the running ones through the difference of means
+        mean_x = np.mean(X, axis=0)
+        mean_z = np.mean(z)
+        X = X - mean_x
+        z = z - mean_z
+        d_x = mean_x - self.mean_x
+        d_z = mean_z - self.mean_z
+        n = self.n + m
+        weight = self.n * m / n
+
+        self.gram += X.T @ X + weight * np.outer(d_x, d_x)
+        self.rhs += X.T @ z + weight * d_x * d_z
+        self.zz += z @ z + weight * d_z**2
+        self.mean_x += d_x * m / n
+        self.mean_z += d_z * m / n
+        self.n = n
+
+
+class StreamingRegression():
+
+    def __init__(self, max_degree: int, chunks, test_size: float = 0.25, seed: int = 0, scale: bool = True, with_std: bool = False, block_size: int = 4096):
+        """
+            Out-of-core OLS/Ridge regression, for data sets whose design matrix doesn't fit in memory (e.g. full resolution terrain)
+
+            The data is read in chunks, and the design matrix is only ever built for block_size rows at a time: a first pass accumulates
+            X^T X and X^T z of the training set at max_degree (see _Moments), from which every degree's normal equations are the leading block;
+            regression_path then goes over the data a second time to compute the errors. Memory use is O(p^2 + block_size * p) whatever the
+            number of points. Each point is put in the test set with probability test_size, from a generator seeded by seed and the chunk's
+            index, so that both passes make the same split.
+
+            Parameters:
+                max_degree (int): max polynomial degree to fit
+                chunks (function|list): function returning a new iterator over the (x, y, z) chunks of the data set every time it's called
+                                        (e.g. terrain.terrain_chunks), or a list of such chunks
+                test_size (float): fraction of the points to use for testing
+                seed (int): seed of the train/test split
+                scale (bool): whether to scale or not the data (with the training set's means, as scale_mean)
+                with_std (bool): if true, will also divide by the training set's standard deviations when scaling
+                block_size (int): number of rows of the design matrix built at once
+        """
+
+        self.max_degree = max_degree
+        self.chunks = chunks
+        self.test_size = test_size
+        self.seed = seed
+        self.block_size = block_size
+
+        # First pass: training set's X^T X, X^T z, and the test target's sum of squares for R2
+        p = self._n_features(max_degree)
+        self.train = _Moments(p)
+        self.test = _Moments(0) # only the target's moments are needed
+        for X, z, test in self._blocks():
+            self.train.update(X[~test], z[~test])
+            self.test.update(X[test, :0], z[test])
+
+        # Normal equations of the (scaled) training set
+        n = self.train.n
+        if scale:
+            self.shift_x, self.shift_z = self.train.mean_x, self.train.mean_z
+            self.gram, self.rhs = self.train.gram, self.train.rhs
+        else:
+            self.shift_x, self.shift_z = np.zeros(p), 0.
+            self.gram = self.train.gram + n * np.outer(self.train.mean_x, self.train.mean_x)
+            self.rhs = self.train.rhs + n * self.train.mean_x * self.train.mean_z
+        self.std_x, self.std_z = np.ones(p), 1.
+        if scale and with_std:
+            # leaving constant columns (the intercept) as they are
+            self.std_x = np.sqrt(np.maximum(np.diag(self.gram), 0) / n)
+            self.std_x[self.std_x == 0] = 1
+            self.std_z = np.sqrt(self.train.zz / n)
+            self.gram = self.gram / np.outer(self.std_x, self.std_x)
+            self.rhs = self.rhs / (self.std_x * self.std_z)
+
+    def betas(self, degree: int, lambdas: np.ndarray = 0, rcond: float = 1e-15) -> np.ndarray:
+        """
+            OLS/Ridge beta coefficients of a degree, on the scaled data (same as ols(X_train, z_train, lmd) on the whole training set)
+
+            Parameters:
+                degree (int): polynomial degree to fit
+                lambdas (numpy array|float): lmd values for Ridge (lmd == 0 gives OLS)
+                rcond (float): relative cut-off for small eigenvalues, as in np.linalg.pinv
+
+            Returns:
+                (numpy array) (p x n_lambdas) beta coefficients, one column per lmd
+        """
+
+        p = self._n_features(degree)
+        lambdas = np.asarray(lambdas, dtype=float).reshape(-1)
+        return _normal_equations_path(self.gram[:p, :p], self.rhs[:p], lambdas, rcond)
+
+    def regression_path(self, degrees: np.ndarray, lambdas: np.ndarray = 0, rcond: float = 1e-15) -> tuple:
+        """
+            Train and test errors of OLS/Ridge for a whole set of degrees and lmd values, in a second pass over the data
+
+            Parameters:
+                degrees (numpy array): polynomial degrees to fit
+                lambdas (numpy array|float): lmd values for Ridge (lmd == 0 gives OLS)
+                rcond (float): relative cut-off for small eigenvalues, as in np.linalg.pinv
+
+            Returns:
+                (numpy array) (n_lambdas x n_degrees) train MSE
+                (numpy array) (n_lambdas x n_degrees) train R2 score
+                (numpy array) (n_lambdas x n_degrees) test MSE
+                (numpy array) (n_lambdas x n_degrees) test R2 score
+                (list<numpy array>) (p x n_lambdas) beta coefficients for every degree
+        """
+
+        degrees = np.atleast_1d(degrees)
+        lambdas = np.asarray(lambdas, dtype=float).reshape(-1)
+        n_features = [self._n_features(deg) for deg in degrees]
+        betas = [self.betas(deg, lambdas, rcond) for deg in degrees]
+
+        # Sums of squared residuals, block by block
+        sse_train = np.zeros((lambdas.shape[0], degrees.shape[0]))
+        sse_test = np.zeros((lambdas.shape[0], degrees.shape[0]))
+        for X, z, test in self._blocks(np.max(degrees)):
+            X = (X - self.shift_x[:X.shape[1]]) / self.std_x[:X.shape[1]]
+            z = (z - self.shift_z) / self.std_z
+            for j, (p, beta) in enumerate(zip(n_features, betas)):
+                residuals = (z[:, np.newaxis] - X[:, :p] @ beta)**2
+                sse_train[:, j] += np.sum(residuals[~test], axis=0)
+                sse_test[:, j] += np.sum(residuals[test], axis=0)
+
+        # Sums of squares around each set's own mean, in the same units
+        sst_train = self.train.zz / self.std_z**2
+        sst_test = self.test.zz / self.std_z**2
+
+        mse_train = sse_train / self.train.n
+        mse_test = sse_test / self.test.n
+        r2_train = 1 - sse_train / sst_train
+        r2_test = 1 - sse_test / sst_test
+
+        return mse_train, r2_train, mse_test, r2_test, betas
+
+    def predict(self, beta: np.ndarray, degree: int, x: np.ndarray, y: np.ndarray) -> np.ndarray:
+        """
+            Predictions of a fitted polynomial in the original units of z, at any points, without building their design matrix (see polynomial_2D)
+
+            Parameters:
+                beta (numpy array): (p) beta coefficients, e.g. a column of betas or regression_path's
+                degree (int): polynomial degree of beta
+                x (numpy array): x coordinates
+                y (numpy array): y coordinates (x and y are broadcast against each other, e.g. a row and a column for a whole grid)
+
+            Returns:
+                (numpy array) predicted z, with the broadcast shape of x and y
+        """
+
+        p = self._n_features(degree)
+        beta = _unscale_coefficients(np.asarray(beta).reshape(-1), self.shift_x[:p], self.std_x[:p], self.shift_z, self.std_z)
+        return polynomial_2D(beta, degree, x, y)
+
+    def _blocks(self, degree: int = None):
+        """
+            Goes over the data set block by block
+
+            Parameters:
+                degree (int|None): degree of the design matrix to build; if None, uses max_degree
+
+            Yields:
+                (numpy array) (m x p) block of the design matrix
+                (numpy array) (m) block of the target
+                (numpy array) (m) whether each point of the block is in the test set
+        """
+
+        if degree is None:
+            degree = self.max_degree
+
+        chunks = self.chunks() if callable(self.chunks) else self.chunks
+        for i, (x, y, z) in enumerate(chunks):
+            x = np.asarray(x, dtype=np.float64).reshape(-1)
+            y = np.asarray(y, dtype=np.float64).reshape(-1)
+            z = np.asarray(z, dtype=np.float64).reshape(-1)
+            test = np.random.default_rng(np.random.SeedSequence(self.seed, spawn_key=(i,))).uniform(0, 1, z.shape[0]) < self.test_size
+
+            for start in range(0, z.shape[0], self.block_size):
+                rows = slice(start, start + self.block_size)
+                yield create_X_2D(degree, x[rows], y[rows]), z[rows], test[rows]
+
+    def _n_features(self, deg: int):
+        """
+            Returns the number of features for the design matrix when we fit a deg polynomial
+            
+            Parameters:
+                deg (int): degree of fitting polynomial
+                
+            Returns:
+                (int) number of features
+        """
+        return int((deg + 1) * (deg + 2) / 2)
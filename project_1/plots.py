@@ -4,6 +4,8 @@ import matplotlib.pyplot as plt
 from matplotlib.ticker import LinearLocator, FormatStrFormatter
 from matplotlib import cm
 
+from functions import polynomial_2D
+
 def plot_prediction_3D(beta: np.matrix, degree: int, min_x: float = 0, max_x: float = 1, min_y: float = 0, max_y: float = 1, name: str = 'Prediction', display_steps: int = 100, show: bool = True, save_fig: bool = False) -> None:
     """
         Given a beta feature matrix of a certain degree, plots the estimate of a 2D function over a certain domain
@@ -24,14 +26,11 @@ def plot_prediction_3D(beta: np.matrix, degree: int, min_x: float = 0, max_x: fl
     fig = plt.figure(name)
     ax = plt.axes(projection='3d')
 
-    # Generate linspaced meshgrid to show predictions at smooth points
-    xm_display, ym_display = np.meshgrid(np.linspace(min_x, max_x, display_steps), np.linspace(min_y, max_y, display_steps))
-    zm_display = np.zeros((display_steps, display_steps))
-    betaIdx = 0
-    for i in range(degree + 1):
-        for k in range(i + 1):
-            zm_display += beta[betaIdx] * (xm_display ** (i - k)) * (ym_display ** k)
-            betaIdx += 1
+    # Evaluate the prediction on a linspaced grid to show it at smooth points, a row of x against a column of y
+    x_display = np.linspace(min_x, max_x, display_steps)
+    y_display = np.linspace(min_y, max_y, display_steps)
+    zm_display = polynomial_2D(beta, degree, x_display[np.newaxis, :], y_display[:, np.newaxis])
+    xm_display, ym_display = np.meshgrid(x_display, y_display)
     surf = ax.plot_surface(xm_display, ym_display, zm_display, cmap=cm.gray, linewidth=0, antialiased=True)
 
     # Plot surface
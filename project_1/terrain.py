@@ -7,15 +7,108 @@ from matplotlib import cm
 import numpy as np
 import math
 
+try:
+    import tifffile # memory-maps uncompressed tif files
+except ImportError:
+    tifffile = None
+
 
 # Terrain files included in res/
 TERRAIN_1 = 'SRTM_data_Norway_1'
 TERRAIN_2 = 'SRTM_data_Norway_2'
 
 
-def load_terrain(name: str, min_xy: float = 0, max_xy: float = 1, min_z: float = 0, max_z: float = 1, rng: np.random.Generator = None, downsample: int = 1, scissor: float = None, sparse_sample: float = 0.5, plot: bool = False, show_plot: bool = True, save_fig: bool = False) -> np.matrix:
+def open_terrain(name: str) -> np.ndarray:
+    """
+        Opens a terrain file without reading it in: the raster is memory-mapped, so only the parts that get indexed are read from disk.
+        Falls back to reading the whole image if it can't be memory-mapped (compressed tif files, or tifffile not installed)
+
+        Parameters:
+            name (str): Name of the tif file to open
+
+        Returns:
+            (np.ndarray|np.memmap): 2D array of heights
+    """
+
+    filename = 'res/' + name + '.tif'
+    if tifffile is not None:
+        try:
+            return tifffile.memmap(filename, mode='r')
+        except ValueError:
+            pass # not stored contiguously
+    return np.asarray(imread(filename))
+
+def terrain_tiles(terrain: np.ndarray, N: int = None, downsample: int = 1, tile_size: int = 1024):
+    """
+        Goes over the (cropped, downsampled) terrain by square tiles, reading in one tile at a time, for terrains that don't fit in memory
+
+        Parameters:
+            terrain (np.ndarray|np.memmap): Terrain as returned by open_terrain
+            N (int|None): Size of the square to go over, from the top left corner, in pixels of the full resolution terrain; if None, the biggest possible square
+            downsample (int): Only every nth row and column are kept
+            tile_size (int): Size of the tiles, in points of the downsampled terrain
+
+        Yields:
+            (int): Row of the tile's first point in the downsampled terrain
+            (int): Column of the tile's first point in the downsampled terrain
+            (np.ndarray): The tile's heights
+    """
+
+    if N is None:
+        N = min(terrain.shape[0], terrain.shape[1])
+    n_points = len(range(0, N, downsample))
+    for row in range(0, n_points, tile_size):
+        rows = slice(row * downsample, min(row + tile_size, n_points) * downsample, downsample)
+        for col in range(0, n_points, tile_size):
+            cols = slice(col * downsample, min(col + tile_size, n_points) * downsample, downsample)
+            yield row, col, np.asarray(terrain[rows, cols])
+
+def terrain_chunks(name: str, min_xy: float = 0, max_xy: float = 1, min_z: float = 0, max_z: float = 1, downsample: int = 1, scissor: float = None, tile_size: int = 1024):
+    """
+        Data set of a linearly sampled terrain read in tile by tile, for terrains too big to load with load_terrain (see functions.StreamingRegression).
+        The points and scaling are the same as load_terrain's with rng=None; the height range is found once, when this function is called
+
+        Parameters:
+            name (str): Name of the tif file to load in
+            min_xy, max_xy, min_z, max_z, downsample, scissor: See load_terrain
+            tile_size (int): Size of the tiles, in points of the downsampled terrain
+
+        Returns:
+            (function): Function returning a new iterator over the (x, y, z) chunks of the terrain, one per tile, every time it's called
+    """
+
+    raster = open_terrain(name)
+    N = min(raster.shape[0], raster.shape[1])
+    if scissor is not None:
+        N = int(N*scissor)
+    downsample = int(downsample) if downsample > 1 else 1
+    n_points = len(range(0, N, downsample))
+
+    if min_z is not None and max_z is not None:
+        tiles = [(np.min(tile), np.max(tile)) for _, _, tile in terrain_tiles(raster, N, downsample, tile_size)]
+        terrain_min, terrain_max = min(lo for lo, _ in tiles), max(hi for _, hi in tiles)
+
+    def chunks():
+        for row, col, tile in terrain_tiles(raster, N, downsample, tile_size):
+            # x goes along the columns and y along the rows, as with load_terrain's meshgrid
+            x, y = np.meshgrid(np.arange(col, col + tile.shape[1], dtype=float), np.arange(row, row + tile.shape[0], dtype=float))
+            z = tile.astype(float)
+            if min_z is not None and max_z is not None:
+                z = (z - terrain_min) / (terrain_max - terrain_min) * (max_z - min_z) + min_z
+            if min_xy is not None and max_xy is not None:
+                x = x / (n_points - 1) * (max_xy - min_xy) + min_xy
+                y = y / (n_points - 1) * (max_xy - min_xy) + min_xy
+            else:
+                x = x * n_points / (n_points - 1)
+                y = y * n_points / (n_points - 1)
+            yield np.ravel(x), np.ravel(y), np.ravel(z)
+
+    return chunks
+
+def load_terrain(name: str, min_xy: float = 0, max_xy: float = 1, min_z: float = 0, max_z: float = 1, rng: np.random.Generator = None, downsample: int = 1, scissor: float = None, sparse_sample: float = 0.5, plot: bool = False, show_plot: bool = True, save_fig: bool = False, tile_size: int = 1024) -> np.matrix:
     """
         From an image filename, loads the terrain matrix with optional downsampling
+        Only the cropped & downsampled window (or the sampled points when sampling non linearly) is read from disk, see open_terrain
 
         Parameters:
             name (str): Name of the tif file to load in
@@ -29,6 +122,7 @@ def load_terrain(name: str, min_xy: float = 0, max_xy: float = 1, min_z: float =
             sparse_sample (float): If rng is not None, the fraction of data points to keep out of the initial data
             plot (bool): Whether to show a 3D plot of the input data before returning the results
             show_plot (bool): Whether to call matplotlib.pyplot.show() after generating the plot; unused if plot == False
+            tile_size (int): Size of the tiles the window is read in by to find its minimum & maximum height when sampling non linearly
 
         Returns:
             (np.matrix): Numpy array of Xs
@@ -36,42 +130,43 @@ def load_terrain(name: str, min_xy: float = 0, max_xy: float = 1, min_z: float =
             (np.matrix): Numpy array of Zs/heights corresponding to (x,y) pairs
     """
 
-    # Load full res image
-    terrain = np.matrix(imread('res/' + name + '.tif'))
+    # Open full res image, without reading it
+    raster = open_terrain(name)
 
     # Select the biggest possible square shape
-    N = min(terrain.shape[0], terrain.shape[1])
-    terrain = terrain[:N, :N]
+    N = min(raster.shape[0], raster.shape[1])
 
     # Crop it if necessary
     if scissor is not None:
         N = int(N*scissor)
-        terrain = terrain[:N, :N]
 
     # Downsample if needed
-    if downsample > 1:
-        terrain = terrain[::downsample, ::downsample]
-        N = terrain.shape[0] # i.e. N = N / downsample
-    
-    # Remap (normalize to 0..1 by default) input data (invlerp -> lerp)
-    if min_z is not None and max_z is not None:
-        terrain = (terrain - np.min(terrain)) / (np.max(terrain) - np.min(terrain)) * (max_z - min_z) + min_z
-    
+    downsample = int(downsample) if downsample > 1 else 1
+    full_N = N
+    N = len(range(0, full_N, downsample)) # i.e. N = N / downsample
+
     if rng is not None:
-        # Non-linearly distributed x & y
+        # Non-linearly distributed x & y: only read the sampled points
         x = np.sort(rng.uniform(0, N, math.floor(N * sparse_sample)))
         y = np.sort(rng.uniform(0, N, math.floor(N * sparse_sample)))
+        terrain = np.asarray(raster[np.ix_(x.astype(int) * downsample, y.astype(int) * downsample)]).T # z[u, v] = terrain[x[v], y[u]]
         x, y = np.meshgrid(x, y)
-        z = np.zeros(x.shape)
-        for u in range(z.shape[0]):
-            for v in range(z.shape[1]):
-                z[u, v] = terrain[int(x[u,v]), int(y[u,v])]
-        terrain = z
+
+        # The heights are remapped with the whole window's extent, read in tile by tile
+        if min_z is not None and max_z is not None:
+            tiles = [(np.min(tile), np.max(tile)) for _, _, tile in terrain_tiles(raster, full_N, downsample, tile_size)]
+            terrain_min, terrain_max = min(lo for lo, _ in tiles), max(hi for _, hi in tiles)
     else:
         # Linearly distributed x & y
+        terrain = np.asarray(raster[:full_N:downsample, :full_N:downsample])
+        terrain_min, terrain_max = np.min(terrain), np.max(terrain)
         x = np.linspace(0, N, N)
         y = np.linspace(0, N, N)
         x, y = np.meshgrid(x, y)
+
+    # Remap (normalize to 0..1 by default) input data (invlerp -> lerp)
+    if min_z is not None and max_z is not None:
+        terrain = (terrain - terrain_min) / (terrain_max - terrain_min) * (max_z - min_z) + min_z
     
     # Remap (normalize to 0..1 by default) x and y (invlerp -> lerp)
     if min_xy is not None and max_xy is not None:
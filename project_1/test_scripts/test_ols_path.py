@@ -0,0 +1,44 @@
+import numpy as np
+from functions import Regression
+
+
+# Settings
+noise = 0.1
+seed = 3
+tol = 1e-8 # Relative tolerance on the MSEs where the path and the per-degree fits should agree
+
+
+def check_path(reg, degrees, scale=True):
+    """
+        Compares ordinary_least_squares_path with ordinary_least_squares on the given degrees
+    """
+    mse_train, r2_train, mse_test, r2_test, betas, var_betas = reg.ordinary_least_squares_path(scale=scale)
+    assert len(betas) == reg.max_degree and all(np.all(np.isfinite(b)) for b in betas)
+    max_rel_err = 0
+    for deg in degrees:
+        mse_train_deg, _, mse_test_deg, _, betas_deg, _ = reg.ordinary_least_squares(deg, scale)
+        assert betas[deg - 1].shape == betas_deg.shape
+        max_rel_err = max(max_rel_err, abs(mse_train[deg - 1] - mse_train_deg) / mse_train_deg, abs(mse_test[deg - 1] - mse_test_deg) / mse_test_deg)
+    assert max_rel_err < tol, max_rel_err
+    return max_rel_err
+
+
+# The constructor scales the data once and for all unless told not to (see Regression._ols_data), so the unscaled path needs its own instance
+
+# 1) More training rows than features: well-conditioned degrees match the per-degree fits
+for scale in [True, False]:
+    reg = Regression(6, 600, noise, seed, scale=scale)
+    err = check_path(reg, range(1, 7), scale)
+    print(f'n = 600, degrees 1-6, scale={scale}: max relative MSE difference {err:.2e}')
+
+# 2) Fewer training rows (75) than features at the max degree (91): no crash, and the low degrees still match
+for scale in [True, False]:
+    reg = Regression(12, 100, noise, seed, scale=scale)
+    err = check_path(reg, range(1, 6), scale)
+    print(f'n = 100, degrees 1-5 of 12, scale={scale}: max relative MSE difference {err:.2e}')
+
+    # The underdetermined degrees get finite betas too (checked in check_path), fitting the 75 training rows exactly
+    mse_train = reg.ordinary_least_squares_path(scale=scale)[0]
+    underdetermined = [deg for deg in range(1, 13) if (deg + 1) * (deg + 2) // 2 > 75]
+    assert np.all(mse_train[np.array(underdetermined) - 1] < 1e-10 * np.var(reg.z_train)), mse_train
+    print(f'n = 100, degrees {underdetermined} (more features than training rows), scale={scale}: max train MSE {np.max(mse_train[np.array(underdetermined) - 1]):.2e}')
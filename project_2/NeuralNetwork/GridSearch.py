@@ -0,0 +1,228 @@
+import numpy as np
+import itertools
+import copy
+from time import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from .Model import Model
+from .ResultsStore import ResultsStore, to_json, fingerprint
+
+
+def is_range(value) -> bool:
+    """
+        Whether a hyper-parameter value should be searched over (lists and numpy arrays) rather than kept constant
+    """
+    return isinstance(value, list) or isinstance(value, np.ndarray)
+
+
+def describe(model: Model) -> dict:
+    """
+        Architecture of a model, written to the metadata of results files so that results of other architectures aren't resumed from
+    """
+    return {
+        'input_size': model._input_size,
+        'layers': [[layer.get_size(), to_json(layer._activation_fn), layer._initial_bias, to_json(layer._initial_weights)] for layer in model.layers],
+        'cost_function': type(model.cost_function).__name__,
+        'dtype': str(model.dtype),
+    }
+
+
+# Per-process copy of the model & data, set once when a worker starts so they aren't sent again with every cell
+_worker = dict()
+
+def _init_worker(model: Model, data: tuple):
+    _worker['model'] = model
+    _worker['data'] = data
+
+def _train_cell(index: int, params: dict, seed: int, sgd: bool, verbose: bool) -> dict:
+    """
+        Trains a fresh copy of the worker's model with one set of hyper-parameters
+        Parameters:
+            index (int): Index of the cell in the search
+            params (dict): Keyword arguments to pass to Model.train
+            seed (int): Seed to initialise the weights/biases and the SGD random number generator with
+            sgd (bool): Whether to use stochastic gradient descent or gradient descent
+            verbose (bool): Whether to print information about training as it occurs
+        Returns:
+            (dict): The cell's index, seed, training & testing errors and time taken
+    """
+    model = copy.deepcopy(_worker['model'])
+    train_inputs, train_targets, test_inputs, test_targets = _worker['data']
+
+    model.random_state = seed
+    model.reset(reset_rng=True)
+
+    start = time()
+    result = model.train(train_inputs, train_targets, testing_inputs=test_inputs, testing_targets=test_targets, sgd=sgd, verbose=verbose, **params)
+    train_err, test_err = result if result is not None else (np.nan, np.nan)
+
+    return {'index': index, 'seed': int(seed), 'train_err': float(train_err), 'test_err': float(test_err), 'time': time() - start}
+
+
+class GridSearch:
+    """
+        Hyper-parameter search executor for Model.train
+        Every cell of the search trains its own copy of the model, so cells are independent and can run in parallel in a process pool;
+        results are written to a ResultsStore as soon as each cell finishes, and cells already in the store are skipped when running again.
+        Note: with the 'spawn' start method (Windows, MacOS) the calling script must be guarded by `if __name__ == '__main__':`
+    """
+
+    def __init__(self, model: Model, n_jobs: int = 1, filename: str = None, metadata: dict = None):
+        """
+            Initialises the search executor
+            Parameters:
+                model (Model): Model to search over; it is copied for every cell and never modified itself
+                n_jobs (int): Number of worker processes to use; if 1, cells are trained sequentially in the current process
+                filename (str|None): JSON-lines file to store the results in (see ResultsStore); if None, results are only kept in memory
+                metadata (dict|None): Information to write at the top of a new results file; the model's seed and architecture are always added,
+                                      and an existing file written with different metadata isn't resumed from (see ResultsStore)
+        """
+        self.model = model
+        self.n_jobs = n_jobs
+        self.store = None
+        if filename is not None:
+            self.store = ResultsStore(filename, metadata={'seed': model.random_state, 'model': describe(model), **(metadata if metadata is not None else dict())})
+
+    @staticmethod
+    def grid_cells(**params) -> tuple:
+        """
+            Builds the cells of a full grid search
+            Parameters:
+                **params: Keyword arguments for Model.train; values given as lists or numpy arrays are searched over, others are kept constant
+            Returns:
+                (list<dict>): Parameters of every cell, in row-major order over the grid axes
+                (list<tuple>): (name, values) of every grid axis, in order
+        """
+        axes = [(name, value) for name, value in params.items() if is_range(value)]
+        const = {name: value for name, value in params.items() if not is_range(value)}
+
+        cells = []
+        for values in itertools.product(*[values for _, values in axes]):
+            cell = dict(const)
+            for (name, _), value in zip(axes, values):
+                cell[name] = value
+            cells.append(cell)
+        return cells, axes
+
+    @staticmethod
+    def random_cells(n_samples: int, rng: np.random.Generator, **params) -> list:
+        """
+            Builds the cells of a random search
+            Parameters:
+                n_samples (int): Number of cells to draw
+                rng (np.random.Generator): Random number generator to draw the cells with
+                **params: Keyword arguments for Model.train; values given as lists or numpy arrays are drawn from uniformly,
+                          callables are called with rng to draw a value (e.g. lambda rng: 10**rng.uniform(-5, -1)), others are kept constant
+            Returns:
+                (list<dict>): Parameters of every cell
+        """
+        cells = []
+        for _ in range(n_samples):
+            cell = dict()
+            for name, value in params.items():
+                if is_range(value):
+                    cell[name] = value[rng.integers(len(value))]
+                elif callable(value):
+                    cell[name] = value(rng)
+                else:
+                    cell[name] = value
+            cells.append(cell)
+        return cells
+
+    def cell_seeds(self, n_cells: int, reset_rng: bool = True) -> list:
+        """
+            Seeds used to initialise every cell, independently of the order in which the cells run
+            Parameters:
+                n_cells (int): Number of cells
+                reset_rng (bool): If True, every cell uses the model's own seed, and thus the same initial weights & biases;
+                                  otherwise each cell gets its own seed, derived from the model's seed and the cell's index
+            Returns:
+                (list<int>): One seed per cell
+        """
+        if reset_rng:
+            return [self.model.random_state] * n_cells
+        return [int(seq.generate_state(1)[0]) for seq in np.random.SeedSequence(self.model.random_state).spawn(n_cells)]
+
+    def run(self, cells: list, train_inputs: np.ndarray, train_targets: np.ndarray, test_inputs: np.ndarray, test_targets: np.ndarray, sgd: bool = True, reset_rng: bool = True, verbose: bool = False, resume: bool = True) -> list:
+        """
+            Trains the model once for every cell
+            Parameters:
+                cells (list<dict>): Keyword arguments for Model.train, one dict per cell (see grid_cells and random_cells)
+                train_inputs (np.ndarray): Training input data
+                train_targets (np.ndarray): Training output data
+                test_inputs (np.ndarray): Testing input data
+                test_targets (np.ndarray): Testing output data
+                sgd (bool): Whether to use stochastic gradient descent or gradient descent
+                reset_rng (bool): Whether all cells start from the same weights & biases (see cell_seeds)
+                verbose (bool): Whether to print information about training as it occurs
+                resume (bool): Whether to reuse the results of cells (same parameters, seed, sgd and data) already in the results file instead of training them again
+            Returns:
+                (list<dict>): One result per cell, in the same order as cells, holding the cell's parameters, seed, sgd, data fingerprint, training & testing errors and time taken
+        """
+        seeds = self.cell_seeds(len(cells), reset_rng=reset_rng)
+        results = [None] * len(cells)
+        data = tuple(self.model.as_array(d) for d in (train_inputs, train_targets, test_inputs, test_targets))
+        run_params = {'sgd': sgd, 'data': fingerprint(*data)}
+
+        # Pick up cells finished by a previous run
+        if resume and self.store is not None:
+            for i, cell in enumerate(cells):
+                results[i] = self.store.find({**cell, 'seed': seeds[i], **run_params})
+        todo = [i for i in range(len(cells)) if results[i] is None]
+        if len(todo) < len(cells):
+            print(f"[ Resuming: {len(cells) - len(todo)}/{len(cells)} cells already done ]")
+
+        def finish(result):
+            index = result.pop('index')
+            result = {**{name: to_json(value) for name, value in cells[index].items()}, **run_params, **result}
+            results[index] = result
+            if self.store is not None:
+                self.store.append(result)
+            print(f"[ Cell {sum(r is not None for r in results)}/{len(cells)} done ]", end='\r')
+
+        if len(todo) > 0:
+            if self.n_jobs == 1:
+                _init_worker(self.model, data)
+                for i in todo:
+                    finish(_train_cell(i, cells[i], seeds[i], sgd, verbose))
+            else:
+                with ProcessPoolExecutor(max_workers=self.n_jobs, initializer=_init_worker, initargs=(self.model, data)) as pool:
+                    futures = [pool.submit(_train_cell, i, cells[i], seeds[i], sgd, verbose) for i in todo]
+                    for future in as_completed(futures):
+                        finish(future.result())
+            print()
+
+        return results
+
+    def grid(self, train_inputs: np.ndarray, train_targets: np.ndarray, test_inputs: np.ndarray, test_targets: np.ndarray, sgd: bool = True, reset_rng: bool = True, verbose: bool = False, resume: bool = True, **params) -> tuple:
+        """
+            Full grid search over any number of hyper-parameters
+            Parameters:
+                train_inputs, train_targets, test_inputs, test_targets, sgd, reset_rng, verbose, resume: See run
+                **params: Keyword arguments for Model.train; values given as lists or numpy arrays are searched over, others are kept constant
+            Returns:
+                (list<dict>): One result per cell (see run)
+                (np.ndarray): Testing errors as an N-dimensional array, one dimension per grid axis; NaN for cells dropped by successive halving,
+                              whose errors were taken after fewer epochs than the others' (see their 'epochs_trained')
+                (list<tuple>): (name, values) of every grid axis, in order
+        """
+        cells, axes = self.grid_cells(**params)
+        results = self.run(cells, train_inputs, train_targets, test_inputs, test_targets, sgd=sgd, reset_rng=reset_rng, verbose=verbose, resume=resume)
+        if results is None:
+            return
+        results_mat = np.array([np.nan if result.get('stopped') == 'halved' else result['test_err'] for result in results]).reshape([len(values) for _, values in axes])
+        return results, results_mat, axes
+
+    def random(self, n_samples: int, train_inputs: np.ndarray, train_targets: np.ndarray, test_inputs: np.ndarray, test_targets: np.ndarray, sgd: bool = True, reset_rng: bool = True, verbose: bool = False, resume: bool = True, **params) -> list:
+        """
+            Random search, drawing the cells with a generator seeded from the model's seed
+            Parameters:
+                n_samples (int): Number of cells to draw and train
+                train_inputs, train_targets, test_inputs, test_targets, sgd, reset_rng, verbose, resume: See run
+                **params: See random_cells
+            Returns:
+                (list<dict>): One result per cell (see run)
+        """
+        rng = np.random.default_rng(np.random.MT19937(seed=self.model.random_state))
+        cells = self.random_cells(n_samples, rng, **params)
+        return self.run(cells, train_inputs, train_targets, test_inputs, test_targets, sgd=sgd, reset_rng=reset_rng, verbose=verbose, resume=resume)
@@ -2,6 +2,7 @@
 import numpy as np
 from abc import ABC
 from .activation_function.ActivationFunction import ActivationFunction
+from .layer_optimizer.LayerOptimizer import LayerOptimizer
 
 class Layer(ABC):
     """
@@ -23,6 +24,11 @@ class Layer(ABC):
         self._initial_bias = initial_bias
         self._initial_weights = initial_weights if initial_weights is not None else [-1, 1]
         self._biases = np.ones((self._size, 1)) * initial_bias
+        self._weights_gradient = None
+        self._biases_gradient = None
+        self._optimizer = None
+        self._weights_state = None
+        self._biases_state = None
 
     def get_size(self) -> int:
         """
@@ -32,15 +38,50 @@ class Layer(ABC):
         """
         return self._size
 
-    def init_weights(self, input_size: int, rng: np.random.Generator):
+    def get_gradients(self) -> tuple:
+        """
+            Returns the layer's gradient buffers, as filled by the last call to backward()
+            The buffers are returned by reference, so they can be modified in place (e.g. clipped or reduced across workers) before apply_gradients is called
+            Returns:
+                (np.ndarray): Gradient of the cost with respect to the weights, same shape as the weights
+                (np.ndarray): Gradient of the cost with respect to the biases, same shape as the biases
+        """
+        return self._weights_gradient, self._biases_gradient
+
+    def init_weights(self, input_size: int, rng: np.random.Generator, dtype: type = np.float64):
         """
             Initialises the weights array for the layer with stochastic noise
             The size corresponding to the number of nodes in the previous layer
             Parameters:
                 input_size (int): Number of inputs the layer will be receiving, i.e. number of nodes in the previous layer
                 rng (np.random.Generator): Random number generator to use when selecting initial weights
+                dtype (type): Floating point type to store the weights, biases and gradients as
+        """
+        self._weights = rng.uniform(self._initial_weights[0], self._initial_weights[1], (self._size, input_size)).astype(dtype)
+        self._biases = self._biases.astype(dtype)
+
+        # Gradient buffers, allocated once and overwritten by every call to backward()
+        self._weights_gradient = np.zeros_like(self._weights)
+        self._biases_gradient = np.zeros_like(self._biases)
+
+        # Fresh optimizer state for the new parameters
+        if self._optimizer is not None:
+            self.set_optimizer(self._optimizer)
+
+    def set_optimizer(self, optimizer: LayerOptimizer):
         """
-        self._weights = rng.uniform(self._initial_weights[0], self._initial_weights[1], (self._size, input_size))
+            Sets the update rule used by apply_gradients, and allocates its state next to the weights & biases
+            This method should not be called before init_weights is called at least once!
+            Parameters:
+                optimizer (LayerOptimizer|None): The update rule to use; if None, plain gradient descent is used
+        """
+        self._optimizer = optimizer
+        if optimizer is None:
+            self._weights_state = None
+            self._biases_state = None
+            return
+        self._weights_state = optimizer.init_state(self._weights)
+        self._biases_state = optimizer.init_state(self._biases)
     
     def reset(self, rng: np.random.Generator):
         """
@@ -50,16 +91,18 @@ class Layer(ABC):
                 rng (np.random.Generator): Random number generator to use when selecting initial weights
         """
         self._biases = np.ones((self._size, 1)) * self._initial_bias
-        self.init_weights(self._weights.shape[1], rng)
+        self.init_weights(self._weights.shape[1], rng, dtype=self._weights.dtype)
 
-    def forward(self, inputs: np.matrix) -> tuple:
+    def forward(self, inputs: np.ndarray, z_out: np.ndarray = None, a_out: np.ndarray = None) -> tuple:
         """
             Runs through the layer once with a given list of inputs and returns the outputs obtained
             Parameters:
-                inputs (np.matrix): Inputs to run through the nodes (must match size of weights/biases!)
+                inputs (np.ndarray): Inputs to run through the nodes (must match size of weights/biases!)
+                z_out (np.ndarray|None): Optional preallocated (n_inputs x layer size) buffer to write the outputs without activation function into
+                a_out (np.ndarray|None): Optional preallocated (n_inputs x layer size) buffer to write the activated outputs into; must be given alongside z_out
             Returns:
-                (np.matrix): Outputs from the different nodes - size corresponds to size of the layer
-                (np.matrix): Same outputs without activation function
+                (np.ndarray): Outputs from the different nodes - size corresponds to size of the layer
+                (np.ndarray): Same outputs without activation function
         """
         
         if self._weights is None or self._biases is None or len(self._weights) != self._biases.shape[0]:
@@ -72,33 +115,54 @@ class Layer(ABC):
         
         # Accumulate inputs for each node
         # Because of the way we structure the input, we need to transpose inputs and outputs :)
-        z = (self._weights @ inputs.T + self._biases).T
-        return self._activation_fn(z), z
+        if z_out is None:
+            z = (self._weights @ inputs.T + self._biases).T
+            return self._activation_fn(z), z
+
+        # Same thing, but written straight into the given buffers
+        np.matmul(inputs, self._weights.T, out=z_out)
+        z_out += self._biases.T
+        self._activation_fn(z_out, out=a_out)
+        return a_out, z_out
 
-    def backward(self, activated_inputs: np.matrix, inputs: np.matrix, error: np.matrix, prev_activation_fn: ActivationFunction, learning_rate: float, regularization: float) -> np.matrix:
+    def backward(self, activated_inputs: np.ndarray, inputs: np.ndarray, error: np.ndarray, prev_activation_fn: ActivationFunction, regularization: float) -> np.ndarray:
         """
-            Gradient descent to optimize the layer
+            Computes the gradients of the cost with respect to the layer's weights & biases and stores them in the layer's gradient buffers
+            The weights and biases themselves are left untouched until apply_gradients is called
+            All arguments may hold a whole mini-batch (one row per sample), in which case the gradients are summed over the rows;
+            since the cost function's gradient is already divided by the batch size, this amounts to averaging over the batch.
+            The regularization term λW is added once, to the averaged gradient
             Parameters:
-                activated_inputs (np.matrix): The inputs the layer receives
-                inputs (np.matrix): The inputs the layer receives (no activation fn)
-                error (np.matrix): Computed error estimate for the layer
+                activated_inputs (np.ndarray): The inputs the layer receives
+                inputs (np.ndarray): The inputs the layer receives (no activation fn)
+                error (np.ndarray): Computed error estimate for the layer
                 prev_activation_fn (ActivationFunction): Activation function of the previous layer (l-1)
-                learning_rate (float): Learning rate η to use to update the weights & biases
                 regularization (float): Regularization parameter λ to control the rate of descent
             Returns:
-                (np.matrix): Weighted error in inputs, to use to train the previous layer
+                (np.ndarray): Weighted error in inputs, to use to train the previous layer
         """
-        # Compute gradients
-        # Simple gradient descent
-        weights_gradient = (activated_inputs.T @ error) + regularization * self._weights.T
-        bias_gradient = error + regularization * self._biases.T
-        
-        # Adjust weights and biases
-        self._weights -= learning_rate * weights_gradient.T
-        self._biases -= learning_rate * bias_gradient.T
+        # Compute gradients into the preallocated buffers
+        np.matmul(error.T, activated_inputs, out=self._weights_gradient)
+        self._weights_gradient += regularization * self._weights
+        self._biases_gradient[:, 0] = np.sum(error, axis=0)
+        self._biases_gradient += regularization * self._biases
 
         # Return the estimated error in inputs
-        return np.multiply((error @ self._weights), prev_activation_fn.d(inputs))
+        return (error @ self._weights) * prev_activation_fn.d(inputs)
+
+    def apply_gradients(self, learning_rate: float):
+        """
+            Updates the weights & biases using the gradients currently held in the layer's buffers,
+            with the layer's optimizer if one was set, or a simple gradient descent step otherwise
+            Parameters:
+                learning_rate (float): Learning rate η to use to update the weights & biases
+        """
+        if self._optimizer is None:
+            self._weights -= learning_rate * self._weights_gradient
+            self._biases -= learning_rate * self._biases_gradient
+            return
+        self._optimizer.update(self._weights, self._weights_gradient, self._weights_state, learning_rate)
+        self._optimizer.update(self._biases, self._biases_gradient, self._biases_state, learning_rate)
 
 
 
@@ -0,0 +1,7 @@
+
+from .layer_optimizer.SGD import SGD
+from .layer_optimizer.Momentum import Momentum
+from .layer_optimizer.Nesterov import Nesterov
+from .layer_optimizer.RMSprop import RMSprop
+from .layer_optimizer.AdaGrad import AdaGrad
+from .layer_optimizer.Adam import Adam
@@ -2,10 +2,11 @@
 import numpy as np
 import matplotlib.pyplot as plt
 from time import time
-import pickle
 
 from .Layer import Layer, HiddenLayer, OutputLayer
+from .Workspace import Workspace
 from .cost_function.CostFunction import CostFunction
+from .layer_optimizer.LayerOptimizer import LayerOptimizer
 
 from sklearn.model_selection import train_test_split
 
@@ -16,15 +17,17 @@ class Model:
         Can add layers to the network with add_layer
     """
     
-    def __init__(self, input_size: int, cost_function: CostFunction, random_state: int = int(time())):
+    def __init__(self, input_size: int, cost_function: CostFunction, random_state: int = int(time()), dtype: type = np.float64):
         """
             Artificial neural network class
             Parameters:
                 input_size (int): Size of the input layer (i.e. number of features), which will determine the number of weights in the first hidden layer
                 random_state (int): Seed value to use for RNG
+                dtype (type): Floating point type used for weights, biases and all data fed through the network; np.float32 is faster, np.float64 more precise
         """
 
         self._input_size = input_size
+        self.dtype = np.dtype(dtype)
 
         self.random_state = random_state
         self.rng = np.random.default_rng(np.random.MT19937(seed=self.random_state))
@@ -32,6 +35,9 @@ class Model:
         self.layers = list()
         self.cost_function = cost_function
         self._has_output = False
+        self._workspace = None
+        self._optimizer = None
+        self._early_stopping = None # (best error, epochs since) of the patience counter, carried over by train when start_epoch > 0
         
     
 
@@ -51,10 +57,12 @@ class Model:
         n_inputs = self._input_size
         if len(self.layers) > 0:
             n_inputs = self.layers[-1].get_size()
-        layer.init_weights(n_inputs, self.rng)
+        layer.init_weights(n_inputs, self.rng, dtype=self.dtype)
+        layer.set_optimizer(self._optimizer)
         
         # Add layer
         self.layers.append(layer)
+        self._workspace = None # Architecture changed, training buffers need to be re-allocated
         if isinstance(layer, OutputLayer):
             self._has_output = True # Locks the layers array to prevent adding more after the output layer
 
@@ -78,28 +86,62 @@ class Model:
         
         for layer in self.layers:
             layer.reset(self.rng)
+        self._early_stopping = None
 
+    def set_optimizer(self, optimizer: LayerOptimizer):
+        """
+            Sets the update rule used to apply gradients to every layer, with freshly initialised state (velocities, running averages, ...)
+            The state is kept between calls to train, and re-initialised by reset
+            Parameters:
+                optimizer (LayerOptimizer|None): The update rule to use (see LayerOptimizers.py); if None, plain gradient descent is used
+        """
+        self._optimizer = optimizer
+        for layer in self.layers:
+            layer.set_optimizer(optimizer)
+
+    def get_workspace(self, batch_size: int) -> Workspace:
+        """
+            Returns the buffers used by feed_forward in training mode, only allocating new ones if the batch size or architecture changed since the last call
+            Parameters:
+                batch_size (int): Number of rows (samples) that will be fed forward
+            Returns:
+                (Workspace): Per-layer pre-activation & activation buffers
+        """
+        layer_sizes = [layer.get_size() for layer in self.layers]
+        if self._workspace is None or not self._workspace.fits(batch_size, layer_sizes, self.dtype):
+            self._workspace = Workspace(batch_size, layer_sizes, dtype=self.dtype)
+        return self._workspace
 
-    def feed_forward(self, inputs: np.matrix, training: bool = False) -> tuple:
+    def as_array(self, data: np.ndarray) -> np.ndarray:
+        """
+            Converts data (np.ndarray, np.matrix, list, ...) to a C-contiguous 2D array with the model's dtype, copying only if needed
+            Parameters:
+                data (np.ndarray|list<float>): Data to convert; a 1D array is taken as a single row
+            Returns:
+                (np.ndarray): The converted data
+        """
+        data = np.ascontiguousarray(data, dtype=self.dtype)
+        if data.ndim == 1:
+            data = data.reshape((1, -1))
+        return data
+
+
+    def feed_forward(self, inputs: np.ndarray, training: bool = False) -> tuple:
         """
             Runs through the network once with a given list of inputs and returns the obtained outputs
             Parameters:
-                inputs (np.matrix|list<float>): The set of inputs to give to the network
+                inputs (np.ndarray|list<float>): The set of inputs to give to the network
                 training (bool): If true, will return hidden layer activations alongside the actual outputs
             Returns:
-                (np.matrix|list<float>): Outputs obtained out of the output layer after running through all layers, returned only if `training` was `false`
-                (list<np.matrix>): Hidden layer activated outputs, returned only if `training` was `true`
-                (list<np.matrix>): Hidden layer outputs (no activation function), returned only if `training` was `true`
+                (np.ndarray|list<float>): Outputs obtained out of the output layer after running through all layers, returned only if `training` was `false`
+                (list<np.ndarray>): Hidden layer activated outputs, returned only if `training` was `true`
+                (list<np.ndarray>): Hidden layer outputs (no activation function), returned only if `training` was `true`
+            Note: in training mode the returned matrices live in the model's workspace (see get_workspace) and are overwritten by the next training pass
         """
 
         # If the input is given as a 1D array, we're wanting to use that as a single row in the input matrix (i.e. run with a single set of input data)
-        output_list = False
-        if isinstance(inputs, list):
-            inputs = np.matrix([inputs])
-            output_list = True
-        
-        if inputs.ndim == 1:
-            inputs = np.matrix(inputs)
+        output_list = isinstance(inputs, list) and np.ndim(inputs) == 1
+        inputs = self.as_array(inputs)
 
         if not self.is_ready():
             print('\033[91mNetwork hasn\'t been given an output layer! Make sure the neural network is set-up with all layers before starting training\033[0m')
@@ -112,12 +154,16 @@ class Model:
         # Process from layer to layer sequentially, passing the output of each layer into the next
         tmp = inputs
         if training:
+            workspace = self.get_workspace(inputs.shape[0])
             a_h = [inputs]
             z_h = [inputs]
-        for layer in self.layers:
+        for l, layer in enumerate(self.layers):
 
-            # Activate the layer
-            tmp, z = layer.forward(tmp)
+            # Activate the layer; in training mode, straight into the workspace buffers
+            if training:
+                tmp, z = layer.forward(tmp, z_out=workspace.z[l], a_out=workspace.a[l])
+            else:
+                tmp, z = layer.forward(tmp)
 
             # If for whatever reason some kind of error occured, the output of forward() will be null
             if tmp is None:
@@ -136,83 +182,127 @@ class Model:
             return a_h, z_h
         return tmp
 
-    def error(self, inputs: np.matrix, targets: np.matrix) -> float:
+    def error(self, inputs: np.ndarray, targets: np.ndarray) -> float:
         """
             Feeds forward once, then returns the mean squared error between targets and outputs
             Parameters:
-                inputs (np.matrix): Inputs to run the network on
-                targets (np.matrix): Expected outputs
+                inputs (np.ndarray): Inputs to run the network on
+                targets (np.ndarray): Expected outputs
             Returns:
                 (float): Mean squared error after prediction
         """
-        return self.cost_function.error_nn(targets, self.feed_forward(inputs))
+        return self.cost_function.error_nn(self.as_array(targets), self.feed_forward(inputs))
 
 
-    def back_prop(self, inputs: np.matrix, targets: np.matrix, learning_rate: float = 0.1, regularization: float = 0):
+    def compute_gradients(self, inputs: np.ndarray, targets: np.ndarray, regularization: float = 0) -> bool:
         """
-            Back-propagates once with a set of actual and desired outputs, so the next run will match the targets closer (hopefully)
+            Feeds forward once and back-propagates the error, filling every layer's gradient buffers without updating any weights or biases
+            The whole set is processed as a single mini-batch, with the gradients averaged over its samples, and the regularization term λW added once
+            Note: before mini-batches were back-propagated as a whole, every sample took its own step, data gradient and λW included; one step with
+            learning rate η is now the mean of those steps rather than their sum, so runs from back then with (η, λ) compare to (η * batch size, λ) now
             Parameters:
-                inputs (np.matrix): Inputs to train for
-                targets (np.matrix): Desired outcome values
-                learning_rate (float): Learning rate η to use to update the weights & biases
+                inputs (np.ndarray): Inputs to train for
+                targets (np.ndarray): Desired outcome values
                 regularization (float): Regularization parameter λ to control rate of descent
             Returns:
-                (bool): Whether the back-propagation succeeded
+                (bool): Whether the gradients could be computed
         """
 
         if not self.is_ready():
             print('\033[91mNetwork hasn\'t been given an output layer! Make sure the neural network is set-up with all layers before starting training\033[0m')
             return False
 
-        # Iterate over list of inputs/targets if passing more than 1
-        for i in range(inputs.shape[0]):
-            ins = np.matrix(inputs[i])
-            targs = np.matrix(targets[i])
+        # Feed the whole mini-batch forward at once, so every layer works on one (batch size x layer size) matrix
+        targets = self.as_array(targets)
+        result = self.feed_forward(inputs, training=True)
+        if result is None:
+            return False
+        a_h, z_h = result
 
-            # Feed forward once to obtain outputs
-            a_h, z_h = self.feed_forward(ins, training=True)
+        # Dimensionality check
+        if a_h[-1].shape != targets.shape or a_h[-1].shape[1] != self.layers[len(self.layers) - 1].get_size():
+            print('\033[91mMismatching outputs/targets size; should be (x,', self.layers[len(self.layers) - 1].get_size(), '), got', a_h[-1].shape, 'and', targets.shape, 'instead..\033[0m')
+            return False
+        
+        # Compute errors & gradients for each layer
+        # Going backwards from last to first layer
+        prev_layer_err = self.cost_function.grad_C_nn(targets, a_h[-1]) * self.layers[-1]._activation_fn.d(z_h[-1])
+        for j in range(len(self.layers)-1, -1, -1): # for (let i = len(self.layers) - 1; i >= 0; --i)       (python is fucking garbage)
+            prev_activation_fn = self.layers[j-1 if j > 0 else 0]._activation_fn
+            prev_layer_err = self.layers[j].backward(a_h[j], z_h[j], prev_layer_err, prev_activation_fn, regularization)
+        return True
 
-            # Dimensionality check
-            if a_h[-1].shape != targs.shape or a_h[-1].shape[1] != self.layers[len(self.layers) - 1].get_size():
-                print('\033[91mMismatching outputs/targets size; should be (x,', self.layers[len(self.layers) - 1].get_size(), '), got', a_h[-1].shape, 'and', targs.shape, 'instead..\033[0m')
-                return False
-            
-            # Compute errors & gradient descent for each layer
-            # Going backwards from last to first layer
-            prev_layer_err = np.multiply(self.cost_function.grad_C_nn(targs, a_h[-1]), self.layers[-1]._activation_fn.d(z_h[-1]))
-            for j in range(len(self.layers)-1, -1, -1): # for (let i = len(self.layers) - 1; i >= 0; --i)       (python is fucking garbage)
-                # Update layer
-                prev_activation_fn = self.layers[j-1 if j > 0 else 0]._activation_fn
-                prev_layer_err = self.layers[j].backward(a_h[j], z_h[j], prev_layer_err, prev_activation_fn, learning_rate, regularization)
+    def apply_gradients(self, learning_rate: float = 0.1):
+        """
+            Updates the weights & biases of every layer with the gradients currently stored in their buffers (see compute_gradients)
+            Parameters:
+                learning_rate (float): Learning rate η to use to update the weights & biases
+        """
+        for layer in self.layers:
+            layer.apply_gradients(learning_rate)
+
+    def back_prop(self, inputs: np.ndarray, targets: np.ndarray, learning_rate: float = 0.1, regularization: float = 0) -> bool:
+        """
+            Back-propagates once with a set of actual and desired outputs, so the next run will match the targets closer (hopefully)
+            Equivalent to compute_gradients followed by apply_gradients, i.e. one step with the gradients averaged over the set and λW added once
+            Parameters:
+                inputs (np.ndarray): Inputs to train for
+                targets (np.ndarray): Desired outcome values
+                learning_rate (float): Learning rate η to use to update the weights & biases
+                regularization (float): Regularization parameter λ to control rate of descent
+            Returns:
+                (bool): Whether the back-propagation succeeded
+        """
+
+        if not self.compute_gradients(inputs, targets, regularization=regularization):
+            return False
+        self.apply_gradients(learning_rate)
         return True
     
 
-    def train(self, inputs: np.matrix, targets: np.matrix, initial_learning_rate: float = 0.1, final_learning_rate: float = None, sgd: bool = True, epochs: int = 1000, minibatch_size: int = 5, regularization: float = 0, testing_inputs: np.matrix = None, testing_targets: np.matrix = None, verbose: bool = True, return_errs: bool = False) -> tuple:
+    def train(self, inputs: np.ndarray, targets: np.ndarray, initial_learning_rate: float = 0.1, final_learning_rate: float = None, sgd: bool = True, epochs: int = 1000, minibatch_size: int = 5, regularization: float = 0, testing_inputs: np.ndarray = None, testing_targets: np.ndarray = None, verbose: bool = True, return_errs: bool = False, optimizer: LayerOptimizer = None, start_epoch: int = 0, stop_epoch: int = None, patience: int = None, min_delta: float = 0) -> tuple:
         """
             Back-propagates over a series of epochs using stochastic gradient descent
             Parameters:
-                inputs (np.matrix): Inputs to train for
-                targets (np.matrix): Desired outcome values
+                inputs (np.ndarray): Inputs to train for
+                targets (np.ndarray): Desired outcome values
                 initial_learning_rate (float): Learning rate at epoch = 0
                 final_learning_rate (float|None|bool): Learning rate at epoch = max_epochs; if passing None, will keep learning rate constant; if passing True, the learning rate will be /10 anytime a plateau is reached
                 sgd (bool): Whether to use stochastic gradient descent or plain old gd
                 epochs (int): Number of training epochs to train over
                 minibatch_size (int): Size of individual mini-batches
-                regularization (float): Regularization parameter λ to control rate of descent
-                testing_inputs (np.matrix): If not None, will compute the error/accuracy score for the test set at each epoch
-                testing_targets (np.matrix): If not None, will compute the error/accuracy score for the test set at each epoch
+                regularization (float): Regularization parameter λ to control rate of descent, added once per mini-batch to its mean gradient (see compute_gradients)
+                testing_inputs (np.ndarray): If not None, will compute the error/accuracy score for the test set at each epoch
+                testing_targets (np.ndarray): If not None, will compute the error/accuracy score for the test set at each epoch
                 verbose (bool): Whether to output the completion percentage to stdout
                 return_errs (bool): If true, returns a list of error values as a function of epoch
+                optimizer (LayerOptimizer|None): If not None, update rule to train with (see set_optimizer); otherwise the model's current one is kept, plain gradient descent by default
+                start_epoch (int): Number of epochs already trained by earlier calls, to carry on training in several steps; the epoch count and learning rate schedule continue from there
+                stop_epoch (int|None): If not None, stops after this epoch rather than at `epochs`, leaving the rest of the schedule to a later call (with start_epoch=stop_epoch)
+                patience (int|None): If not None, stops early once the testing error (or training error, without testing data) hasn't improved by more than min_delta for this many epochs;
+                                     with start_epoch > 0, the best error and the epochs since are carried over from the previous call, so the count goes on across calls
+                min_delta (float): Smallest change in error counted as an improvement by patience
             Returns:
                 (float): Final training error obtained by the network after the last training iteration
                 (float): Final testing error obtained by the network after the last training iteration; only returned if testing_inputs and testing_targets are passed
-                (np.ndarray): List of training errors, only given if return_errs is given as True
+                (np.ndarray): List of training errors, only given if return_errs is given as True; shorter than the number of epochs if training stopped early
+            Note: training always stops as soon as the error becomes NaN or infinite, as the weights can't recover from it
         """
 
         if not self.is_ready():
             print('\033[91mNetwork hasn\'t been given an output layer! Make sure the neural network is set-up with all layers before starting training\033[0m')
             return
 
+        if optimizer is not None:
+            self.set_optimizer(optimizer)
+
+        # Convert everything once to contiguous arrays of the model's dtype
+        inputs = self.as_array(inputs)
+        targets = self.as_array(targets)
+        if testing_inputs is not None and testing_targets is not None:
+            testing_inputs = self.as_array(testing_inputs)
+            testing_targets = self.as_array(testing_targets)
+
         # number of mini-batches
         if sgd:
             minibatch_count = int(inputs.shape[0] / minibatch_size)
@@ -225,8 +315,14 @@ class Model:
             learning_schedule = lambda epoch: t0 / (t1 + epoch)
 
         # go over epochs
-        errs = np.ndarray(epochs)
-        for i, epoch in enumerate(range(1, epochs + 1)):
+        last_epoch = epochs if stop_epoch is None else min(stop_epoch, epochs)
+        errs = np.ndarray(max(last_epoch - start_epoch, 0))
+        has_testing = testing_inputs is not None and testing_targets is not None
+        sign = -1 if self.cost_function.higher_is_better() else 1 # Compare errors such that lower is always better
+        best_err, epochs_since_best = np.inf, 0
+        if start_epoch > 0 and self._early_stopping is not None:
+            best_err, epochs_since_best = self._early_stopping
+        for i, epoch in enumerate(range(start_epoch + 1, last_epoch + 1)):
 
             # Eta will either always be the same, or go from initial_ to final_learning_rate over the epochs
             eta = learning_schedule(epoch-1)
@@ -252,13 +348,35 @@ class Model:
             # Compute error/accuracy
             err = self.error(inputs, targets)
             errs[i] = err
+            test_err = None
+            if has_testing and (verbose or patience is not None):
+                test_err = self.error(testing_inputs, testing_targets)
             if verbose:
                 print(f"[ Epoch: {epoch}/{epochs}; " + self.cost_function.error_name() + f": {err} ]")
-                if testing_inputs is not None and testing_targets is not None:
-                    print(f"\t\tTesting " + self.cost_function.error_name() + f": {self.error(testing_inputs, testing_targets)}")
-                if np.isnan(err):
+                if test_err is not None:
+                    print(f"\t\tTesting " + self.cost_function.error_name() + f": {test_err}")
+
+            # Diverged, no point in going on
+            if not np.isfinite(err):
+                if verbose:
                     print('\033[91mEncountered a NaN value while training!\033[0m')
-                    return None
+                errs = errs[:i+1]
+                break
+
+            # Early stopping
+            if patience is not None:
+                monitored = sign * (test_err if test_err is not None else err)
+                if monitored < best_err - min_delta:
+                    best_err = monitored
+                    epochs_since_best = 0
+                else:
+                    epochs_since_best += 1
+                self._early_stopping = (best_err, epochs_since_best)
+                if epochs_since_best >= patience:
+                    if verbose:
+                        print(f"[ Stopping early at epoch {epoch}: no improvement over the last {patience} epochs ]")
+                    errs = errs[:i+1]
+                    break
             
             # Adaptive learning rate if needed
             if final_learning_rate == True and i > 10:
@@ -284,88 +402,71 @@ class Model:
         return train_error
     
 
-    def grid_train(self, train_inputs: np.matrix, train_targets: np.matrix, test_inputs: np.matrix, test_targets: np.matrix, filename: str = None, plot: bool = True, sgd: bool = True, initial_learning_rate: float = 0.1, final_learning_rate: float = None, epochs: int = 1000, minibatch_size: int = 5, regularization: float = 0, reset_rng: bool = True, verbose: bool = False):
+    def grid_train(self, train_inputs: np.ndarray, train_targets: np.ndarray, test_inputs: np.ndarray, test_targets: np.ndarray, filename: str = None, plot: bool = True, sgd: bool = True, initial_learning_rate: float = 0.1, final_learning_rate: float = None, epochs: int = 1000, minibatch_size: int = 5, regularization: float = 0, reset_rng: bool = True, verbose: bool = False, n_jobs: int = 1, resume: bool = True, patience: int = None, min_epochs: int = None, reduction_factor: int = 3):
         """
-            Grid searches amongst 2 parameters by repeatedly training and resetting the network
+            Grid searches amongst any number of parameters by training a fresh copy of the network for every combination (see GridSearch)
+            The model itself is left untouched
             Parameters:
-                train_inputs (np.matrix): Training input data
-                train_targets (np.matrix): Training output data
-                test_inputs (np.matrix): Testing input data
-                test_targets (np.matrix): Testing output data
-                filename (str | None): Filename to save results to; if passing None, will not write results out at all
-                plot (bool): Whether to plot the errors/accuracy scores in a contour plot
+                train_inputs (np.ndarray): Training input data
+                train_targets (np.ndarray): Training output data
+                test_inputs (np.ndarray): Testing input data
+                test_targets (np.ndarray): Testing output data
+                filename (str | None): Name of the file to save results to, as results/<filename>.jsonl (see ResultsStore); if passing None, will not write results out at all
+                plot (bool): Whether to plot the errors/accuracy scores in a contour plot; only possible when searching over exactly 2 parameters
                 sgd (bool): Whether to use stochastic gradient descent or gradient descent
                 initial_learning_rate (float | list): If passing as a list, will create a grid search around the parameter
                 final_learning_rate (float | list): If passing as a list, will create a grid search around the parameter
                 epochs (int | list): If passing as a list, will create a grid search around the parameter
                 minibatch_size (int | list): If passing as a list, will create a grid search around the parameter
                 regularization (float | list): If passing as a list, will create a grid search around the parameter
-                reset_rng (bool): Whether to reset the random number generator with the same seed between each iteration; if True, the same weights & biases will be used every time
+                reset_rng (bool): Whether to use the same seed for every combination; if True, the same initial weights & biases will be used every time
                 verbose (bool): Whether to print information about training as it occurs
+                n_jobs (int): Number of processes to train with in parallel
+                resume (bool): Whether to skip the combinations already saved in the results file by a previous (possibly interrupted) run
+                patience (int | list | None): If not None, stops training a combination early once its testing error stops improving (see train)
+                min_epochs (int | None): If not None, uses successive halving (see SuccessiveHalving): every combination starts with min_epochs epochs, and only
+                                         the best 1/reduction_factor carry on at every step, until `epochs` is reached; combinations that diverge are dropped straight away
+                reduction_factor (int): Factor by which the number of combinations shrinks and their epochs grow at every step of successive halving
+            Returns:
+                (list<dict>): Parameters, training & testing errors for every combination
+                (np.ndarray): Testing errors as an N-dimensional array, one dimension per searched parameter; NaN for combinations dropped by successive halving (see GridSearch.grid)
         """
-
-        # List all parameters that are ranges
-        range_params = []
-        const_params = []
-        add_p = lambda name, val: range_params.append({'name':name, 'range':val}) if (isinstance(val, list) or isinstance(val, np.ndarray)) else const_params.append({'name':name, 'value':val})
-        add_p('initial_learning_rate', initial_learning_rate)
-        add_p('final_learning_rate', final_learning_rate)
-        add_p('epochs', epochs)
-        add_p('minibatch_size', minibatch_size)
-        add_p('regularization', regularization)
-
-        if len(range_params) > 2:
-            print('\033[91mGrid training with more than 2 range parameters isn\'t supported right now! Please pass at most 2 range parameters.\033[0m')
-            return
-        if len(range_params) < 2:
-            print('\033[91mGrid training with less than 2 range parameters isn\'t supported right now! Please pass at least 2 range parameters.\033[0m')
+        from .GridSearch import GridSearch
+        from .SuccessiveHalving import SuccessiveHalving
+
+        params = {
+            'initial_learning_rate': initial_learning_rate,
+            'final_learning_rate': final_learning_rate,
+            'epochs': epochs,
+            'minibatch_size': minibatch_size,
+            'regularization': regularization
+        }
+        if patience is not None:
+            params['patience'] = patience
+        const_params = {name: value for name, value in params.items() if not (isinstance(value, list) or isinstance(value, np.ndarray))}
+
+        if len(const_params) == len(params):
+            print('\033[91mGrid training needs at least 1 range parameter! Please pass at least one of the parameters as a list or numpy array.\033[0m')
             return
 
-        # Extract which parameters should be ranges
-        param1 = range_params[0]['name']
-        param2 = range_params[1]['name']
-        param1_range = range_params[0]['range']
-        param2_range = range_params[1]['range']
-        params = dict()
-        for param in const_params:
-            params[param['name']] = param['value']
-
-        # Run through grid search
-        results = []
-        results_mat = np.zeros((len(param1_range), len(param2_range)))
-        for i, param1_val in enumerate(param1_range):
-            for j, param2_val in enumerate(param2_range):
-
-                # Set up parameters to use for this iteration
-                params[param1] = param1_val
-                params[param2] = param2_val
-
-                # Reset and train
-                self.reset(reset_rng=reset_rng)
-                train_result, test_result = self.train(train_inputs, train_targets, verbose=verbose, testing_inputs=test_inputs, testing_targets=test_targets, sgd=sgd, **params)
-
-                # Save results
-                results_mat[i, j] = test_result
-                results.append({
-                    param1: param1_val,
-                    param2: param2_val,
-                    'train_err': train_result,
-                    'test_err': test_result
-                })
-
-        # Save results to file
-        if filename is not None:
-            with open('results/' + filename + '.pickle', 'wb') as handle:
-                d = {'date': time(), 'seed': self.random_state}
-                for param in const_params:
-                    d[param['name']] = param['value']
-                d['results'] = results
-                pickle.dump(d, handle, protocol=pickle.HIGHEST_PROTOCOL)
+        # Run through grid search, saving every combination's results as soon as it's done
+        filename = None if filename is None else 'results/' + filename + '.jsonl'
+        if min_epochs is not None:
+            search = SuccessiveHalving(self, min_epochs=min_epochs, reduction_factor=reduction_factor, n_jobs=n_jobs, filename=filename, metadata={'date': time(), 'sgd': sgd, **const_params})
+        else:
+            search = GridSearch(self, n_jobs=n_jobs, filename=filename, metadata={'date': time(), 'sgd': sgd, **const_params})
+        grid = search.grid(train_inputs, train_targets, test_inputs, test_targets, sgd=sgd, reset_rng=reset_rng, verbose=verbose, resume=resume, **params)
+        if grid is None:
+            return
+        results, results_mat, axes = grid
 
         # Plot results
-        if plot:
+        if plot and len(axes) == 2:
+            (param1, param1_range), (param2, param2_range) = axes
             plt.figure()
-            plt.contourf(param1_range, param2_range, results_mat)
+            plt.contourf(param1_range, param2_range, results_mat.T)
             plt.xlabel(param1)
             plt.ylabel(param2)
             plt.colorbar()
+
+        return results, results_mat
@@ -0,0 +1,189 @@
+import numpy as np
+import hashlib
+import json
+import os
+
+
+def to_json(value):
+    """
+        Converts a hyper-parameter or result value to something that can be written out as JSON
+        Optimizers and activation functions are stored by name, followed by their hyper-parameters (scalar attributes) if they have any,
+        e.g. 'Adam(beta1=0.5, beta2=0.999, epsilon=1e-08)', so that differently configured instances are told apart
+    """
+    if isinstance(value, np.integer):
+        return int(value)
+    if isinstance(value, np.floating):
+        return float(value)
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, (list, tuple)):
+        return [to_json(v) for v in value]
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if hasattr(value, 'name'):
+        settings = [f"{name.lstrip('_')}={to_json(v)}" for name, v in sorted(vars(value).items(), key=lambda item: item[0].lstrip('_'))
+                    if isinstance(v, (bool, int, float, str, np.integer, np.floating))]
+        return value.name() + (f"({', '.join(settings)})" if len(settings) > 0 else '')
+    return str(value)
+
+
+def fingerprint(*arrays) -> str:
+    """
+        Identifies a data set, to tell apart results obtained on different data
+        Parameters:
+            *arrays (np.ndarray): The arrays making up the data set
+        Returns:
+            (str): Shapes of the arrays, followed by a hash of their shapes, types and contents, e.g. '600x3,600x1:0123456789abcdef'
+    """
+    digest = hashlib.sha1()
+    for array in arrays:
+        array = np.ascontiguousarray(array)
+        digest.update(f"{array.shape}{array.dtype}".encode())
+        digest.update(array.tobytes())
+    return ','.join('x'.join(str(n) for n in np.shape(array)) for array in arrays) + ':' + digest.hexdigest()[:16]
+
+
+class ResultsStore:
+    """
+        Append-only JSON-lines file holding the results of a search, one record (line) per finished cell.
+        The first line holds the search's metadata. Every record is flushed to disk as soon as it is added, so a crashed
+        search keeps everything that finished before the crash, and can be resumed by skipping the cells already in the store.
+        Reopening the file with different metadata (other than the unchecked fields, such as the date) moves the old file aside
+        and starts a new one, so that results obtained with other settings are never resumed from.
+    """
+
+    # Metadata fields that don't affect the results, and may differ when resuming
+    unchecked = ('date',)
+
+    def __init__(self, filename: str, metadata: dict = None):
+        """
+            Opens a store, reading back any records already in the file
+            Parameters:
+                filename (str): Path of the JSON-lines file; created if it doesn't exist
+                metadata (dict|None): Information about the search (date, seed, constant parameters, ...) to write on the first line of a new file;
+                                      if the file already exists, it must match the metadata the file holds (see unchecked), otherwise the file is moved
+                                      to <name>.<n>.jsonl and a new one is started. If None, the file's metadata is kept as is
+        """
+        self.filename = filename
+        self.metadata = dict()
+        self._records = list()
+        self._keys = dict()
+        self._needs_newline = False
+
+        if metadata is not None:
+            metadata = {name: to_json(value) for name, value in metadata.items()}
+
+        if os.path.exists(filename):
+            self._read()
+            if metadata is not None and self._checked(self.metadata) != self._checked(metadata):
+                stale = self._free_filename()
+                fields = sorted(name for name in set(self.metadata) | set(metadata) if name not in self.unchecked and self.metadata.get(name) != metadata.get(name))
+                print(f"\033[91m{filename} holds results for other settings ({', '.join(fields)}); moving it to {stale} and starting a new file.\033[0m")
+                os.replace(filename, stale)
+                self.metadata = dict()
+                self._records = list()
+                self._needs_newline = False
+
+        if not os.path.exists(filename) and metadata is not None:
+            self.metadata = metadata
+            with open(filename, 'w') as file:
+                file.write(json.dumps({'metadata': self.metadata}) + '\n')
+
+    def _checked(self, metadata: dict) -> dict:
+        """
+            The metadata fields that must match to resume from a file
+        """
+        return {name: value for name, value in metadata.items() if name not in self.unchecked}
+
+    def _free_filename(self) -> str:
+        """
+            First <name>.<n><ext> path that isn't taken, to move an outdated file to
+        """
+        root, ext = os.path.splitext(self.filename)
+        n = 1
+        while os.path.exists(f"{root}.{n}{ext}"):
+            n += 1
+        return f"{root}.{n}{ext}"
+
+    def _read(self):
+        """
+            Reads all records back from the file, skipping a last line left incomplete by a crash
+        """
+        with open(self.filename, 'r') as file:
+            content = file.read()
+        self._needs_newline = len(content) > 0 and not content.endswith('\n')
+
+        for line in content.splitlines():
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if len(self._records) == 0 and list(record.keys()) == ['metadata']:
+                self.metadata = record['metadata']
+                continue
+            self._records.append(record)
+
+    @staticmethod
+    def key(params: dict) -> str:
+        """
+            Identifier of a cell, independent of the order of its parameters
+            Parameters:
+                params (dict): The parameters identifying the cell
+            Returns:
+                (str): The cell's key
+        """
+        return json.dumps({name: to_json(value) for name, value in params.items()}, sort_keys=True)
+
+    def append(self, record: dict):
+        """
+            Adds a record to the store, writing it to disk immediately
+            Parameters:
+                record (dict): The record to add; values are converted with to_json
+        """
+        record = {name: to_json(value) for name, value in record.items()}
+        with open(self.filename, 'a') as file:
+            if self._needs_newline:
+                file.write('\n')
+                self._needs_newline = False
+            file.write(json.dumps(record) + '\n')
+            file.flush()
+            os.fsync(file.fileno())
+        self._records.append(record)
+
+    def find(self, params: dict) -> dict:
+        """
+            Looks for the record of a cell
+            Parameters:
+                params (dict): The parameters identifying the cell; a record matches if it holds the same values for all of them
+            Returns:
+                (dict|None): The first matching record, or None if the cell isn't in the store
+        """
+        names = tuple(sorted(params.keys()))
+        if names not in self._keys or self._keys[names][0] != len(self._records):
+            self._keys[names] = (len(self._records), {self.key({name: record.get(name) for name in names}): record for record in reversed(self._records)})
+        return self._keys[names][1].get(self.key(params))
+
+    def records(self) -> list:
+        """
+            Returns all records in the order they were added
+            Returns:
+                (list<dict>): The records
+        """
+        return list(self._records)
+
+    def column(self, name: str) -> np.ndarray:
+        """
+            Gathers one field of every record
+            Parameters:
+                name (str): Name of the field
+            Returns:
+                (np.ndarray): The field's value for every record, in the order they were added (None where a record lacks the field)
+        """
+        values = [record.get(name) for record in self._records]
+        try:
+            return np.array(values)
+        except ValueError:
+            return np.array(values, dtype=object)
+
+    def __len__(self) -> int:
+        return len(self._records)
@@ -0,0 +1,225 @@
+import numpy as np
+import copy
+from time import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from .Model import Model
+from .GridSearch import GridSearch, _worker, _init_worker
+from .ResultsStore import to_json, fingerprint
+
+
+def _train_rung(index: int, model: Model, params: dict, seed: int, start_epoch: int, stop_epoch: int, sgd: bool, verbose: bool) -> dict:
+    """
+        Carries on training one cell of the search up to the end of the current rung
+        Parameters:
+            index (int): Index of the cell in the search
+            model (Model|None): The cell's model as trained in the previous rungs, or None to start from a fresh copy of the worker's model
+            params (dict): Keyword arguments to pass to Model.train; 'epochs' is the full budget the learning rate schedule is spread over
+            seed (int): Seed to initialise the weights/biases and the SGD random number generator with, for a fresh copy
+            start_epoch (int): Number of epochs the model has already been trained for
+            stop_epoch (int): Epoch to train up to
+            sgd (bool): Whether to use stochastic gradient descent or gradient descent
+            verbose (bool): Whether to print information about training as it occurs
+        Returns:
+            (dict): The cell's index, trained model, training & testing errors, epochs trained, whether it stopped by itself and time taken
+    """
+    if model is None:
+        model = copy.deepcopy(_worker['model'])
+        model.random_state = seed
+        model.reset(reset_rng=True)
+    train_inputs, train_targets, test_inputs, test_targets = _worker['data']
+
+    start = time()
+    result = model.train(train_inputs, train_targets, testing_inputs=test_inputs, testing_targets=test_targets, sgd=sgd, verbose=verbose, return_errs=True, start_epoch=start_epoch, stop_epoch=stop_epoch, **params)
+    if result is None:
+        return {'index': index, 'model': model, 'train_err': np.nan, 'test_err': np.nan, 'epochs_trained': start_epoch, 'stopped': True, 'time': time() - start}
+    train_err, test_err, errs = result
+
+    # train returns fewer errors than epochs asked for if it diverged or stopped early
+    return {'index': index, 'model': model, 'train_err': float(train_err), 'test_err': float(test_err), 'epochs_trained': start_epoch + len(errs), 'stopped': len(errs) < stop_epoch - start_epoch, 'time': time() - start}
+
+
+class SuccessiveHalving(GridSearch):
+    """
+        Hyper-parameter search executor for Model.train that spends the epoch budget on the most promising cells
+        All cells start with a small number of epochs; after each rung, only the best 1/reduction_factor of them carry on training
+        (from where they stopped) for reduction_factor times as many epochs, until the full budget (the 'epochs' parameter) is reached.
+        Cells that diverge (NaN/infinite error) or stop early (with the 'patience' parameter of Model.train, counted across rungs) are dropped as soon as it happens.
+        Grid and random searches work as for GridSearch; hyperband runs several such searches trading off the number of cells and starting epochs.
+    """
+
+    def __init__(self, model: Model, min_epochs: int = 10, reduction_factor: int = 3, n_jobs: int = 1, filename: str = None, metadata: dict = None):
+        """
+            Initialises the search executor
+            Parameters:
+                model (Model): Model to search over; it is copied for every cell and never modified itself
+                min_epochs (int): Number of epochs every cell is trained for in the first rung
+                reduction_factor (int): Fraction of cells dropped after every rung (1 - 1/reduction_factor), and factor by which the epochs grow between rungs
+                n_jobs, filename, metadata: See GridSearch
+        """
+        super().__init__(model, n_jobs=n_jobs, filename=filename, metadata={'min_epochs': min_epochs, 'reduction_factor': reduction_factor, **(metadata if metadata is not None else dict())})
+        self.min_epochs = min_epochs
+        self.reduction_factor = reduction_factor
+
+    def rungs(self, min_epochs: int, max_epochs: int) -> list:
+        """
+            Epochs every surviving cell has been trained for at the end of each rung
+            Parameters:
+                min_epochs (int): Epochs of the first rung
+                max_epochs (int): Full training budget, i.e. epochs of the last rung
+            Returns:
+                (list<int>): Epochs at the end of each rung
+        """
+        rungs = [min(min_epochs, max_epochs)]
+        while rungs[-1] < max_epochs:
+            rungs.append(min(rungs[-1] * self.reduction_factor, max_epochs))
+        return rungs
+
+    def run(self, cells: list, train_inputs: np.ndarray, train_targets: np.ndarray, test_inputs: np.ndarray, test_targets: np.ndarray, sgd: bool = True, reset_rng: bool = True, verbose: bool = False, resume: bool = True, min_epochs: int = None) -> list:
+        """
+            Trains the cells with successive halving
+            Parameters:
+                cells (list<dict>): Keyword arguments for Model.train, one dict per cell; all cells must share the same 'epochs' (1000 if not given)
+                train_inputs, train_targets, test_inputs, test_targets, sgd, reset_rng, verbose, resume: See GridSearch.run
+                min_epochs (int|None): Epochs of the first rung, if different from the one given to the constructor
+            Returns:
+                (list<dict>): One result per cell, in the same order as cells, holding the cell's parameters, seed, sgd, data fingerprint, training & testing errors, time taken,
+                              epochs trained and why training stopped ('completed', 'halved', 'early_stopping' or 'diverged')
+        """
+        if min_epochs is None:
+            min_epochs = self.min_epochs
+
+        max_epochs = set(cell.get('epochs', 1000) for cell in cells)
+        if len(max_epochs) > 1:
+            print('\033[91mSuccessive halving needs the same number of epochs for every cell! Please don\'t search over the epochs.\033[0m')
+            return
+        rungs = self.rungs(min_epochs, max_epochs.pop())
+
+        seeds = self.cell_seeds(len(cells), reset_rng=reset_rng)
+        results = [None] * len(cells)
+        data = tuple(self.model.as_array(d) for d in (train_inputs, train_targets, test_inputs, test_targets))
+        run_params = {'sgd': sgd, 'data': fingerprint(*data)}
+        sign = -1 if self.model.cost_function.higher_is_better() else 1 # Rank such that lower is always better
+
+        # Pick up cells finished by a previous run
+        if resume and self.store is not None:
+            for i, cell in enumerate(cells):
+                results[i] = self.store.find({**cell, 'seed': seeds[i], 'min_epochs': min_epochs, **run_params})
+        alive = [i for i in range(len(cells)) if results[i] is None]
+        if len(alive) < len(cells):
+            print(f"[ Resuming: {len(cells) - len(alive)}/{len(cells)} cells already done ]")
+
+        models = [None] * len(cells)
+        epochs_trained = [0] * len(cells)
+        times = [0.] * len(cells)
+
+        def finish(i, result, stopped):
+            result = {**{name: to_json(value) for name, value in cells[i].items()}, 'seed': int(seeds[i]), 'min_epochs': min_epochs, **run_params,
+                      'train_err': result['train_err'], 'test_err': result['test_err'], 'time': times[i], 'epochs_trained': epochs_trained[i], 'stopped': stopped}
+            results[i] = result
+            models[i] = None
+            if self.store is not None:
+                self.store.append(result)
+
+        if len(alive) > 0:
+            pool = None
+            if self.n_jobs == 1:
+                _init_worker(self.model, data)
+            else:
+                pool = ProcessPoolExecutor(max_workers=self.n_jobs, initializer=_init_worker, initargs=(self.model, data))
+
+            try:
+                for k, stop_epoch in enumerate(rungs):
+                    print(f"[ Rung {k + 1}/{len(rungs)}: training {len(alive)} cells up to epoch {stop_epoch} ]")
+
+                    # Train every surviving cell up to the end of the rung
+                    rung_results = dict()
+                    if pool is None:
+                        for i in alive:
+                            rung_results[i] = _train_rung(i, models[i], cells[i], seeds[i], epochs_trained[i], stop_epoch, sgd, verbose)
+                    else:
+                        futures = [pool.submit(_train_rung, i, models[i], cells[i], seeds[i], epochs_trained[i], stop_epoch, sgd, verbose) for i in alive]
+                        for future in as_completed(futures):
+                            result = future.result()
+                            rung_results[result['index']] = result
+
+                    # Drop cells that diverged or stopped early; the others compete for the next rung
+                    survivors = list()
+                    for i in alive:
+                        result = rung_results[i]
+                        models[i] = result['model']
+                        epochs_trained[i] = result['epochs_trained']
+                        times[i] += result['time']
+                        if not np.isfinite(result['train_err']) or not np.isfinite(result['test_err']):
+                            finish(i, result, 'diverged')
+                        elif result['stopped']:
+                            finish(i, result, 'early_stopping')
+                        elif stop_epoch == rungs[-1]:
+                            finish(i, result, 'completed')
+                        else:
+                            survivors.append(i)
+                    if len(survivors) == 0:
+                        break
+
+                    # Keep the best 1/reduction_factor of the cells that started the search, minus those a previous run already took past this rung
+                    n_keep = max(1, len(cells) // self.reduction_factor**(k + 1))
+                    n_keep -= sum(1 for i, result in enumerate(results) if i not in rung_results and result is not None and result['epochs_trained'] > stop_epoch)
+                    survivors.sort(key=lambda i: sign * rung_results[i]['test_err'])
+                    for i in survivors[max(n_keep, 0):]:
+                        finish(i, rung_results[i], 'halved')
+                    alive = survivors[:max(n_keep, 0)]
+                    if len(alive) == 0:
+                        break
+            finally:
+                if pool is not None:
+                    pool.shutdown()
+
+        full_budget = len(cells) * rungs[-1]
+        print(f"[ Successive halving: trained {sum(result['epochs_trained'] for result in results)} epochs in total, against {full_budget} for the full search ]")
+        return results
+
+    def hyperband(self, train_inputs: np.ndarray, train_targets: np.ndarray, test_inputs: np.ndarray, test_targets: np.ndarray, sgd: bool = True, reset_rng: bool = True, verbose: bool = False, resume: bool = True, **params) -> list:
+        """
+            Hyperband search: random searches with successive halving, from many cells starting with min_epochs down to few cells trained with the full budget,
+            so that both hyper-parameters that need long training and those that can be told apart early are covered.
+            Cells are drawn with a generator seeded from the model's seed.
+            Parameters:
+                train_inputs, train_targets, test_inputs, test_targets, sgd, reset_rng, verbose, resume: See GridSearch.run
+                **params: See GridSearch.random_cells; 'epochs' is the full training budget (1000 if not given)
+            Returns:
+                (list<dict>): One result per cell over all brackets (see run)
+        """
+        max_epochs = params.get('epochs', 1000)
+        s_max = int(np.floor(np.log(max_epochs / self.min_epochs) / np.log(self.reduction_factor) + 1e-9))
+
+        rng = np.random.default_rng(np.random.MT19937(seed=self.model.random_state))
+        results = list()
+        for s in range(s_max, -1, -1):
+            n_cells = int(np.ceil((s_max + 1) / (s + 1) * self.reduction_factor**s))
+            min_epochs = max(1, int(round(max_epochs / self.reduction_factor**s)))
+            print(f"[ Hyperband bracket {s_max - s + 1}/{s_max + 1}: {n_cells} cells starting with {min_epochs} epochs ]")
+
+            cells = self.random_cells(n_cells, rng, **params)
+            bracket = self.run(cells, train_inputs, train_targets, test_inputs, test_targets, sgd=sgd, reset_rng=reset_rng, verbose=verbose, resume=resume, min_epochs=min_epochs)
+            if bracket is None:
+                return
+            results += bracket
+        return results
+
+    @staticmethod
+    def best(results: list, higher_is_better: bool = False) -> dict:
+        """
+            Picks the best result of a search out of the cells trained with the full budget, or out of all cells if none were
+            Parameters:
+                results (list<dict>): Results returned by run, grid, random or hyperband
+                higher_is_better (bool): Whether the errors are scores to maximise (see CostFunction.higher_is_better)
+            Returns:
+                (dict|None): The result with the best testing error
+        """
+        sign = -1 if higher_is_better else 1
+        candidates = [result for result in results if result.get('stopped') == 'completed']
+        if len(candidates) == 0:
+            candidates = [result for result in results if np.isfinite(result['test_err'])]
+        if len(candidates) == 0:
+            return None
+        return min(candidates, key=lambda result: sign * result['test_err'])
@@ -0,0 +1,34 @@
+import numpy as np
+
+class Workspace:
+    """
+        Preallocated per-layer buffers for the training-mode forward pass.
+        Holds one pre-activation (z) and one activation (a) matrix per layer, sized for a fixed batch size and architecture,
+        so that Model.feed_forward can write into them over and over instead of allocating new arrays at every step.
+    """
+
+    def __init__(self, batch_size: int, layer_sizes: list, dtype: type = np.float64):
+        """
+            Allocates the buffers
+            Parameters:
+                batch_size (int): Number of rows (samples) the buffers will hold
+                layer_sizes (list<int>): Number of nodes in each layer, from the first hidden layer to the output layer
+                dtype (type): Data type of the buffers
+        """
+        self.batch_size = batch_size
+        self.layer_sizes = list(layer_sizes)
+        self.dtype = dtype
+        self.z = [np.empty((batch_size, size), dtype=dtype) for size in self.layer_sizes]
+        self.a = [np.empty((batch_size, size), dtype=dtype) for size in self.layer_sizes]
+
+    def fits(self, batch_size: int, layer_sizes: list, dtype: type = np.float64) -> bool:
+        """
+            Helper to determine whether the workspace can be reused for a given batch & architecture
+            Parameters:
+                batch_size (int): Number of rows (samples) that will be fed forward
+                layer_sizes (list<int>): Number of nodes in each layer, from the first hidden layer to the output layer
+                dtype (type): Data type the buffers should have
+            Returns:
+                (bool): Whether the buffers have the right shapes and data type
+        """
+        return self.batch_size == batch_size and self.layer_sizes == list(layer_sizes) and self.dtype == dtype
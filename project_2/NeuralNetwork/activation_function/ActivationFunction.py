@@ -19,13 +19,14 @@ class ActivationFunction(ABC):
         return None
 
     @abstractmethod
-    def __call__(self, x: float) -> float:
+    def __call__(self, x: float, out: np.ndarray = None) -> float:
         """
             Returns the evaluation of the activation function at x values
             Parameters:
-                x (float|np.matrix): The x-coordinate(s) at which to evaluate the function
+                x (float|np.ndarray): The x-coordinate(s) at which to evaluate the function
+                out (np.ndarray|None): Optional preallocated array of the shape of x to write f(x) into without allocating any temporary; must not be x itself
             Returns:
-                (float|np.matrix): The value(s) f(x)
+                (float|np.ndarray): The value(s) f(x), i.e. out if given
         """
         print('\033[91mError: cannot instantiate/use the default ActivationFunction class - use a base class that overrides __call__()!\033[0m')
         return None
@@ -35,9 +36,9 @@ class ActivationFunction(ABC):
         """
             Returns the evaluation of the first derivative of the activation function at x
             Parameters:
-                x (float|np.matrix): The x-coordinate(s) at which to evaluate the first derivative
+                x (float|np.ndarray): The x-coordinate(s) at which to evaluate the first derivative
             Returns:
-                (float|np.matrix): The value(s) f'(x)
+                (float|np.ndarray): The value(s) f'(x)
         """
         print('\033[91mError: cannot instantiate/use the default ActivationFunction class - use a base class that overrides d()!\033[0m')
         return None
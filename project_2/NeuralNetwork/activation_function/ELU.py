@@ -18,14 +18,27 @@ class ELU(ActivationFunction):
     def name(self) -> str:
         return 'ELU'
 
-    def __call__(self, x: float) -> float:
+    def __call__(self, x: float, out: np.ndarray = None) -> float:
         """
             Returns f(x)
         """
-        return np.multiply((x >= 0), x) + np.multiply((x < 0), (np.exp(x) - 1.0) * self._alpha)
+        # The in-place version below needs alpha <= 1
+        if out is None or self._alpha > 1:
+            value = (x >= 0) * x + (x < 0) * (np.exp(x) - 1.0) * self._alpha
+            if out is None:
+                return value
+            out[...] = value
+            return out
+
+        # alpha (e^min(x, 0) - 1) is 0 for x >= 0, and above x for x < 0 as long as alpha <= 1, so the max with x gives f(x)
+        np.minimum(x, 0, out=out)
+        np.exp(out, out=out)
+        out -= 1.0
+        out *= self._alpha
+        return np.maximum(out, x, out=out)
 
     def d(self, x: float) -> float:
         """
             Returns f'(x)
         """
-        return (x >= 0) * 1 + np.multiply((x < 0), self._alpha * np.exp(x))
+        return np.heaviside(x, 1) + np.exp(x) * self._alpha * (x < 0)
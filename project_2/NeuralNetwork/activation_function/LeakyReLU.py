@@ -18,14 +18,19 @@ class LeakyReLU(ActivationFunction):
     def name(self) -> str:
         return 'LeakyReLU'
 
-    def __call__(self, x: float) -> float:
+    def __call__(self, x: float, out: np.ndarray = None) -> float:
         """
             Returns f(x)
         """
-        return np.multiply((x >= 0), x) + np.multiply((x < 0), x * self._alpha)
+        if out is None:
+            return (x >= 0) * x + (x < 0) * x * self._alpha
+
+        # f(x) is the larger of x and alpha x when alpha <= 1, the smaller otherwise
+        np.multiply(x, self._alpha, out=out)
+        return (np.maximum if self._alpha <= 1 else np.minimum)(out, x, out=out)
 
     def d(self, x: float) -> float:
         """
             Returns f'(x)
         """
-        return (x >= 0) * 1 + (x < 0) * self._alpha
+        return np.heaviside(x, 1) * (1 - self._alpha) + self._alpha
@@ -11,11 +11,14 @@ class Linear(ActivationFunction):
     def name(self) -> str:
         return 'Linear'
 
-    def __call__(self, x: float) -> float:
+    def __call__(self, x: float, out: np.ndarray = None) -> float:
         """
             Returns x (passthrough)
         """
-        return x
+        if out is None:
+            return x
+        np.copyto(out, x)
+        return out
 
     def d(self, x: float) -> float:
         """
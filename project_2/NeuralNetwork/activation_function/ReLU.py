@@ -10,15 +10,15 @@ class ReLU(ActivationFunction):
     def name(self) -> str:
         return 'ReLU'
 
-    def __call__(self, x: float) -> float:
+    def __call__(self, x: float, out: np.ndarray = None) -> float:
         """
             Returns f(x)
         """
-        return np.maximum(x, 0)
+        return np.maximum(x, 0, out=out)
 
     def d(self, x: float) -> float:
         """
             Returns f'(x)
             Technically the derivative at x = 0 is undefined, but we return 1 here
         """
-        return (x >= 0) * 1
+        return np.heaviside(x, 1)
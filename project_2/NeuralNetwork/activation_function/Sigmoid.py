@@ -10,14 +10,22 @@ class Sigmoid(ActivationFunction):
     def name(self) -> str:
         return 'Sigmoid'
 
-    def __call__(self, x: float) -> float:
+    def __call__(self, x: float, out: np.ndarray = None) -> float:
         """
             Returns the result of the sigmoid f(x)
         """
-        return 1.0 / (1.0 + np.exp(-x))
+        if out is None:
+            return 1.0 / (1.0 + np.exp(-x))
+
+        # Same operations, one at a time in out
+        np.negative(x, out=out)
+        np.exp(out, out=out)
+        out += 1.0
+        return np.divide(1.0, out, out=out)
 
     def d(self, x: float) -> float:
         """
             Returns the derivative of the sigmoid f'(x)
         """
-        return np.multiply(self(x), (1.0 - self(x)))
+        sigmoid_x = self(x)
+        return sigmoid_x * (1.0 - sigmoid_x)
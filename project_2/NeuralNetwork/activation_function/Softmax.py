@@ -8,13 +8,13 @@ EXP_7 = 1096.6331584284585992637202382881214324422191348336131437827392407
 class Softmax(ActivationFunction):
     """
         Softmax activation function
-        Note: since Softmax needs ALL of the layer's weighted sums at once instead of just a single float, the inputs to call and d MUST be matrices
+        Note: since Softmax needs ALL of the layer's weighted sums at once instead of just a single float, the inputs to call and d MUST be 2D arrays (one row per sample)
     """
     
     def name(self) -> str:
         return 'Softmax'
 
-    def __call__(self, x: np.matrix) -> np.matrix:
+    def __call__(self, x: np.ndarray, out: np.ndarray = None) -> np.ndarray:
         """
             Returns f(x)
         """
@@ -23,12 +23,21 @@ class Softmax(ActivationFunction):
         # return expTerm / np.sum(expTerm, axis=1, keepdims=True)
 
         # ln(sum(a_i)) = n + ln(sum(a_i / e^n)) for any n; in particular we choose n=7 here since e^7 ~ 1100 which works nicely for most inputs
-        ln_softmax = x - 7 - np.log(np.sum(np.exp(x)/EXP_7, axis=1))
-        return np.exp(ln_softmax)
+        if out is None:
+            ln_softmax = x - 7 - np.log(np.sum(np.exp(x)/EXP_7, axis=1, keepdims=True))
+            return np.exp(ln_softmax)
 
-    def d(self, x: np.matrix) -> np.matrix:
+        # Same operations in out, the only temporary being the (n_samples x 1) log of the sums
+        np.exp(x, out=out)
+        out /= EXP_7
+        log_sum = np.log(np.sum(out, axis=1, keepdims=True))
+        np.subtract(x, 7, out=out)
+        out -= log_sum
+        return np.exp(out, out=out)
+
+    def d(self, x: np.ndarray) -> np.ndarray:
         """
             Returns f'(x)
         """
         softmax_x = self(x)
-        return np.multiply((1.0 - softmax_x), softmax_x)
+        return (1.0 - softmax_x) * softmax_x
@@ -10,11 +10,11 @@ class Tanh(ActivationFunction):
     def name(self) -> str:
         return 'Tanh'
 
-    def __call__(self, x: float) -> float:
+    def __call__(self, x: float, out: np.ndarray = None) -> float:
         """
             Returns f(x)
         """
-        return np.tanh(x)
+        return np.tanh(x, out=out)
 
     def d(self, x: float) -> float:
         """
@@ -22,4 +22,4 @@ class Tanh(ActivationFunction):
             1 - tanh(x)**2
         """
         t = np.tanh(x)
-        return 1.0 - np.multiply(t, t)
+        return 1.0 - t * t
@@ -11,20 +11,20 @@ class CostFunction(ABC):
     n = 0
     
     @abstractmethod
-    def __init__(self, X_train: np.matrix, y_train: np.matrix, X_test: np.matrix, y_test: np.matrix, regularization: float = 0):
+    def __init__(self, X_train: np.ndarray, y_train: np.ndarray, X_test: np.ndarray, y_test: np.ndarray, regularization: float = 0):
         """
             Initiates the CostFunction class 
             Parameters
-                X_train (np.matrix): design train matrix
-                y_train (np.matrix): target train values
-                X_test (np.matrix): design test matrix
-                y_test (np.matrix): target test values
+                X_train (np.ndarray): design train matrix
+                y_train (np.ndarray): target train values
+                X_test (np.ndarray): design test matrix
+                y_test (np.ndarray): target test values
         """
         print('Error: cannot instantiate/use the default CostFunction class - use a base class that overrides __init__()!')
         return None
     
     @abstractmethod
-    def C(self, beta: np.matrix, indx: np.array = None) -> np.matrix:
+    def C(self, beta: np.ndarray, indx: np.array = None) -> np.ndarray:
         """
             Calls the cost function
         """
@@ -32,7 +32,7 @@ class CostFunction(ABC):
         return None
     
     @abstractmethod
-    def grad_C(self, beta: np.matrix, indx: np.array = None) -> np.matrix:
+    def grad_C(self, beta: np.ndarray, indx: np.array = None) -> np.ndarray:
         """
             Class the gradient of the cost function
         """
@@ -40,7 +40,7 @@ class CostFunction(ABC):
         return None
     
     @abstractmethod
-    def hess_C(self, beta: np.matrix) -> np.matrix:
+    def hess_C(self, beta: np.ndarray) -> np.ndarray:
         """
             Hessian for the cost function
         """
@@ -48,7 +48,7 @@ class CostFunction(ABC):
         return None 
 
     @abstractmethod
-    def grad_C_nn(self, y_data: np.matrix, y_tilde: np.matrix) -> np.matrix:
+    def grad_C_nn(self, y_data: np.ndarray, y_tilde: np.ndarray) -> np.ndarray:
         """
             Class the gradient of the cost function
         """
@@ -56,7 +56,7 @@ class CostFunction(ABC):
         return None
     
     @abstractmethod
-    def error(self, beta: np.matrix) -> np.matrix: 
+    def error(self, beta: np.ndarray) -> np.ndarray: 
         """
             Computes the error given betas
         """
@@ -64,7 +64,7 @@ class CostFunction(ABC):
         return None 
     
     @abstractmethod
-    def error_nn(self, y_data:np.matrix, y_tilde: np.matrix) -> np.matrix:
+    def error_nn(self, y_data:np.ndarray, y_tilde: np.ndarray) -> np.ndarray:
         """
             Computes the error given predictions
         """
@@ -77,6 +77,12 @@ class CostFunction(ABC):
             Returns the string that should be associated with the error_nn values
         """
         return None
+
+    def higher_is_better(self) -> bool:
+        """
+            Whether higher error_nn values are better (e.g. for an accuracy score), used to rank and early-stop training runs
+        """
+        return False
     
     @abstractmethod
     def perm_data(self, rng: np.random.Generator):
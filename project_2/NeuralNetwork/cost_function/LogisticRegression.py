@@ -6,14 +6,14 @@ from .CostFunction import CostFunction
 
 class LogisticRegression(CostFunction):
     
-    def __init__(self, X_train: np.matrix, y_train: np.matrix, X_test: np.matrix, y_test: np.matrix, regularization: float = 0):
+    def __init__(self, X_train: np.ndarray, y_train: np.ndarray, X_test: np.ndarray, y_test: np.ndarray, regularization: float = 0):
         """
             Initiates the LinearRegression class 
             Parameters
-                X_train (np.matrix): design train matrix
-                y_train (np.matrix): target train values
-                X_test (np.matrix): design test matrix
-                y_test (np.matrix): target test values
+                X_train (np.ndarray): design train matrix
+                y_train (np.ndarray): target train values
+                X_test (np.ndarray): design test matrix
+                y_test (np.ndarray): target test values
         """
         self.X = X_train
         self.y = y_train
@@ -25,11 +25,11 @@ class LogisticRegression(CostFunction):
         
         self.reg = regularization
          
-    def C(self, beta: np.matrix, indx: np.matrix = np.matrix([])) -> np.matrix:
+    def C(self, beta: np.ndarray, indx: np.ndarray = np.array([], dtype=int)) -> np.ndarray:
         """
             Returuns the value of the cost function at a new beta values
             Parameters:
-                beta (np.matrix): features vector
+                beta (np.ndarray): features vector
         """
         if indx.size == 0:
             z = self.X @ beta
@@ -37,12 +37,12 @@ class LogisticRegression(CostFunction):
         z = self.X[indx] @ beta
         return - np.mean(- self.y[indx] * np.log(self.sigmoid(z)) - (1 - self.y[indx]) * np.log(self.sigmoid(1 - z))) + self.reg * np.linalg.norm(beta)
 
-    def grad_C(self, beta: np.matrix, indx: np.matrix = np.matrix([])) -> np.matrix:
+    def grad_C(self, beta: np.ndarray, indx: np.ndarray = np.array([], dtype=int)) -> np.ndarray:
         """
             Returns the gradient of the function evaluated at a new beta values, 
             using the analytical expression.
             Parameters:
-                beta (np.matrix): features vector
+                beta (np.ndarray): features vector
         """
         if indx.size == 0:
             z = self.X @ beta
@@ -50,7 +50,7 @@ class LogisticRegression(CostFunction):
         z = self.X[indx] @ beta
         return - (self.X[indx].T @ (self.y[indx] - self.sigmoid(z))) / self.y[indx].shape[0] + self.reg * beta
     
-    def hess_C(self, beta: np.matrix) -> np.matrix:
+    def hess_C(self, beta: np.ndarray) -> np.ndarray:
         """
             Hessian for the cost function
         """
@@ -58,13 +58,13 @@ class LogisticRegression(CostFunction):
         W = np.diag( (self.sigmoid(z)*(1-self.sigmoid(z))).reshape(-1) )
         return self.X.T @ W @ self.X
 
-    def error(self, beta: np.matrix) -> np.matrix:
+    def error(self, beta: np.ndarray) -> np.ndarray:
         return np.sum((self.sigmoid(self.X_test @ beta)).round() == self.y_test) / self.y_test.shape[0]
 
-    def grad_C_nn(self, y_data: np.matrix, y_tilde: np.matrix) -> np.matrix:
+    def grad_C_nn(self, y_data: np.ndarray, y_tilde: np.ndarray) -> np.ndarray:
         return - (y_data - y_tilde) / y_tilde.shape[0]
     
-    def error_nn(self, y_data: np.matrix, y_tilde: np.matrix) -> np.matrix:
+    def error_nn(self, y_data: np.ndarray, y_tilde: np.ndarray) -> np.ndarray:
         return np.sum(y_tilde.round() == y_data.round()) /  y_tilde.size
     
     def error_name(self) -> str:
@@ -73,6 +73,12 @@ class LogisticRegression(CostFunction):
         """
         return "Accuracy"
 
+    def higher_is_better(self) -> bool:
+        """
+            Accuracy scores improve upwards
+        """
+        return True
+
     def perm_data(self, rng: np.random.Generator):
         """
             Permutes data for SDG
@@ -0,0 +1,39 @@
+
+import numpy as np
+from .LayerOptimizer import LayerOptimizer
+
+class AdaGrad(LayerOptimizer):
+    """
+        AdaGrad: gradient descent scaled by the accumulated squared gradients
+        s += g²
+        θ -= η g / (√s + ε)
+    """
+
+    def __init__(self, epsilon: float = 1e-8):
+        """
+            Initialises AdaGrad
+            Parameters:
+                epsilon (float): Small value to avoid dividing by zero
+        """
+        self._epsilon = epsilon
+
+    def name(self) -> str:
+        return 'AdaGrad'
+
+    def init_state(self, param: np.ndarray) -> list:
+        """
+            State: sum s of the squared gradients, and a scratch buffer
+        """
+        return [np.zeros_like(param), np.zeros_like(param)]
+
+    def update(self, param: np.ndarray, gradient: np.ndarray, state: list, learning_rate: float):
+        """
+            Accumulates the squared gradient, then takes a scaled step
+        """
+        s, work = state
+        np.multiply(gradient, gradient, out=work)
+        s += work
+        np.sqrt(s, out=work)
+        work += self._epsilon
+        np.divide(gradient, work, out=work)
+        param -= learning_rate * work
@@ -0,0 +1,53 @@
+
+import numpy as np
+from .LayerOptimizer import LayerOptimizer
+
+class Adam(LayerOptimizer):
+    """
+        Adam: running averages of both the gradients and the squared gradients, with bias correction
+        m = β1 m + (1 - β1) g
+        v = β2 v + (1 - β2) g²
+        θ -= η m̂ / (√v̂ + ε), with m̂ = m / (1 - β1^t) and v̂ = v / (1 - β2^t)
+    """
+
+    def __init__(self, beta1: float = 0.9, beta2: float = 0.999, epsilon: float = 1e-8):
+        """
+            Initialises Adam
+            Parameters:
+                beta1 (float): Decay rate of the running average of the gradients
+                beta2 (float): Decay rate of the running average of the squared gradients
+                epsilon (float): Small value to avoid dividing by zero
+        """
+        self._beta1 = beta1
+        self._beta2 = beta2
+        self._epsilon = epsilon
+
+    def name(self) -> str:
+        return 'Adam'
+
+    def init_state(self, param: np.ndarray) -> list:
+        """
+            State: first moment m, second moment v, a scratch buffer, and the step count t (as a 1-element array)
+        """
+        return [np.zeros_like(param), np.zeros_like(param), np.zeros_like(param), np.zeros(1, dtype=int)]
+
+    def update(self, param: np.ndarray, gradient: np.ndarray, state: list, learning_rate: float):
+        """
+            Updates both moments, then takes a bias-corrected step
+        """
+        m, v, work, t = state
+        t += 1
+
+        m *= self._beta1
+        m += (1 - self._beta1) * gradient
+        np.multiply(gradient, gradient, out=work)
+        v *= self._beta2
+        v += (1 - self._beta2) * work
+
+        # Fold the bias corrections into the step size and epsilon: η m̂ / (√v̂ + ε) = η_t m / (√v + ε √(1 - β2^t))
+        correction2 = float(np.sqrt(1 - self._beta2 ** t[0]))
+        step_size = learning_rate * correction2 / (1 - self._beta1 ** float(t[0]))
+        np.sqrt(v, out=work)
+        work += self._epsilon * correction2
+        np.divide(m, work, out=work)
+        param -= step_size * work
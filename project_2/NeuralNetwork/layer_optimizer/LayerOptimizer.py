@@ -0,0 +1,45 @@
+
+import numpy as np
+from abc import ABC, abstractmethod
+
+class LayerOptimizer(ABC):
+    """
+        Abstract class that can be inherited to define different update rules for a network's weights & biases.
+        The optimizer itself only holds hyper-parameters; the state it needs (velocities, running averages, ...) is allocated
+        by init_state and kept by each Layer next to the parameter it belongs to, so a single instance can be shared by all layers.
+    """
+
+    @abstractmethod
+    def name(self) -> str:
+        """
+            Returns the name of the optimizer
+            Returns:
+                (str): The name of the optimizer
+        """
+        print('\033[91mError: cannot instantiate/use the default LayerOptimizer class - use a base class that overrides name()!\033[0m')
+        return None
+
+    @abstractmethod
+    def init_state(self, param: np.ndarray) -> list:
+        """
+            Allocates the state needed to update a parameter
+            Parameters:
+                param (np.ndarray): The parameter (weights or biases) that will be updated
+            Returns:
+                (list<np.ndarray>): State arrays, shaped & typed like the parameter, to pass to every call of update
+        """
+        print('\033[91mError: cannot instantiate/use the default LayerOptimizer class - use a base class that overrides init_state()!\033[0m')
+        return None
+
+    @abstractmethod
+    def update(self, param: np.ndarray, gradient: np.ndarray, state: list, learning_rate: float):
+        """
+            Updates a parameter in place, along with its state
+            Parameters:
+                param (np.ndarray): The parameter (weights or biases) to update
+                gradient (np.ndarray): Gradient of the cost with respect to the parameter
+                state (list<np.ndarray>): The parameter's state, as given by init_state
+                learning_rate (float): Learning rate η to use for this step
+        """
+        print('\033[91mError: cannot instantiate/use the default LayerOptimizer class - use a base class that overrides update()!\033[0m')
+        return None
@@ -0,0 +1,36 @@
+
+import numpy as np
+from .LayerOptimizer import LayerOptimizer
+
+class Momentum(LayerOptimizer):
+    """
+        Gradient descent with momentum
+        v = μv - η g
+        θ += v
+    """
+
+    def __init__(self, momentum: float = 0.9):
+        """
+            Initialises momentum gradient descent
+            Parameters:
+                momentum (float): Momentum μ, i.e. fraction of the previous step kept in the current one; typically 0.5..0.99
+        """
+        self._momentum = momentum
+
+    def name(self) -> str:
+        return 'Momentum'
+
+    def init_state(self, param: np.ndarray) -> list:
+        """
+            State: velocity v
+        """
+        return [np.zeros_like(param)]
+
+    def update(self, param: np.ndarray, gradient: np.ndarray, state: list, learning_rate: float):
+        """
+            Updates the velocity, then moves the parameter along it
+        """
+        velocity = state[0]
+        velocity *= self._momentum
+        velocity -= learning_rate * gradient
+        param += velocity
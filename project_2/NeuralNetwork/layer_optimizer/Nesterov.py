@@ -0,0 +1,38 @@
+
+import numpy as np
+from .LayerOptimizer import LayerOptimizer
+
+class Nesterov(LayerOptimizer):
+    """
+        Nesterov accelerated gradient, in the usual reformulation that only needs the gradient at the current parameters
+        v = μv - η g
+        θ += μv - η g
+    """
+
+    def __init__(self, momentum: float = 0.9):
+        """
+            Initialises Nesterov accelerated gradient descent
+            Parameters:
+                momentum (float): Momentum μ, i.e. fraction of the previous step kept in the current one; typically 0.5..0.99
+        """
+        self._momentum = momentum
+
+    def name(self) -> str:
+        return 'Nesterov'
+
+    def init_state(self, param: np.ndarray) -> list:
+        """
+            State: velocity v, and a scratch buffer for the scaled gradient
+        """
+        return [np.zeros_like(param), np.zeros_like(param)]
+
+    def update(self, param: np.ndarray, gradient: np.ndarray, state: list, learning_rate: float):
+        """
+            Updates the velocity, then looks ahead along it
+        """
+        velocity, step = state
+        np.multiply(gradient, learning_rate, out=step)
+        velocity *= self._momentum
+        velocity -= step
+        param -= step
+        param += self._momentum * velocity
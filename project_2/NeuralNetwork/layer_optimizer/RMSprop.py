@@ -0,0 +1,42 @@
+
+import numpy as np
+from .LayerOptimizer import LayerOptimizer
+
+class RMSprop(LayerOptimizer):
+    """
+        RMSprop: gradient descent scaled by a running average of the squared gradients
+        s = ρs + (1 - ρ) g²
+        θ -= η g / (√s + ε)
+    """
+
+    def __init__(self, decay: float = 0.9, epsilon: float = 1e-8):
+        """
+            Initialises RMSprop
+            Parameters:
+                decay (float): Decay rate ρ of the running average
+                epsilon (float): Small value to avoid dividing by zero
+        """
+        self._decay = decay
+        self._epsilon = epsilon
+
+    def name(self) -> str:
+        return 'RMSprop'
+
+    def init_state(self, param: np.ndarray) -> list:
+        """
+            State: running average s of the squared gradients, and a scratch buffer
+        """
+        return [np.zeros_like(param), np.zeros_like(param)]
+
+    def update(self, param: np.ndarray, gradient: np.ndarray, state: list, learning_rate: float):
+        """
+            Updates the running average, then takes a scaled step
+        """
+        s, work = state
+        np.multiply(gradient, gradient, out=work)
+        s *= self._decay
+        s += (1 - self._decay) * work
+        np.sqrt(s, out=work)
+        work += self._epsilon
+        np.divide(gradient, work, out=work)
+        param -= learning_rate * work
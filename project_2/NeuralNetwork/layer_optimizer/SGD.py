@@ -0,0 +1,24 @@
+
+import numpy as np
+from .LayerOptimizer import LayerOptimizer
+
+class SGD(LayerOptimizer):
+    """
+        Plain (stochastic) gradient descent
+        θ -= η g
+    """
+
+    def name(self) -> str:
+        return 'SGD'
+
+    def init_state(self, param: np.ndarray) -> list:
+        """
+            Plain gradient descent is stateless
+        """
+        return []
+
+    def update(self, param: np.ndarray, gradient: np.ndarray, state: list, learning_rate: float):
+        """
+            Takes a step against the gradient
+        """
+        param -= learning_rate * gradient
@@ -15,7 +15,7 @@ class GradientDescent(Optimizer):
         self.cost_function = cost_function
         self.n_features = cost_function.n_features
         
-    def optimize(self, eta: float, random_state: int, tol: float = 1e-7, iter_max: int = int(1e5), verbose: bool = False) -> np.matrix:
+    def optimize(self, eta: float, random_state: int, tol: float = 1e-7, iter_max: int = int(1e5), verbose: bool = False) -> np.ndarray:
         """
             Finds the minimum of the inpute CostFunction using the analytical expression for the gradient.
             Parameters:
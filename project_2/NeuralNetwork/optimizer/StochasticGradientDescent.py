@@ -20,7 +20,7 @@ class StochasticGradientDescent(Optimizer):
         self.n_batches = cost_function.n // size_minibatches
         self.size_minibatches = size_minibatches
     
-    def optimize(self, eta: float, random_state: int, regularization: float = 0, tol: float = 1e-7, iter_max: int = int(1e5), verbose: bool = False) -> np.matrix:
+    def optimize(self, eta: float, random_state: int, regularization: float = 0, tol: float = 1e-7, iter_max: int = int(1e5), verbose: bool = False) -> np.ndarray:
         """
             Finds the minimum of the inpute CostFunction using the analytical expression for the gradient.
             Parameters:
@@ -64,7 +64,7 @@ class StochasticGradientDescent(Optimizer):
             return theta, epoch, np.array(error_list)
         return theta
         
-    def optimize_learning_schedule(self, eta: Callable, random_state: int, tol: float = 1e-7, iter_max: int = int(1e5), verbose: bool = False) -> np.matrix:
+    def optimize_learning_schedule(self, eta: Callable, random_state: int, tol: float = 1e-7, iter_max: int = int(1e5), verbose: bool = False) -> np.ndarray:
         """
             Finds the minimum of the inpute CostFunction using the analytical expression for the gradient.
             Parameters:
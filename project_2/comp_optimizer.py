@@ -6,6 +6,7 @@ from NeuralNetwork.optimizer.GradientDescent import GradientDescent
 from NeuralNetwork.optimizer.StochasticGradientDescent import StochasticGradientDescent
 from NeuralNetwork.optimizer.RMSprop import RMSprop
 from NeuralNetwork.optimizer.NewtonMethod import NewtonMethod
+from NeuralNetwork.ResultsStore import ResultsStore, fingerprint
 
 from NeuralNetwork.cost_function.LinearRegression import LinearRegression
 from NeuralNetwork.cost_function.LogisticRegression import LogisticRegression
@@ -45,6 +46,7 @@ theta_ols = ols(X_train, z_train)
 # parameters for simulations
 tol = 1e-6
 iter_max = int(1e6)
+size_minibatches = 5
 # eta_vals = np.power(10.0, [-5, -4, -3, -2, -1])
 eta_vals = np.array([0.000001, 0.00001, 0.0001, 0.001, 0.01, 0.1])
 n_eta = eta_vals.shape[0]
@@ -60,16 +62,26 @@ for method in methods:
     mse[method] = list()
     epochs[method] = list()
 
+# every run is saved as soon as it's done, so an interrupted script picks up where it stopped;
+# runs saved with other settings or data are never reused (the old file is moved aside, see ResultsStore)
+store = ResultsStore("./results/comp_optimization/results.jsonl", metadata={'n': n, 'deg': deg, 'noise': noise, 'seed': seed, 'tol': tol, 'iter_max': iter_max,
+                                                                             'size_minibatches': size_minibatches, 'data': fingerprint(X_train, z_train, X_test, z_test)})
+
+def run_optimizer(method, eta, optimizer):
+    record = store.find({'method': method, 'eta': eta})
+    if record is None:
+        tmp = perf_counter()
+        out = optimizer.optimize(tol=tol, iter_max=iter_max, eta=eta, random_state=seed, verbose=True)
+        record = {'method': method, 'eta': eta, 'time': perf_counter() - tmp, 'epochs': out[1], 'mse': out[2]}
+        store.append(record)
+    
+    time[method].append(record['time'])
+    mse[method].append(np.array(record['mse']))
+    epochs[method].append(record['epochs'])
+
 # Newton's method
 lin_reg = LinearRegression(X_train, z_train, X_test, z_test)
-optimizer_newton = NewtonMethod(lin_reg)
-tmp = perf_counter()
-newton_out = optimizer_newton.optimize(tol=tol, iter_max=iter_max, eta=0, random_state=seed, verbose=True)
-time_newton = perf_counter() - tmp
-
-time["newton"].append(time_newton)
-mse["newton"].append(newton_out[2])
-epochs["newton"].append(newton_out[1])
+run_optimizer("newton", 0, NewtonMethod(lin_reg))
 
 # Gradient methods
 for i, eta in enumerate(eta_vals):
@@ -79,24 +91,10 @@ for i, eta in enumerate(eta_vals):
     print()
 
     lin_reg = LinearRegression(X_train, z_train, X_test, z_test)
-    optimizer_GD = GradientDescent(lin_reg)
-    tmp = perf_counter()    
-    GD_out = optimizer_GD.optimize(tol=tol, iter_max=iter_max, eta=eta, random_state=seed, verbose=True)
-    time_GD = perf_counter() - tmp
-    
-    time["GD"].append(time_GD)
-    mse["GD"].append(GD_out[2])
-    epochs["GD"].append(GD_out[1])
+    run_optimizer("GD", eta, GradientDescent(lin_reg))
 
     lin_reg = LinearRegression(X_train, z_train, X_test, z_test)
-    optimizer_SGD = StochasticGradientDescent(lin_reg, size_minibatches=5)
-    tmp = perf_counter()
-    SGD_out = optimizer_SGD.optimize(tol=tol, iter_max=iter_max, eta=eta, random_state=seed, verbose=True)
-    time_SGD = perf_counter() - tmp
-    
-    time["SGD"].append(time_SGD)
-    mse["SGD"].append(SGD_out[2])
-    epochs["SGD"].append(SGD_out[1])
+    run_optimizer("SGD", eta, StochasticGradientDescent(lin_reg, size_minibatches=size_minibatches))
 
 # write to file
 for i in range(n_eta):
@@ -19,7 +19,7 @@ def franke_function(X, Y):
     term4 = -0.2*np.exp(-(9*X-4)**2 - (9*Y-7)**2)
     return term1 + term2 + term3 + term4
 
-def create_X_2D(degree: int, X: np.matrix, Y: np.matrix):
+def create_X_2D(degree: int, X: np.matrix, Y: np.matrix, dtype: type = np.float64, filename: str = None) -> np.ndarray:
     """
         Create the design matrix in the form of a Vandermonde matrix for one or two
         dimensional data set. The matrix is of the form
@@ -34,6 +34,8 @@ def create_X_2D(degree: int, X: np.matrix, Y: np.matrix):
             degree (int): degree of the polynomial to fit (p)
             X (numpy array): The input data points on the X axis (n)
             Y (numpy array): The input data points on the Y axis (n)
+            dtype (type): data type of the matrix; np.float32 halves the memory needed
+            filename (str|None): if given, the matrix is memory-mapped to this .npy file (reload it with np.load(filename, mmap_mode='r'))
         
         Returns: 
             (numpy array): (n x p) dimensional matrix, 
@@ -41,17 +43,68 @@ def create_X_2D(degree: int, X: np.matrix, Y: np.matrix):
             plus p = degree*(degree + 1)/2 (2-variable input)
     """
     
-    design_matrix = np.ones((len(X), int((degree + 1) * (degree + 2) / 2))) # First column of design matrix is 1
-    
     # The number of features are 1 + 2 + ... + (degree+1) = (degree+1)*(degree+2)/2
-    for i in range(1, degree + 1): # First column is 1, so we skip it
-        q = int(i * (i + 1) / 2) # 1 + 2 + ... + i
-        
-        for k in range(i + 1):
-            design_matrix[:, q + k] = (X ** (i - k)) * (Y ** k)
+    design_matrix = _empty_X_2D(len(X), int((degree + 1) * (degree + 2) / 2), dtype, filename)
+    _fill_X_2D(design_matrix, X, Y, 0, degree)
     
     return design_matrix
 
+def extend_X_2D(design_matrix: np.ndarray, degree: int, X: np.matrix, Y: np.matrix, filename: str = None) -> np.ndarray:
+    """
+        Extends a design matrix made by create_X_2D to a higher degree, only computing the columns of the new degrees
+
+        Parameters:
+            design_matrix (numpy array): design matrix of any degree lower than `degree`, for the same X and Y
+            degree (int): degree of the polynomial to fit
+            X (numpy array): The input data points on the X axis (n)
+            Y (numpy array): The input data points on the Y axis (n)
+            filename (str|None): if given, the new matrix is memory-mapped to this .npy file
+
+        Returns:
+            (numpy array): (n x p) dimensional matrix, with the same data type as design_matrix
+    """
+
+    # Degree of the given matrix, from its (d+1)*(d+2)/2 columns
+    old_degree = int(round((np.sqrt(8 * design_matrix.shape[1] + 1) - 3) / 2))
+
+    extended = _empty_X_2D(design_matrix.shape[0], int((degree + 1) * (degree + 2) / 2), design_matrix.dtype, filename)
+    extended[:, :design_matrix.shape[1]] = design_matrix
+    _fill_X_2D(extended, X, Y, old_degree + 1, degree)
+
+    return extended
+
+def _empty_X_2D(n: int, n_features: int, dtype: type, filename: str = None) -> np.ndarray:
+    """
+        Allocates an uninitialised design matrix, in memory or memory-mapped to a .npy file
+    """
+
+    if filename is not None:
+        return np.lib.format.open_memmap(filename, mode='w+', dtype=dtype, shape=(n, n_features))
+    return np.empty((n, n_features), dtype=dtype)
+
+def _fill_X_2D(design_matrix: np.ndarray, X: np.matrix, Y: np.matrix, first_degree: int, degree: int, chunk_size: int = 8192):
+    """
+        Computes the columns of degrees first_degree to degree of a design matrix in place, the lower degrees being already filled in.
+        Each degree is one product of the previous degree's columns with x (x^(i-k) y^k = x^(i-1-k) y^k * x), plus one last column times y,
+        going over the rows in chunks so that the columns being worked on stay in cache.
+    """
+
+    x = np.asarray(X, dtype=np.float64).reshape(-1)
+    y = np.asarray(Y, dtype=np.float64).reshape(-1)
+
+    for start in range(0, design_matrix.shape[0], chunk_size):
+        rows = design_matrix[start : start + chunk_size]
+        x_rows = x[start : start + chunk_size, np.newaxis]
+        y_rows = y[start : start + chunk_size]
+
+        if first_degree == 0:
+            rows[:, 0] = 1 # First column of design matrix is 1
+        for i in range(max(first_degree, 1), degree + 1):
+            p = int((i - 1) * i / 2) # first column of degree i-1
+            q = int(i * (i + 1) / 2) # first column of degree i, 1 + 2 + ... + i
+            np.multiply(rows[:, p:q], x_rows, out=rows[:, q:q + i])
+            np.multiply(rows[:, q - 1], y_rows, out=rows[:, q + i])
+
 def scale_mean_std(X_train: np.matrix, X_test: np.matrix, y_train: np.matrix, y_test: np.matrix) -> tuple:
     """
         Subtracts the mean value and divides by the standard deviation
@@ -1,5 +1,10 @@
 import numpy as np
 import matplotlib.pyplot as plt
+import sys
+from os.path import exists
+sys.path.append('../../')
+
+from NeuralNetwork.ResultsStore import ResultsStore
 
 """
     Analyse the results for the comparison of optimization methods
@@ -10,47 +15,86 @@ import matplotlib.pyplot as plt
 
 methods = ["newton", "GD", "SGD"]
 
-time = np.loadtxt("time.txt")
-eta_vals = time[:, 0]
-time = time[:, 1:3]
-
-# read newton
-newton = np.loadtxt("newton.txt")
-newton_time = newton[0, 0]
-newton_epochs = newton[1:, 0]
-newton_mse = newton[1:, 1]
-
-# read GD
-gd_time = list()
-gd_epochs = list()
-gd_mse = list()
-gd_last_mse = list()
-gd_last_epoch = list()
-
-for i in range(len(eta_vals)):
-    gd_time.append(time[i, 0])
+# read from the results store written by comp_optimizer.py if there is one, otherwise from the older text files
+if exists("results.jsonl"):
+    store = ResultsStore("results.jsonl")
+    runs = {(record['method'], record['eta']): record for record in store.records()}
+    eta_vals = np.array(sorted(eta for method, eta in runs.keys() if method == "GD"))
+
+    newton = runs[("newton", 0)]
+    newton_time = newton['time']
+    newton_mse = np.array(newton['mse'])
+    newton_epochs = np.arange(1, newton_mse.shape[0] + 1)
+
+    gd_time = list()
+    gd_epochs = list()
+    gd_mse = list()
+    gd_last_mse = list()
+    gd_last_epoch = list()
+
+    sgd_time = list()
+    sgd_epochs = list()
+    sgd_mse = list()
+    sgd_last_mse = list()
+    sgd_last_epoch = list()
+
+    for eta in eta_vals:
+        gd = runs[("GD", eta)]
+        gd_time.append(gd['time'])
+        gd_mse.append(np.array(gd['mse']))
+        gd_last_mse.append(gd['mse'][-1])
+        gd_epochs.append(np.arange(1, len(gd['mse']) + 1))
+        gd_last_epoch.append(len(gd['mse']))
+
+        sgd = runs[("SGD", eta)]
+        sgd_time.append(sgd['time'])
+        sgd_mse.append(np.array(sgd['mse']))
+        sgd_last_mse.append(sgd['mse'][-1])
+        sgd_epochs.append(np.arange(1, len(sgd['mse']) + 1))
+        sgd_last_epoch.append(len(sgd['mse']))
+
+else:
+    time = np.loadtxt("time.txt")
+    eta_vals = time[:, 0]
+    time = time[:, 1:3]
+
+    # read newton
+    newton = np.loadtxt("newton.txt")
+    newton_time = newton[0, 0]
+    newton_epochs = newton[1:, 0]
+    newton_mse = newton[1:, 1]
+
+    # read GD
+    gd_time = list()
+    gd_epochs = list()
+    gd_mse = list()
+    gd_last_mse = list()
+    gd_last_epoch = list()
+
+    for i in range(len(eta_vals)):
+        gd_time.append(time[i, 0])
     
-    tmp = np.loadtxt(f"./GD/GD_eta_{i}.txt")
-    gd_mse.append(tmp[:, 1])
-    gd_last_mse.append(tmp[-1, 1])
-    gd_epochs.append(tmp[:, 0])
-    gd_last_epoch.append(tmp[-1, 0])
-
-# read SDG
-sgd_time = list()
-sgd_epochs = list()
-sgd_mse = list()
-sgd_last_mse = list()
-sgd_last_epoch = list()
-
-for i in range(len(eta_vals)):
-    sgd_time.append(time[i, 1])
+        tmp = np.loadtxt(f"./GD/GD_eta_{i}.txt")
+        gd_mse.append(tmp[:, 1])
+        gd_last_mse.append(tmp[-1, 1])
+        gd_epochs.append(tmp[:, 0])
+        gd_last_epoch.append(tmp[-1, 0])
+
+    # read SDG
+    sgd_time = list()
+    sgd_epochs = list()
+    sgd_mse = list()
+    sgd_last_mse = list()
+    sgd_last_epoch = list()
+
+    for i in range(len(eta_vals)):
+        sgd_time.append(time[i, 1])
     
-    tmp = np.loadtxt(f"./SGD/SGD_eta_{i}.txt")
-    sgd_mse.append(tmp[:, 1])
-    sgd_last_mse.append(tmp[-1, 1])
-    sgd_epochs.append(tmp[:, 0])
-    sgd_last_epoch.append(tmp[-1, 0])
+        tmp = np.loadtxt(f"./SGD/SGD_eta_{i}.txt")
+        sgd_mse.append(tmp[:, 1])
+        sgd_last_mse.append(tmp[-1, 1])
+        sgd_epochs.append(tmp[:, 0])
+        sgd_last_epoch.append(tmp[-1, 0])
 
 print("Files read! ")
 
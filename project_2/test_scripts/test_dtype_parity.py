@@ -0,0 +1,113 @@
+import numpy as np
+from NeuralNetwork.ActivationFunctions import Sigmoid, Tanh, ReLU, Linear, Softmax
+from NeuralNetwork.Layer import HiddenLayer, OutputLayer
+from NeuralNetwork.Model import Model
+from NeuralNetwork.cost_function.LinearRegression import LinearRegression
+from NeuralNetwork.cost_function.LogisticRegression import LogisticRegression
+
+
+# Settings
+seed = 1337
+n = 200
+epochs = 20
+learning_rate = 0.1
+lmbda = 1e-4
+fd_step = 1e-6 # Step used for the finite difference gradient check
+rtol_float32 = 1e-4 # Relative tolerance on the float32 training error, compared with float64's
+
+
+# Regression and classification data
+rng = np.random.default_rng(seed)
+X = rng.uniform(0, 1, (n, 3))
+z = (np.sin(3 * X[:, 0]) + X[:, 1] * X[:, 2]).reshape(-1, 1)
+labels = np.zeros((n, 3))
+labels[np.arange(n), rng.integers(0, 3, n)] = 1
+
+
+def make_model(hidden_fn, output_fn, output_size, cost_function, dtype=np.float64):
+    model = Model(3, cost_function=cost_function, random_state=seed, dtype=dtype)
+    model.add_layer(HiddenLayer(16, hidden_fn))
+    model.add_layer(HiddenLayer(8, hidden_fn))
+    model.add_layer(OutputLayer(output_size, output_fn))
+    return model
+
+setups = [
+    ('regression', lambda dtype=np.float64: make_model(Sigmoid(), Linear(), 1, LinearRegression(X, z, X, z), dtype), z),
+    ('regression (ReLU)', lambda dtype=np.float64: make_model(ReLU(), Linear(), 1, LinearRegression(X, z, X, z), dtype), z),
+    ('classification', lambda dtype=np.float64: make_model(Tanh(), Softmax(), 3, LogisticRegression(X, labels, X, labels), dtype), labels),
+]
+
+
+def reference_step(model, inputs, targets, learning_rate, regularization):
+    """
+        Plain float64 implementation of one mini-batch gradient descent step, independent of the Layer/Model code
+    """
+    weights = [layer._weights.astype(np.float64) for layer in model.layers]
+    biases = [layer._biases.astype(np.float64) for layer in model.layers]
+    fns = [layer._activation_fn for layer in model.layers]
+
+    a, z_ = [inputs], [inputs]
+    for W, b, fn in zip(weights, biases, fns):
+        z_.append(a[-1] @ W.T + b.T)
+        a.append(fn(z_[-1]))
+
+    delta = model.cost_function.grad_C_nn(targets, a[-1]) * fns[-1].d(z_[-1])
+    for j in range(len(weights) - 1, -1, -1):
+        W_grad = delta.T @ a[j] + regularization * weights[j]
+        b_grad = np.sum(delta, axis=0).reshape(-1, 1) + regularization * biases[j]
+        if j > 0:
+            delta = (delta @ weights[j]) * fns[j - 1].d(z_[j])
+        weights[j] = weights[j] - learning_rate * W_grad
+        biases[j] = biases[j] - learning_rate * b_grad
+    return weights, biases
+
+
+for name, setup, targets in setups:
+    print(f'\n-- {name} --')
+
+    # 1) np.matrix and ndarray inputs give bit-identical results in float64
+    model_matrix, model_array = setup(), setup()
+    assert np.array_equal(model_matrix.feed_forward(np.matrix(X)), model_array.feed_forward(X))
+    model_matrix.train(np.matrix(X), np.matrix(targets), learning_rate, epochs=epochs, regularization=lmbda, verbose=False)
+    model_array.train(X, targets, learning_rate, epochs=epochs, regularization=lmbda, verbose=False)
+    assert np.array_equal(model_matrix.feed_forward(X), model_array.feed_forward(X))
+    print('np.matrix vs ndarray inputs: identical')
+
+    # 2) One training step matches an independent float64 implementation
+    model = setup()
+    weights, biases = reference_step(model, X[:10], targets[:10], learning_rate, lmbda)
+    model.back_prop(X[:10], targets[:10], learning_rate=learning_rate, regularization=lmbda)
+    max_diff = 0
+    for layer, W, b in zip(model.layers, weights, biases):
+        max_diff = max(max_diff, np.max(np.abs(layer._weights - W)), np.max(np.abs(layer._biases - b)))
+    assert max_diff < 1e-12, max_diff
+    print(f'back_prop vs reference step: max difference {max_diff:.2e}')
+
+    # 3) Gradients match central finite differences of the MSE (the classification cost's gradient is only an approximation for Softmax)
+    if name.startswith('regression'):
+        model = setup()
+        model.compute_gradients(X[:10], targets[:10])
+        weights_gradient = model.layers[0].get_gradients()[0].copy()
+        cost = lambda: np.mean((model.feed_forward(X[:10]) - targets[:10])**2)
+        max_rel_err = 0
+        for i, j in [(0, 0), (3, 1), (15, 2)]:
+            w = model.layers[0]._weights[i, j]
+            model.layers[0]._weights[i, j] = w + fd_step
+            c_plus = cost()
+            model.layers[0]._weights[i, j] = w - fd_step
+            c_minus = cost()
+            model.layers[0]._weights[i, j] = w
+            fd = (c_plus - c_minus) / (2 * fd_step)
+            max_rel_err = max(max_rel_err, abs(fd - weights_gradient[i, j]) / max(abs(fd), 1e-8))
+        assert max_rel_err < 1e-5, max_rel_err
+        print(f'Finite difference check: max relative error {max_rel_err:.2e}')
+
+    # 4) float32 keeps its dtype end to end and stays close to the float64 results
+    model64, model32 = setup(np.float64), setup(np.float32)
+    err64 = model64.train(X, targets, learning_rate, epochs=epochs, regularization=lmbda, verbose=False)
+    err32 = model32.train(X, targets, learning_rate, epochs=epochs, regularization=lmbda, verbose=False)
+    assert model32.feed_forward(X).dtype == np.float32
+    assert all(layer._weights.dtype == np.float32 and layer._biases.dtype == np.float32 for layer in model32.layers)
+    rel_diff = abs(err32 - err64) / abs(err64)
+    assert rel_diff < rtol_float32, (err64, err32)
+    print(f'float64 vs float32 final error: {err64} vs {err32} (relative difference {rel_diff:.2e})')
@@ -0,0 +1,92 @@
+import numpy as np
+from NeuralNetwork.LayerOptimizers import SGD, Momentum, Nesterov, RMSprop, AdaGrad, Adam
+
+
+# Settings
+seed = 1337
+steps = 3
+learning_rate = 0.05
+tol = 1e-12 # Relative tolerance between the optimizers and the closed-form updates
+
+
+# Fixed parameters and one fixed gradient per step
+rng = np.random.default_rng(seed)
+theta0 = rng.normal(0, 1, (4, 3))
+gradients = [rng.normal(0, 1, theta0.shape) for _ in range(steps)]
+
+# Quadratic cost 1/2 θ·Aθ - b·θ (elementwise A), whose gradient depends on where it's evaluated, for Nesterov's look-ahead
+A = rng.uniform(0.5, 2, theta0.shape)
+b = rng.normal(0, 1, theta0.shape)
+grad_f = lambda theta: A * theta - b
+
+
+def run(optimizer, gradient_at):
+    """
+        Takes the optimizer's steps from theta0, the gradient of step t being gradient_at(t, current parameters)
+    """
+    theta = theta0.copy()
+    state = optimizer.init_state(theta)
+    for t in range(steps):
+        optimizer.update(theta, gradient_at(t, theta), state, learning_rate)
+    return theta
+
+def check(name, theta, expected):
+    rel_err = np.max(np.abs(theta - expected)) / np.max(np.abs(expected))
+    assert rel_err < tol, (name, rel_err)
+    print(f'{name}: max relative difference with the closed-form update {rel_err:.2e}')
+
+fixed = lambda t, theta: gradients[t]
+
+
+# 1) SGD: θ -= η g
+expected = theta0 - learning_rate * np.sum(gradients, axis=0)
+check('SGD', run(SGD(), fixed), expected)
+
+# 2) Momentum: v = μv - η g, θ += v
+mu = 0.8
+theta, v = theta0.copy(), np.zeros_like(theta0)
+for g in gradients:
+    v = mu * v - learning_rate * g
+    theta = theta + v
+check('Momentum', run(Momentum(mu), fixed), theta)
+
+# 3) Nesterov, textbook form: the gradient is taken at the look-ahead point θ + μv
+#        v = μv - η ∇f(θ + μv), θ += v
+#    The optimizer's reformulation tracks the look-ahead point φ = θ + μv itself, taking the gradient at its own parameters
+theta, v = theta0.copy(), np.zeros_like(theta0)
+for _ in range(steps):
+    v = mu * v - learning_rate * grad_f(theta + mu * v)
+    theta = theta + v
+check('Nesterov', run(Nesterov(mu), lambda t, phi: grad_f(phi)), theta + mu * v)
+
+# 4) RMSprop: s = ρs + (1 - ρ) g², θ -= η g / (√s + ε)
+rho, eps = 0.7, 1e-3
+theta, s = theta0.copy(), np.zeros_like(theta0)
+for g in gradients:
+    s = rho * s + (1 - rho) * g**2
+    theta = theta - learning_rate * g / (np.sqrt(s) + eps)
+check('RMSprop', run(RMSprop(rho, eps), fixed), theta)
+
+# 5) AdaGrad: s += g², θ -= η g / (√s + ε)
+theta, s = theta0.copy(), np.zeros_like(theta0)
+for g in gradients:
+    s = s + g**2
+    theta = theta - learning_rate * g / (np.sqrt(s) + eps)
+check('AdaGrad', run(AdaGrad(eps), fixed), theta)
+
+# 6) Adam, textbook form with explicit bias corrections (the optimizer folds them into the step size and ε instead):
+#        m = β1 m + (1 - β1) g, v = β2 v + (1 - β2) g², θ -= η m̂ / (√v̂ + ε), with m̂ = m / (1 - β1^t) and v̂ = v / (1 - β2^t)
+#    A large ε makes a wrongly folded ε show up
+beta1, beta2 = 0.8, 0.95
+theta, m, v = theta0.copy(), np.zeros_like(theta0), np.zeros_like(theta0)
+for t, g in enumerate(gradients, start=1):
+    m = beta1 * m + (1 - beta1) * g
+    v = beta2 * v + (1 - beta2) * g**2
+    m_hat, v_hat = m / (1 - beta1**t), v / (1 - beta2**t)
+    theta = theta - learning_rate * m_hat / (np.sqrt(v_hat) + eps)
+check('Adam', run(Adam(beta1, beta2, eps), fixed), theta)
+
+# 7) Optimizer state carries over between steps, and init_state gives a fresh one
+optimizer = Adam(beta1, beta2, eps)
+assert np.array_equal(run(optimizer, fixed), run(optimizer, fixed))
+print('Adam: same result from two fresh states')
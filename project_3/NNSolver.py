@@ -12,7 +12,7 @@ class DiffEqNet(tf.keras.Sequential):
     trial_func() : The trial solution, must obey initial and boundary conditions.
     cost_function() : Custom cost function depending on the equation.
     """
-    def __init__(self, layers, learning_rate = 0.001):
+    def __init__(self, layers, learning_rate = 0.001, jit_compile = False):
         super(DiffEqNet, self).__init__()
 
         # Input layer
@@ -26,7 +26,11 @@ class DiffEqNet(tf.keras.Sequential):
         self.add(Dense(layers[-1], activation = 'linear'))
 
         self.optimizer = tf.keras.optimizers.Adam(learning_rate = learning_rate)
-        
+        # The optimizer's slot variables are created by its first step, which can't be inside a compiled loop
+        self.optimizer_built = False
+        # Several update steps per call, compiled with XLA if jit_compile
+        self.compiled_steps = tf.function(self.update_steps, jit_compile = jit_compile)
+
         self.error = list()
 
     @tf.function
@@ -48,13 +52,36 @@ class DiffEqNet(tf.keras.Sequential):
         self.optimizer.apply_gradients(zip(grad, self.trainable_variables))
         return loss
 
-    #@tf.function   # Doesnt work, stalls the program for some reason
-    def train(self, epochs = 5000):
-        for i in range(epochs):
-            print(f"{i+1: 5d}/{epochs: 5d}", end = '\r')
-            #self.gradient()
+    def update_steps(self, steps):
+        """
+        Runs steps update steps in a tf.while_loop, keeping the mean losses on the device; compiled as self.compiled_steps.
+        """
+        losses = tf.TensorArray(self.var[0].dtype, size = steps)
+        for i in tf.range(steps):
+            loss = self.update()
+            losses = losses.write(i, tf.reduce_mean(loss))
+        return losses.stack()
+
+    def train(self, epochs = 5000, steps_per_call = 100):
+        """
+        Trains for epochs update steps, steps_per_call at a time in one compiled call (see update_steps):
+        the losses are only copied to self.error, and the progress printed, once per call.
+        Appends exactly epochs mean losses to self.error; the loop is compiled with XLA if jit_compile was given to __init__.
+        """
+        done = 0
+        if not self.optimizer_built and epochs > 0:
             loss = self.update()
             self.error.append(tf.reduce_mean(loss).numpy())
+            self.optimizer_built = True
+            done = 1
+
+        while done < epochs:
+            steps = min(steps_per_call, epochs - done)
+            # A tensor argument, so that the loop is only traced once whatever the number of steps
+            losses = self.compiled_steps(tf.constant(steps))
+            self.error.extend(losses.numpy())
+            done += steps
+            print(f"{done: 5d}/{epochs: 5d}", end = '\r')
 
         print('\n')
         self.trained = True
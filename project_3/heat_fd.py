@@ -1,75 +1,364 @@
 import numpy as np
 import matplotlib.pyplot as plt
+from scipy.linalg.lapack import dgttrf, dgttrs
 
 import sys
 
-def finite_difference(nx, nt):
+def explicit_heat(u0, dx, dt, n_steps, snapshot_every=1):
     """
-        Solves u_t = u_xx by finite differences method.
+        Solves u_t = laplacian(u) on a regular 1D, 2D or 3D grid with the explicit (forward Euler) finite difference scheme.
+        The boundary values of u0 are kept fixed (Dirichlet conditions).
+        Each time step is one update of all interior points at once, from one buffer into the other (the two are swapped
+        after every step), so only two copies of the grid are kept in memory besides the recorded snapshots.
         Stability condition:
-            dt/dx**2 < 1/2
+            sum over the axes of dt/dx**2 <= 1/2
+        Parameters:
+            u0 (np.ndarray): Initial values on the grid, boundaries included
+            dx (float|tuple): Grid spacing, either the same for all axes or one per axis
+            dt (float): Time step
+            n_steps (int): Number of time steps
+            snapshot_every (int): Only every k-th time step is recorded (the initial and last ones always are)
+        Returns:
+            (np.ndarray): Recorded solutions, of shape (n_snapshots, *u0.shape)
+            (np.ndarray): Times of the recorded solutions
+    """
+    u0 = np.asarray(u0, dtype=np.float64)
+    dx = np.broadcast_to(np.asarray(dx, dtype=np.float64), (u0.ndim,))
+    r = dt / dx**2
+
+    if np.sum(r) > 1 / 2:
+        print(f"sum(dt / dx**2) = {np.sum(r)}.")
+        print("Stability condition not achieved!; Change dx or dt")
+        return None
+
+    steps, snapshots = _snapshots(u0, n_steps, snapshot_every)
+
+    # Interior points, and their neighbours on either side along every axis
+    inner = (slice(1, -1),) * u0.ndim
+    neighbours = [(inner[:axis] + (slice(None, -2),) + inner[axis + 1:], inner[:axis] + (slice(2, None),) + inner[axis + 1:]) for axis in range(u0.ndim)]
+
+    u, u_new = u0.copy(), u0.copy() # ping-pong buffers, sharing the fixed boundaries
+    centre, tmp = u_new[inner], np.empty(u_new[inner].shape)
+    snapshot = 1
+    for step in range(1, n_steps + 1):
+        # u_new = (1 - 2 sum(r)) u + sum_axis r (u[i-1] + u[i+1]), on the interior
+        np.multiply(u[inner], 1 - 2 * np.sum(r), out=centre)
+        for (lower, upper), r_axis in zip(neighbours, r):
+            np.add(u[lower], u[upper], out=tmp)
+            tmp *= r_axis
+            centre += tmp
+
+        u, u_new = u_new, u
+        centre = u_new[inner]
+        if step == steps[snapshot]:
+            snapshots[snapshot] = u
+            snapshot += 1
+
+    return snapshots, steps * dt
+
+def implicit_heat(u0, dx, dt, n_steps, theta=1, snapshot_every=1):
+    """
+        Solves u_t = u_xx on a 1D grid with the theta-scheme: theta = 1 is backward Euler, theta = 1/2 Crank-Nicolson.
+        The boundary values of u0 are kept fixed (Dirichlet conditions).
+        The tridiagonal system (I - theta dt/dx**2 D) u_new = (I + (1 - theta) dt/dx**2 D) u, with D the second difference,
+        is LU factored once, and every time step is one solve with the factors.
+        Stability condition:
+            none for theta >= 1/2; dt/dx**2 <= 1/(2 (1 - 2 theta)) otherwise
+        Parameters:
+            u0 (np.ndarray): Initial values on the grid, boundaries included
+            dx (float): Grid spacing
+            dt (float): Time step
+            n_steps (int): Number of time steps
+            theta (float): Weight of the new time level, between 0 (forward Euler) and 1 (backward Euler)
+            snapshot_every (int): Only every k-th time step is recorded (the initial and last ones always are)
+        Returns:
+            (np.ndarray): Recorded solutions, of shape (n_snapshots, *u0.shape)
+            (np.ndarray): Times of the recorded solutions
+    """
+    u0 = np.asarray(u0, dtype=np.float64)
+    r = dt / dx**2
+
+    if theta < 1 / 2 and r > 1 / (2 * (1 - 2 * theta)):
+        print(f"dt / dx**2 = {r}.")
+        print("Stability condition not achieved!; Change dx or dt")
+        return None
+
+    steps, snapshots = _snapshots(u0, n_steps, snapshot_every)
+    factor = _tridiagonal_factor(u0.shape[0] - 2, theta * r)
+
+    u = u0.copy()
+    rhs = np.empty((u.shape[0] - 2, 1))
+    snapshot = 1
+    for step in range(1, n_steps + 1):
+        _theta_step(u, factor, r, theta, rhs)
+
+        if step == steps[snapshot]:
+            snapshots[snapshot] = u
+            snapshot += 1
+
+    return snapshots, steps * dt
+
+def adaptive_heat(u0, dx, t_out, tol=1e-6, theta=1 / 2, dt0=None, min_dt=1e-12):
+    """
+        Solves u_t = u_xx on a 1D grid with the theta-scheme (see implicit_heat), choosing the time steps to keep the local error
+        under tol: every step is taken both at once and as two half steps, the difference of the two estimating the error.
+        Steps with a too large error are retried with half the time step, and the time step is doubled after steps whose
+        error is small enough for a step twice as long to pass. Time steps are dt0 times a power of 2, so the LU factors of
+        the few time steps used are computed once and reused; steps are only shortened to land on the output times.
+        Parameters:
+            u0 (np.ndarray): Initial values on the grid at t = 0, boundaries included
+            dx (float): Grid spacing
+            t_out (np.ndarray): Times to record the solution at, in increasing order
+            tol (float): Maximum local error (largest absolute difference over the grid) of a time step
+            theta (float): Weight of the new time level, at least 1/2: 1/2 for Crank-Nicolson, 1 for backward Euler
+            dt0 (float|None): First time step; if None, the explicit scheme's stability limit dx**2 / 2
+            min_dt (float): Time step under which to give up
+        Returns:
+            (np.ndarray): Recorded solutions, of shape (len(t_out), *u0.shape)
+            (np.ndarray): Times of the recorded solutions, i.e. t_out
+            (np.ndarray): Accepted time steps
+    """
+    u0 = np.asarray(u0, dtype=np.float64)
+    t_out = np.atleast_1d(np.asarray(t_out, dtype=np.float64))
+    r_dt = 1 / dx**2
+    order = 2 if theta == 1 / 2 else 1
+    dt0 = dx**2 / 2 if dt0 is None else dt0
+
+    if theta < 1 / 2:
+        print(f"theta = {theta}.")
+        print("Time steps can't grow freely with theta < 1/2!; Change theta")
+        return None
+
+    # LU factors of I - theta dt/dx**2 D, for time steps dt and dt / 2
+    factors = dict()
+    def factor(dt):
+        if dt not in factors:
+            factors[dt] = _tridiagonal_factor(u0.shape[0] - 2, theta * dt * r_dt), _tridiagonal_factor(u0.shape[0] - 2, theta * dt / 2 * r_dt)
+        return factors[dt]
+
+    snapshots = np.empty((t_out.shape[0],) + u0.shape)
+    u, u_full, u_half = u0.copy(), u0.copy(), u0.copy()
+    rhs = np.empty((u.shape[0] - 2, 1))
+    t, level = 0, 0
+    dts = list()
+    for i, t_next in enumerate(t_out):
+        while t_next - t > 1e-12 * max(t_next, 1):
+            dt = min(dt0 * 2.0**level, t_next - t)
+            if dt < min_dt:
+                print(f"Time step {dt} under {min_dt} at t = {t}.")
+                print("Tolerance not achieved!; Change tol or min_dt")
+                return None
+            full, half = factor(dt)
+
+            u_full[1:-1] = u[1:-1]
+            _theta_step(u_full, full, dt * r_dt, theta, rhs)
+            u_half[1:-1] = u[1:-1]
+            _theta_step(u_half, half, dt / 2 * r_dt, theta, rhs)
+            _theta_step(u_half, half, dt / 2 * r_dt, theta, rhs)
+
+            # The two solutions differ by (2**order - 1) times the half steps' error
+            error = np.max(np.abs(u_half - u_full)) / (2**order - 1)
+            if error > tol:
+                level -= 1
+                continue
+
+            u, u_half = u_half, u
+            t += dt
+            dts.append(dt)
+            # The local error grows as dt**(order + 1)
+            if error * 2**(order + 1) <= tol and dt == dt0 * 2.0**level:
+                level += 1
+        snapshots[i] = u
+
+    return snapshots, t_out, np.array(dts)
+
+def backward_euler(u0, dx, dt, n_steps, snapshot_every=1):
+    """
+        Solves u_t = u_xx on a 1D grid with the implicit (backward Euler) scheme, see implicit_heat
+    """
+    return implicit_heat(u0, dx, dt, n_steps, theta=1, snapshot_every=snapshot_every)
+
+def crank_nicolson(u0, dx, dt, n_steps, snapshot_every=1):
+    """
+        Solves u_t = u_xx on a 1D grid with the Crank-Nicolson scheme, see implicit_heat
+    """
+    return implicit_heat(u0, dx, dt, n_steps, theta=1 / 2, snapshot_every=snapshot_every)
+
+def adi_heat(u0, dx, dt, n_steps, snapshot_every=1):
+    """
+        Solves u_t = u_xx + u_yy on a 2D grid with the Peaceman-Rachford alternating direction implicit (ADI) scheme:
+        every time step is two half steps, each implicit along one axis and explicit along the other
+            (I - r_x/2 D_x) u* = (I + r_y/2 D_y) u
+            (I - r_y/2 D_y) u_new = (I + r_x/2 D_x) u*
+        so that only tridiagonal systems are solved: the two systems are LU factored once, and every half step solves
+        the systems of all rows (or columns) at once. Second order in time and space, and unconditionally stable.
+        The boundary values of u0 are kept fixed (Dirichlet conditions).
+        Parameters:
+            u0 (np.ndarray): Initial values on the 2D grid, boundaries included
+            dx (float|tuple): Grid spacing, either the same for both axes or one per axis
+            dt (float): Time step
+            n_steps (int): Number of time steps
+            snapshot_every (int): Only every k-th time step is recorded (the initial and last ones always are)
+        Returns:
+            (np.ndarray): Recorded solutions, of shape (n_snapshots, *u0.shape)
+            (np.ndarray): Times of the recorded solutions
+    """
+    u0 = np.asarray(u0, dtype=np.float64)
+    dx = np.broadcast_to(np.asarray(dx, dtype=np.float64), (2,))
+    r_x, r_y = dt / dx**2 / 2
+
+    steps, snapshots = _snapshots(u0, n_steps, snapshot_every)
+    factor_x = _tridiagonal_factor(u0.shape[0] - 2, r_x)
+    factor_y = _tridiagonal_factor(u0.shape[1] - 2, r_y)
+
+    u = u0.copy()
+    inner = (slice(1, -1), slice(1, -1))
+    snapshot = 1
+    for step in range(1, n_steps + 1):
+        # Implicit along x (axis 0), every column of the grid being one right hand side
+        rhs = u[inner] + r_y * (u[1:-1, :-2] - 2 * u[inner] + u[1:-1, 2:])
+        rhs[0, :] += r_x * u[0, 1:-1]
+        rhs[-1, :] += r_x * u[-1, 1:-1]
+        u[inner] = _tridiagonal_solve(factor_x, rhs)
+
+        # Implicit along y (axis 1), every row being one right hand side
+        rhs = (u[inner] + r_x * (u[:-2, 1:-1] - 2 * u[inner] + u[2:, 1:-1])).T
+        rhs[0, :] += r_y * u[1:-1, 0]
+        rhs[-1, :] += r_y * u[1:-1, -1]
+        u[inner] = _tridiagonal_solve(factor_y, rhs).T
+
+        if step == steps[snapshot]:
+            snapshots[snapshot] = u
+            snapshot += 1
+
+    return snapshots, steps * dt
+
+def _snapshots(u0, n_steps, snapshot_every):
+    """
+        Time steps to record (every snapshot_every-th, the initial and last ones), and the array to record them in, holding u0 already
+    """
+    steps = np.arange(0, n_steps + 1, snapshot_every)
+    if steps[-1] != n_steps:
+        steps = np.append(steps, n_steps)
+    snapshots = np.empty((steps.shape[0],) + u0.shape)
+    snapshots[0] = u0
+    return steps, snapshots
+
+def _theta_step(u, factor, r, theta, rhs):
+    """
+        One theta-scheme time step of u, in place, with factor the LU factors of I - theta r D (see implicit_heat) and rhs an (n - 2, 1) work array
+    """
+    # Explicit part, the fixed boundaries' share of the implicit part, then the implicit solve
+    np.add(u[:-2], u[2:], out=rhs[:, 0])
+    rhs[:, 0] -= 2 * u[1:-1]
+    rhs *= (1 - theta) * r
+    rhs[:, 0] += u[1:-1]
+    rhs[0] += theta * r * u[0]
+    rhs[-1] += theta * r * u[-1]
+    u[1:-1] = _tridiagonal_solve(factor, rhs)[:, 0]
+
+def _tridiagonal_factor(n, r):
+    """
+        LU factors of the (n x n) tridiagonal matrix I - r D, with D the second difference [1, -2, 1], for _tridiagonal_solve
+    """
+    off_diagonal = np.full(n - 1, -r)
+    dl, d, du, du2, ipiv, info = dgttrf(off_diagonal, np.full(n, 1 + 2 * r), off_diagonal.copy())
+    return dl, d, du, du2, ipiv
+
+def _tridiagonal_solve(factor, rhs):
+    """
+        Solves the factored tridiagonal system for every column of rhs
+    """
+    x, info = dgttrs(*factor, rhs)
+    return x
+
+def finite_difference(nx, nt, snapshot_every=1, method='explicit', tol=1e-6):
+    """
+        Solves u_t = u_xx by finite differences method.
+        Stability condition (explicit method):
+            dt/dx**2 <= 1/2
         Assuming:
             u(0, t) = u(1, t) = 0
             u(x, 0) = sin(pi * x)
+        Parameters:
+            nx (int): Number of points in x
+            nt (int): Number of points in t, i.e. nt - 1 time steps over [0, 1]
+            snapshot_every (int): Only every k-th time step is returned (see explicit_heat)
+            method (str): 'explicit' (forward Euler), 'backward_euler', 'crank_nicolson' or 'adaptive'; the implicit methods have no stability condition.
+                The adaptive method (see adaptive_heat) only computes the returned times, choosing its own time steps starting from the grid's
+            tol (float): Maximum local error of a time step, for the adaptive method
+        Returns:
+            (np.ndarray): x of every returned point, as a meshgrid
+            (np.ndarray): t of every returned point, as a meshgrid
+            (np.ndarray): u of every returned point, one row per time
     """
     x, t = np.linspace(0, 1, nx), np.linspace(0, 1, nt)
     dx, dt = x[1] - x[0], t[1] - t[0]
-    
-    if dt / dx**2 >= 1 / 2:
-        print(f"dt / dx**2 = {dt / dx**2}.")
-        print("Stability condition not achieved!; Change dx or dt")
-        exit(1)
-    
-    print(f"Starting simulation with nx: {nx} and nt: {nt}.")
-    
-    u = np.zeros((nx, nt))
-    u[:, 0] = np.sin(np.pi * x)
-    
-    for i in range(nt - 1):
-        for j in range(2, nx - 1):
-            u[j, i + 1] = u[j, i] + dt / dx**2 * (u[j - 1, i] - 2 * u[j, i] + u[j + 1, i])
-        print(f" time iter: {i+2}/{nt}", end='\r')
-    print()
-    
+
+    print(f"Starting {method} simulation with nx: {nx} and nt: {nt}.")
+
+    u0 = np.sin(np.pi * x)
+    u0[0] = u0[-1] = 0
+    if method == 'adaptive':
+        steps, _ = _snapshots(u0, nt - 1, snapshot_every)
+        result = adaptive_heat(u0, dx, t[steps], tol, dt0=dt)
+        if result is None:
+            return None
+        u, t, dts = result
+        print(f"{len(dts)} adaptive time steps instead of {nt - 1}.")
+    else:
+        solvers = {'explicit': explicit_heat, 'backward_euler': backward_euler, 'crank_nicolson': crank_nicolson}
+        result = solvers[method](u0, dx, dt, nt - 1, snapshot_every)
+        if result is None:
+            return None
+        u, t = result
+
     X, T = np.meshgrid(x, t)
-    return X, T, u.T
-    
+    return X, T, u
+
 if __name__ == '__main__':
-    
+
     nx = int(sys.argv[1])
     nt = int(sys.argv[2])
-    
-    X, T, u_fd = finite_difference(nx, nt)
+    snapshot_every = int(sys.argv[3]) if len(sys.argv) > 3 else 1
+    method = sys.argv[4] if len(sys.argv) > 4 else 'explicit'
+    tol = float(sys.argv[5]) if len(sys.argv) > 5 else 1e-6
+
+    result = finite_difference(nx, nt, snapshot_every, method, tol)
+    if result is None:
+        exit(1)
+    X, T, u_fd = result
+    name = f"nx_{nx}_nt_{nt}" if method == 'explicit' else f"{method}_nx_{nx}_nt_{nt}"
 
     g = lambda x, t: np.exp(-t * np.pi**2) * np.sin(np.pi*x)
     u_anal = g(X, T)
-    
+
     abs_relativ_error = np.zeros_like(u_anal)
     abs_relativ_error = np.abs(u_anal - u_fd)
-    
+
     print(f"Max error: {np.max(abs_relativ_error)}.")
-    
+
     plt.figure("Finite Difference", figsize=(6,5))
     plt.contourf(X, T, u_fd)
     plt.xlabel("$x$")
     plt.ylabel("$t$")
     plt.title("Solution to the heat equation using Finite Difference")
     plt.colorbar()
-    plt.savefig("figs/heat_fd_nx_50_nt_5000.pdf")
-    
+    plt.savefig(f"figs/heat_fd_{name}.pdf")
+
     plt.figure("Analytical Solution", figsize=(6,5))
     plt.contourf(X, T, u_anal)
     plt.xlabel("$x$")
     plt.ylabel("$t$")
     plt.title("Analytical solution to the heat equation")
     plt.colorbar()
-    
+
     plt.figure("Absolute Error", figsize=(6,5))
     plt.contourf(X, T, abs_relativ_error)
     plt.xlabel("$x$")
     plt.ylabel("$t$")
-    plt.title("Absolute error of the FD; max_error = 0.0639")
+    plt.title(f"Absolute error of the FD; max_error = {np.max(abs_relativ_error):.3g}")
     plt.colorbar()
-    plt.savefig("figs/error_fd_nx_50_nt_5000.pdf")
-    
-    
\ No newline at end of file
+    plt.savefig(f"figs/error_fd_{name}.pdf")
+
+
@@ -0,0 +1,128 @@
+import numpy as np
+import scipy.sparse as sparse
+from scipy.sparse.linalg import spsolve
+from scipy.integrate import solve_ivp
+
+import sys
+
+def laplacian(shape, dx):
+    """
+        Second order finite difference Laplacian on the interior points of a regular 1D, 2D or 3D grid, as a sparse matrix
+        acting on the interior points flattened in C order (the Kronecker sum of the 1D second differences along every axis).
+        The contribution of the boundary values is given by boundary_term.
+        Parameters:
+            shape (tuple): Shape of the grid, boundaries included
+            dx (float|tuple): Grid spacing, either the same for all axes or one per axis
+        Returns:
+            (scipy.sparse.csr_matrix): Laplacian, of shape (n_interior, n_interior)
+    """
+    inner = [n - 2 for n in shape]
+    dx = np.broadcast_to(np.asarray(dx, dtype=np.float64), (len(shape),))
+
+    L = sparse.csr_matrix((int(np.prod(inner)), int(np.prod(inner))))
+    for axis, (n, h) in enumerate(zip(inner, dx)):
+        D = sparse.diags([1., -2., 1.], [-1, 0, 1], shape=(n, n)) / h**2
+        before, after = sparse.identity(int(np.prod(inner[:axis]))), sparse.identity(int(np.prod(inner[axis + 1:])))
+        L = L + sparse.kron(sparse.kron(before, D), after)
+    return L.tocsr()
+
+def boundary_term(u, dx):
+    """
+        Contribution of the boundary values of u to the finite difference Laplacian of its interior points, see laplacian
+        Parameters:
+            u (np.ndarray): Values on the grid; only the boundaries are used
+            dx (float|tuple): Grid spacing, either the same for all axes or one per axis
+        Returns:
+            (np.ndarray): Boundary term of every interior point, flattened in C order
+    """
+    u = np.asarray(u, dtype=np.float64)
+    dx = np.broadcast_to(np.asarray(dx, dtype=np.float64), (u.ndim,))
+    inner = (slice(1, -1),) * u.ndim
+
+    g = u.copy()
+    g[inner] = 0
+    b = np.zeros(g[inner].shape)
+    for axis, h in enumerate(dx):
+        lower = inner[:axis] + (slice(None, -2),) + inner[axis + 1:]
+        upper = inner[:axis] + (slice(2, None),) + inner[axis + 1:]
+        b += (g[lower] + g[upper]) / h**2
+    return b.ravel()
+
+def method_of_lines(u0, dx, t_out, source=None, rtol=1e-6, atol=1e-9, method='BDF'):
+    """
+        Solves u_t = laplacian(u) + source(t, u) on a regular 1D, 2D or 3D grid by the method of lines: the Laplacian is
+        discretized in space (see laplacian), and the resulting system of ODEs for the interior points is integrated with a
+        stiff solver given its sparse Jacobian, so that its implicit steps solve sparse linear systems only.
+        The boundary values of u0 are kept fixed (Dirichlet conditions).
+        Parameters:
+            u0 (np.ndarray): Initial values on the grid at t = t_out[0], boundaries included
+            dx (float|tuple): Grid spacing, either the same for all axes or one per axis
+            t_out (np.ndarray): Times to record the solution at, in increasing order
+            source (function|None): Source term f(t, u) of the interior points (given and returned with the interior's shape); it must be
+                local, i.e. the source of a point only depends on u at that point. If None, the heat equation u_t = laplacian(u)
+            rtol (float): Relative tolerance of the time integration
+            atol (float): Absolute tolerance of the time integration
+            method (str): Stiff integrator of scipy.integrate.solve_ivp taking sparse Jacobians, 'BDF' or 'Radau'
+        Returns:
+            (np.ndarray): Recorded solutions, of shape (len(t_out), *u0.shape)
+            (np.ndarray): Times of the recorded solutions, i.e. t_out
+    """
+    u0 = np.asarray(u0, dtype=np.float64)
+    t_out = np.atleast_1d(np.asarray(t_out, dtype=np.float64))
+    inner = (slice(1, -1),) * u0.ndim
+    shape = u0[inner].shape
+
+    L = laplacian(u0.shape, dx)
+    b = boundary_term(u0, dx)
+
+    if source is None:
+        fun = lambda t, y: L @ y + b
+        jac = {'jac': L}
+    else:
+        fun = lambda t, y: L @ y + b + np.ravel(source(t, y.reshape(shape)))
+        # Local source terms only add to the diagonal; the Jacobian is found by finite differences over this pattern
+        jac = {'jac_sparsity': L + sparse.identity(L.shape[0])}
+
+    solution = solve_ivp(fun, (t_out[0], t_out[-1]), u0[inner].ravel(), method=method, t_eval=t_out, rtol=rtol, atol=atol, **jac)
+    if not solution.success:
+        print(f"Integration failed: {solution.message}")
+        return None
+
+    snapshots = np.repeat(u0[np.newaxis], t_out.shape[0], axis=0)
+    snapshots[(slice(None),) + inner] = solution.y.T.reshape((t_out.shape[0],) + shape)
+    return snapshots, t_out
+
+def poisson(g, dx, f=0):
+    """
+        Solves the Poisson equation laplacian(u) = f on a regular 1D, 2D or 3D grid with one sparse solve, the steady state of method_of_lines
+        Parameters:
+            g (np.ndarray): Values on the grid; its boundaries are the Dirichlet conditions, the interior is ignored
+            dx (float|tuple): Grid spacing, either the same for all axes or one per axis
+            f (float|np.ndarray): Right hand side at the interior points
+        Returns:
+            (np.ndarray): Solution on the grid, boundaries included
+    """
+    u = np.array(g, dtype=np.float64)
+    inner = (slice(1, -1),) * u.ndim
+
+    rhs = np.ravel(np.broadcast_to(f, u[inner].shape)) - boundary_term(u, dx)
+    u[inner] = np.reshape(spsolve(laplacian(u.shape, dx).tocsc(), rhs), u[inner].shape)
+    return u
+
+if __name__ == '__main__':
+
+    nx = int(sys.argv[1])
+    nt = int(sys.argv[2])
+
+    # Same problems as heat_nn.py and pde_2_paper.py, as reference solutions
+    x, t = np.linspace(0, 1, nx), np.linspace(0, 1, nt)
+    u0 = np.sin(np.pi * x)
+    u0[0] = u0[-1] = 0
+    u, t = method_of_lines(u0, x[1] - x[0], t)
+    X, T = np.meshgrid(x, t)
+    print(f"Heat equation, max error: {np.max(np.abs(u - np.exp(-T * np.pi**2) * np.sin(np.pi * X)))}.")
+
+    X, Y = np.meshgrid(x, x, indexing='ij')
+    analytical = X**2 + Y**2 + X + Y + 1
+    u = poisson(analytical, x[1] - x[0], 4)
+    print(f"Poisson equation, max error: {np.max(np.abs(u - analytical))}.")
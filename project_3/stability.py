@@ -1,25 +1,87 @@
 import numpy as np
 import matplotlib.pyplot as plt
 
-n = 1000
-dx = np.linspace(0, 20, n)
-dt = np.linspace(0, 100, n)
-dX, dT = np.meshgrid(dx, dt)
+import hashlib
+import os
 
-stability = dT / dX**2
+# Part of the cache keys of stability_region, to be bumped whenever the way regions are computed changes
+_CACHE_VERSION = 2
 
-region = np.zeros_like(stability)
+def amplification_factor(r, theta=0, k_dx=np.pi):
+    """
+        Amplification factor of the Fourier mode exp(i k x) over one time step of the theta-scheme for u_t = u_xx
+            G = (1 - 4 (1 - theta) r sin^2(k dx / 2)) / (1 + 4 theta r sin^2(k dx / 2)), with r = dt/dx**2
+        theta = 0 is the explicit (forward Euler) scheme, 1/2 Crank-Nicolson and 1 the implicit (backward Euler) scheme.
+        All parameters broadcast against each other.
+        Parameters:
+            r (float|np.ndarray): dt/dx**2
+            theta (float|np.ndarray): Weight of the new time level
+            k_dx (float|np.ndarray): Wavenumber times grid spacing; pi is the highest mode of the grid
+        Returns:
+            (np.ndarray): Amplification factors
+    """
+    s = 4 * r * np.sin(k_dx / 2)**2
+    return (1 - (1 - theta) * s) / (1 + theta * s)
 
-for i in range(n):
-    for j in range(n):
-        if stability[i, j] < 1 / 2:
-            region[i, j] = 1
+def stability_region(dx, dt, theta=0, cache_dir=None):
+    """
+        Which (dx, dt) pairs of a grid give a stable theta-scheme for u_t = u_xx, i.e. |G| < 1 for every mode (see amplification_factor).
+        G decreases from 1 with k dx in [0, pi], so only the highest mode k dx = pi needs checking: its amplification factor is
+        evaluated for the whole (dt, dx) grid at once. dt = 0 (G = 1) counts as stable, and dx = 0 as unstable.
+        Parameters:
+            dx (np.ndarray): Grid spacings, one per column of the region
+            dt (np.ndarray): Time steps, one per row of the region
+            theta (float): Weight of the new time level, see amplification_factor
+            cache_dir (str|None): If given, the region is saved to (and later loaded from) a .npy file of this directory, named after its inputs
+        Returns:
+            (np.ndarray): 1 where stable, 0 elsewhere, of shape (len(dt), len(dx)) like np.meshgrid(dx, dt)
+    """
+    dx, dt = np.asarray(dx, dtype=np.float64), np.asarray(dt, dtype=np.float64)
 
-plt.figure("Stability Region")
-plt.title("Stability region for finite differences")
-plt.contourf(dX, dT, region)
-plt.xlabel("$\Delta x$")
-plt.ylabel("$\Delta t$")
-plt.colorbar()
+    if cache_dir is not None:
+        # The lengths tell apart splits of the same bytes between dx and dt, and the version regions computed differently
+        key = hashlib.sha1(repr((_CACHE_VERSION, dx.shape, dt.shape, float(theta))).encode() + dx.tobytes() + dt.tobytes()).hexdigest()
+        filename = os.path.join(cache_dir, f"stability_{key}.npy")
+        if os.path.exists(filename):
+            return np.load(filename)
 
-plt.savefig("figs/stability_region.pdf")
+    # dx = 0 gives no scheme at all: r is left at 0 there, and masked out
+    dX = dx[np.newaxis, :]
+    r = np.divide(dt[:, np.newaxis], dX**2, out=np.zeros((dt.shape[0], dx.shape[0])), where=dX > 0)
+    G = amplification_factor(r, theta)
+    region = (((np.abs(G) < 1) | (r == 0)) & (dX > 0)).astype(np.float64)
+
+    if cache_dir is not None:
+        os.makedirs(cache_dir, exist_ok=True)
+        np.save(filename, region)
+    return region
+
+if __name__ == '__main__':
+
+    n = 1000
+    dx = np.linspace(0, 20, n)
+    dt = np.linspace(0, 100, n)
+    dX, dT = np.meshgrid(dx, dt)
+
+    region = stability_region(dx, dt)
+
+    plt.figure("Stability Region")
+    plt.title("Stability region for finite differences")
+    plt.contourf(dX, dT, region)
+    plt.xlabel(r"$\Delta x$")
+    plt.ylabel(r"$\Delta t$")
+    plt.colorbar()
+
+    plt.savefig("figs/stability_region.pdf")
+
+    # Boundaries of the stability regions of the theta-scheme; from theta = 1/2 on, every (dx, dt) is stable
+    plt.figure("Theta-scheme Stability Regions")
+    plt.title(r"Stability regions of the $\theta$-scheme")
+    for theta in (0, 0.25, 0.4, 0.45):
+        plt.contour(dX, dT, stability_region(dx, dt, theta), levels=[0.5], colors=[plt.cm.viridis(2 * theta)])
+        plt.plot([], [], color=plt.cm.viridis(2 * theta), label=rf"$\theta = {theta}$")
+    plt.xlabel(r"$\Delta x$")
+    plt.ylabel(r"$\Delta t$")
+    plt.legend()
+
+    plt.savefig("figs/stability_region_theta.pdf")